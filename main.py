@@ -8,6 +8,7 @@ from py_clob_client.order_builder.constants import BUY, SELL
 from dotenv import load_dotenv
 import requests
 import traceback
+import heapq
 import psycopg2
 from psycopg2.extras import execute_values
 
@@ -29,32 +30,24 @@ def find_market_by_keyword(client, keywords):
         keywords = [keywords]
     keywords = [k.lower() for k in keywords]  # Lowercase all keywords
     
-    next_cursor = ""
     found_markets = []
     
-    while True:
-        response = client.get_markets(next_cursor)
+    for market in client.iter_markets(next_cursor="", prefetch=True):
+        # Combine question and description for searching
+        search_text = (market['question'].lower() + " " + 
+                     market['description'].lower())
         
-        for market in response['data']:
-            # Combine question and description for searching
-            search_text = (market['question'].lower() + " " + 
-                         market['description'].lower())
-            
-            # Check if all keywords exist in either question or description
-            if all(keyword in search_text for keyword in keywords):
-                found_markets.append({
-                    'question': market['question'],
-                    'condition_id': market['condition_id'],
-                    'description': market['description'],
-                    'tokens': market['tokens'],
-                    'end_date': market['end_date_iso'],
-                    'active': market['active'],
-                    'closed': market['closed']
-                })
-        
-        next_cursor = response.get('next_cursor')
-        if next_cursor == "LTE=" or not next_cursor:
-            break
+        # Check if all keywords exist in either question or description
+        if all(keyword in search_text for keyword in keywords):
+            found_markets.append({
+                'question': market['question'],
+                'condition_id': market['condition_id'],
+                'description': market['description'],
+                'tokens': market['tokens'],
+                'end_date': market['end_date_iso'],
+                'active': market['active'],
+                'closed': market['closed']
+            })
             
     return found_markets
 
@@ -94,22 +87,14 @@ def get_order_book_summary(token_id):
         if not book or not book.bids or not book.asks:
             return {'bids': [], 'asks': []}
         
-        # Convert all orders to list of dicts with price as float for sorting
-        all_bids = [{'price': float(bid.price), 'size': bid.size} for bid in book.bids]
-        all_asks = [{'price': float(ask.price), 'size': ask.size} for ask in book.asks]
-        
-        # Sort bids descending (highest first) and asks ascending (lowest first)
-        all_bids.sort(key=lambda x: x['price'], reverse=True)
-        all_asks.sort(key=lambda x: x['price'])
-        
-        # Get 5 best bids and asks (closest to the spread)
-        bids = all_bids[:5]
-        asks = all_asks[:5]
+        # Get 5 best bids and asks (closest to the spread), without sorting every level
+        bids = heapq.nlargest(5, book.bids, key=lambda bid: float(bid.price))
+        asks = heapq.nsmallest(5, book.asks, key=lambda ask: float(ask.price))
         
-        # Convert prices to cents format
+        # Convert prices to cents format, sizes as the server sent them
         summary = {
-            'bids': [{'price': f"{bid['price']*100:.1f}", 'size': bid['size']} for bid in bids],
-            'asks': [{'price': f"{ask['price']*100:.1f}", 'size': ask['size']} for ask in asks]
+            'bids': [{'price': f"{float(bid.price)*100:.1f}", 'size': bid.size} for bid in bids],
+            'asks': [{'price': f"{float(ask.price)*100:.1f}", 'size': ask.size} for ask in asks]
         }
         
         print(f"Processed order book summary: {json.dumps(summary, indent=2)}")
@@ -0,0 +1,1128 @@
+import asyncio
+import logging
+from typing import Optional
+
+from py_order_utils.model import SignedOrder
+
+from .order_builder.builder import OrderBuilder
+from .order_builder.eip712 import signed_order_hash
+from .order_book import OrderBook
+from .headers.headers import (
+    POLY_API_KEY,
+    POLY_NONCE,
+    L2Authenticator,
+    create_level_1_headers,
+)
+from .signer import Signer
+from .clock import ServerClock
+from .config import get_contract_config
+
+from .endpoints import (
+    CANCEL,
+    CANCEL_ORDERS,
+    CANCEL_MARKET_ORDERS,
+    CANCEL_ALL,
+    CREATE_API_KEY,
+    DELETE_API_KEY,
+    DERIVE_API_KEY,
+    GET_API_KEYS,
+    CLOSED_ONLY,
+    GET_LAST_TRADE_PRICE,
+    GET_ORDER,
+    GET_ORDER_BOOK,
+    MID_POINT,
+    ORDERS,
+    POST_ORDER,
+    POST_ORDERS,
+    PRICE,
+    TIME,
+    TRADES,
+    GET_NOTIFICATIONS,
+    DROP_NOTIFICATIONS,
+    GET_BALANCE_ALLOWANCE,
+    UPDATE_BALANCE_ALLOWANCE,
+    IS_ORDER_SCORING,
+    GET_TICK_SIZE,
+    GET_NEG_RISK,
+    ARE_ORDERS_SCORING,
+    GET_SIMPLIFIED_MARKETS,
+    GET_MARKETS,
+    GET_MARKET,
+    GET_SAMPLING_SIMPLIFIED_MARKETS,
+    GET_SAMPLING_MARKETS,
+    GET_MARKET_TRADES_EVENTS,
+    GET_LAST_TRADES_PRICES,
+    MID_POINTS,
+    GET_ORDER_BOOKS,
+    GET_PRICES,
+    GET_SPREAD,
+    GET_SPREADS,
+)
+from .clob_types import (
+    ApiCreds,
+    TradeParams,
+    OpenOrderParams,
+    OrderArgs,
+    RequestArgs,
+    DropNotificationParams,
+    OrderBookSummary,
+    BalanceAllowanceParams,
+    OrderScoringParams,
+    TickSize,
+    CreateOrderOptions,
+    OrdersScoringParams,
+    OrderType,
+    PartialCreateOrderOptions,
+    BookParams,
+    MarketOrderArgs,
+    PostOrdersArgs,
+)
+from .exceptions import PolyApiException, PolyException
+from .http_helpers.helpers import (
+    add_query_trade_params,
+    add_query_open_orders_params,
+    drop_notifications_query_params,
+    add_balance_allowance_params_to_url,
+    add_order_scoring_params_to_url,
+)
+from .http_helpers.async_transport import AsyncHttpTransport
+from .http_helpers.retry import AsyncRetryingTransport, RetryPolicy
+
+from .constants import L0, L1, L1_AUTH_UNAVAILABLE, L2, L2_AUTH_UNAVAILABLE
+from .metadata_cache import DEFAULT_TICK_SIZE_TTL, MetadataCache
+from .pagination import aiter_records
+from .structs import Market, OpenOrder, SimplifiedMarket, Trade, decode_page
+from .utilities import (
+    parse_raw_orderbook_summary,
+    parse_raw_orderbook,
+    generate_orderbook_summary_hash,
+    order_to_json,
+    is_tick_size_smaller,
+    price_valid,
+)
+
+
+class AsyncClobClient:
+    def __init__(
+        self,
+        host,
+        chain_id: int = None,
+        key: str = None,
+        creds: ApiCreds = None,
+        signature_type: int = None,
+        funder: str = None,
+        signing_workers: int = None,
+        transport: AsyncHttpTransport = None,
+        tick_size_cache: MetadataCache = None,
+        neg_risk_cache: MetadataCache = None,
+        retry_policy: RetryPolicy = None,
+        server_clock: ServerClock = None,
+    ):
+        """
+        Initializes the asyncio clob client, the async counterpart of ClobClient
+        The client can be started in 3 modes:
+        1) Level 0: Requires only the clob host url
+                    Allows access to open CLOB endpoints
+
+        2) Level 1: Requires the host, chain_id and a private key.
+                    Allows access to L1 authenticated endpoints + all unauthenticated endpoints
+
+        3) Level 2: Requires the host, chain_id, a private key, and Credentials.
+                    Allows access to all endpoints
+
+        An AsyncHttpTransport can be passed to tune the connection pool and timeouts,
+        otherwise the client creates its own. Wrapping it in a AsyncCoalescingTransport
+        merges identical concurrent public GETs, in a AsyncBatchingTransport turns
+        concurrent single token price and book GETs into batch requests
+
+        signing_workers: number of worker processes used to sign batches of orders,
+        see create_orders
+
+        retry_policy: if given, failed requests are retried according to it, see
+        AsyncRetryingTransport. Order posts are looked up by order hash before being resent
+
+        server_clock: if given, auth headers are timestamped with its estimate of the
+        server time instead of the local time, sample it with
+        server_clock.start_async(client.get_server_time)
+        The client should be closed, or used as an async context manager, to release its connections
+        """
+        self.host = host[0:-1] if host.endswith("/") else host
+        self.transport = transport if transport is not None else AsyncHttpTransport()
+        if retry_policy is not None:
+            self.transport = AsyncRetryingTransport(
+                self.transport,
+                retry_policy,
+                self.__lookup_posted_order,
+                sign_headers=self.__sign_again,
+            )
+        self.server_clock = server_clock
+        self.chain_id = chain_id
+        self.signer = Signer(key, chain_id) if key else None
+        self.creds = creds
+        self.mode = self._get_client_mode()
+        self.__l2_authenticator = self.__get_l2_authenticator()
+
+        if self.signer:
+            self.builder = OrderBuilder(
+                self.signer,
+                sig_type=signature_type,
+                funder=funder,
+                signing_workers=signing_workers,
+            )
+
+        # local cache
+        self.__tick_sizes = (
+            tick_size_cache
+            if tick_size_cache is not None
+            else MetadataCache(ttl=DEFAULT_TICK_SIZE_TTL)
+        )
+        self.__neg_risk = (
+            neg_risk_cache if neg_risk_cache is not None else MetadataCache()
+        )
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the underlying http session and the signing worker processes, if any
+        """
+        await self.transport.close()
+        if self.signer:
+            self.builder.close()
+
+    def get_address(self):
+        """
+        Returns the public address of the signer
+        """
+        return self.signer.address() if self.signer else None
+
+    def get_collateral_address(self):
+        """
+        Returns the collateral token address
+        """
+        contract_config = get_contract_config(self.chain_id)
+        if contract_config:
+            return contract_config.collateral
+
+    def get_conditional_address(self):
+        """
+        Returns the conditional token address
+        """
+        contract_config = get_contract_config(self.chain_id)
+        if contract_config:
+            return contract_config.conditional_tokens
+
+    def get_exchange_address(self, neg_risk=False):
+        """
+        Returns the exchange address
+        """
+        contract_config = get_contract_config(self.chain_id, neg_risk)
+        if contract_config:
+            return contract_config.exchange
+
+    async def get_ok(self):
+        """
+        Health check: Confirms that the server is up
+        Does not need authentication
+        """
+        return await self.transport.get("{}/".format(self.host))
+
+    async def get_server_time(self):
+        """
+        Returns the current timestamp on the server
+        Does not need authentication
+        """
+        return await self.transport.get("{}{}".format(self.host, TIME))
+
+    async def create_api_key(self, nonce: int = None) -> ApiCreds:
+        """
+        Creates a new CLOB API key for the given
+        """
+        self.assert_level_1_auth()
+
+        endpoint = "{}{}".format(self.host, CREATE_API_KEY)
+        headers = create_level_1_headers(self.signer, nonce, self.__timestamp())
+
+        creds_raw = await self.transport.post(endpoint, headers=headers)
+        try:
+            creds = ApiCreds(
+                api_key=creds_raw["apiKey"],
+                api_secret=creds_raw["secret"],
+                api_passphrase=creds_raw["passphrase"],
+            )
+        except:
+            self.logger.error("Couldn't parse created CLOB creds")
+            return None
+        return creds
+
+    async def derive_api_key(self, nonce: int = None) -> ApiCreds:
+        """
+        Derives an already existing CLOB API key for the given address and nonce
+        """
+        self.assert_level_1_auth()
+
+        endpoint = "{}{}".format(self.host, DERIVE_API_KEY)
+        headers = create_level_1_headers(self.signer, nonce, self.__timestamp())
+
+        creds_raw = await self.transport.get(endpoint, headers=headers)
+        try:
+            creds = ApiCreds(
+                api_key=creds_raw["apiKey"],
+                api_secret=creds_raw["secret"],
+                api_passphrase=creds_raw["passphrase"],
+            )
+        except:
+            self.logger.error("Couldn't parse derived CLOB creds")
+            return None
+        return creds
+
+    async def create_or_derive_api_creds(self, nonce: int = None) -> ApiCreds:
+        """
+        Creates API creds if not already created for nonce, otherwise derives them
+        """
+        try:
+            return await self.create_api_key(nonce)
+        except Exception:
+            return await self.derive_api_key(nonce)
+
+    def set_api_creds(self, creds: ApiCreds):
+        """
+        Sets client api creds
+        """
+        self.creds = creds
+        self.mode = self._get_client_mode()
+        self.__l2_authenticator = self.__get_l2_authenticator()
+
+    async def get_api_keys(self):
+        """
+        Gets the available API keys for this address
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+
+        request_args = RequestArgs(method="GET", request_path=GET_API_KEYS)
+        headers = self.__l2_headers(request_args)
+        return await self.transport.get(
+            "{}{}".format(self.host, GET_API_KEYS), headers=headers
+        )
+
+    async def get_closed_only_mode(self):
+        """
+        Gets the closed only mode flag for thsi address
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+
+        request_args = RequestArgs(method="GET", request_path=CLOSED_ONLY)
+        headers = self.__l2_headers(request_args)
+        return await self.transport.get(
+            "{}{}".format(self.host, CLOSED_ONLY), headers=headers
+        )
+
+    async def delete_api_key(self):
+        """
+        Deletes an API key
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+
+        request_args = RequestArgs(method="DELETE", request_path=DELETE_API_KEY)
+        headers = self.__l2_headers(request_args)
+        return await self.transport.delete(
+            "{}{}".format(self.host, DELETE_API_KEY), headers=headers
+        )
+
+    async def get_midpoint(self, token_id):
+        """
+        Get the mid market price for the given market
+        """
+        return await self.transport.get(
+            "{}{}?token_id={}".format(self.host, MID_POINT, token_id)
+        )
+
+    async def get_midpoints(self, params: list[BookParams]):
+        """
+        Get the mid market prices for a set of token ids
+        """
+        body = [{"token_id": param.token_id} for param in params]
+        return await self.transport.post(
+            "{}{}".format(self.host, MID_POINTS), data=body
+        )
+
+    async def get_price(self, token_id, side):
+        """
+        Get the market price for the given market
+        """
+        return await self.transport.get(
+            "{}{}?token_id={}&side={}".format(self.host, PRICE, token_id, side)
+        )
+
+    async def get_prices(self, params: list[BookParams]):
+        """
+        Get the market prices for a set
+        """
+        body = [{"token_id": param.token_id, "side": param.side} for param in params]
+        return await self.transport.post(
+            "{}{}".format(self.host, GET_PRICES), data=body
+        )
+
+    async def get_spread(self, token_id):
+        """
+        Get the spread for the given market
+        """
+        return await self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_SPREAD, token_id)
+        )
+
+    async def get_spreads(self, params: list[BookParams]):
+        """
+        Get the spreads for a set of token ids
+        """
+        body = [{"token_id": param.token_id} for param in params]
+        return await self.transport.post(
+            "{}{}".format(self.host, GET_SPREADS), data=body
+        )
+
+    async def get_tick_size(self, token_id: str) -> TickSize:
+        return await self.__tick_sizes.get_or_load_async(
+            token_id, self.__fetch_tick_size
+        )
+
+    async def __fetch_tick_size(self, token_id: str) -> TickSize:
+        result = await self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_TICK_SIZE, token_id)
+        )
+        return str(result["minimum_tick_size"])
+
+    async def get_neg_risk(self, token_id: str) -> bool:
+        return await self.__neg_risk.get_or_load_async(token_id, self.__fetch_neg_risk)
+
+    async def __fetch_neg_risk(self, token_id: str) -> bool:
+        result = await self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_NEG_RISK, token_id)
+        )
+        return result["neg_risk"]
+
+    def load_market_metadata(self, tick_sizes: dict = None, neg_risk: dict = None):
+        """
+        Seeds the tick size and neg risk caches, keyed by token_id, e.g. from a CatalogueStore
+        """
+        if tick_sizes:
+            self.__tick_sizes.update(tick_sizes)
+        if neg_risk:
+            self.__neg_risk.update(neg_risk)
+
+    async def warm(self, token_ids: list[str], markets=None) -> int:
+        """
+        Fills the tick size and neg risk caches of token_ids from market listings: the
+        given markets, e.g. a MarketCatalogue or CatalogueStore, or else the market
+        listing, crawled until every token is found
+        Returns the number of tokens found
+        """
+        remaining = set(token_ids)
+        found = 0
+        if markets is not None:
+            for market in markets:
+                found += self.__cache_market_metadata(market, remaining)
+                if not remaining:
+                    break
+        else:
+            async for market in self.iter_markets(prefetch=True):
+                found += self.__cache_market_metadata(market, remaining)
+                if not remaining:
+                    break
+        return found
+
+    def __cache_market_metadata(self, market: dict, token_ids: set) -> int:
+        """
+        Caches the tick size and neg risk of the market's tokens found in token_ids,
+        removing them from it
+        """
+        tick_size = market.get("minimum_tick_size")
+        neg_risk = market.get("neg_risk")
+        found = 0
+        for token in market.get("tokens") or []:
+            token_id = token.get("token_id")
+            if token_id not in token_ids:
+                continue
+            if tick_size is not None:
+                self.__tick_sizes.set(token_id, str(tick_size))
+            if neg_risk is not None:
+                self.__neg_risk.set(token_id, neg_risk)
+            token_ids.discard(token_id)
+            found += 1
+        return found
+
+    async def __resolve_tick_size(
+        self, token_id: str, tick_size: TickSize = None
+    ) -> TickSize:
+        min_tick_size = await self.get_tick_size(token_id)
+        if tick_size is not None:
+            if is_tick_size_smaller(tick_size, min_tick_size):
+                raise Exception(
+                    "invalid tick size ("
+                    + str(tick_size)
+                    + "), minimum for the market is "
+                    + str(min_tick_size),
+                )
+        else:
+            tick_size = min_tick_size
+        return tick_size
+
+    async def __resolve_order_options(
+        self, order_args: OrderArgs, options: Optional[PartialCreateOrderOptions] = None
+    ) -> CreateOrderOptions:
+        tick_size = await self.__resolve_tick_size(
+            order_args.token_id,
+            options.tick_size if options else None,
+        )
+
+        if not price_valid(order_args.price, tick_size):
+            raise Exception(
+                "price ("
+                + str(order_args.price)
+                + "), min: "
+                + str(tick_size)
+                + " - max: "
+                + str(1 - float(tick_size))
+            )
+
+        neg_risk = (
+            options.neg_risk
+            if options and options.neg_risk
+            else await self.get_neg_risk(order_args.token_id)
+        )
+
+        return CreateOrderOptions(
+            tick_size=tick_size,
+            neg_risk=neg_risk,
+        )
+
+    async def create_order(
+        self, order_args: OrderArgs, options: Optional[PartialCreateOrderOptions] = None
+    ):
+        """
+        Creates and signs an order
+        Level 1 Auth required
+        """
+        self.assert_level_1_auth()
+
+        return self.builder.create_order(
+            order_args, await self.__resolve_order_options(order_args, options)
+        )
+
+    async def create_orders(
+        self,
+        orders_args: list[OrderArgs],
+        options: Optional[PartialCreateOrderOptions] = None,
+        max_workers: int = None,
+    ) -> list[SignedOrder]:
+        """
+        Creates and signs a batch of orders
+        The signed orders are returned in the same order as orders_args
+        Level 1 Auth required
+
+        Signing is CPU bound and holds the GIL, so the default pool of max_workers
+        threads signs little faster than a loop. Create the client with
+        signing_workers to sign large batches across processes
+        """
+        self.assert_level_1_auth()
+
+        create_options = [
+            await self.__resolve_order_options(order_args, options)
+            for order_args in orders_args
+        ]
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.builder.create_orders, orders_args, create_options, max_workers
+        )
+
+    async def create_market_order(
+        self,
+        order_args: MarketOrderArgs,
+        options: Optional[PartialCreateOrderOptions] = None,
+    ):
+        """
+        Creates and signs an order
+        Level 1 Auth required
+        """
+        self.assert_level_1_auth()
+
+        # add resolve_order_options, or similar
+        tick_size = await self.__resolve_tick_size(
+            order_args.token_id,
+            options.tick_size if options else None,
+        )
+
+        if order_args.price is None or order_args.price <= 0:
+            order_args.price = await self.calculate_market_price(
+                order_args.token_id, order_args.side, order_args.amount
+            )
+
+        if not price_valid(order_args.price, tick_size):
+            raise Exception(
+                "price ("
+                + str(order_args.price)
+                + "), min: "
+                + str(tick_size)
+                + " - max: "
+                + str(1 - float(tick_size))
+            )
+
+        neg_risk = (
+            options.neg_risk
+            if options and options.neg_risk
+            else await self.get_neg_risk(order_args.token_id)
+        )
+
+        return self.builder.create_market_order(
+            order_args,
+            CreateOrderOptions(
+                tick_size=tick_size,
+                neg_risk=neg_risk,
+            ),
+        )
+
+    async def post_order(self, order, orderType: OrderType = OrderType.GTC):
+        """
+        Posts the order
+        """
+        self.assert_level_2_auth()
+        body = order_to_json(order, self.creds.api_key, orderType)
+        request_args = RequestArgs(method="POST", request_path=POST_ORDER, body=body)
+        headers = self.__l2_headers(request_args)
+        return await self.transport.post(
+            "{}{}".format(self.host, POST_ORDER),
+            headers=headers,
+            data=request_args.serialized_body,
+        )
+
+    async def create_and_post_order(
+        self, order_args: OrderArgs, options: PartialCreateOrderOptions = None
+    ):
+        """
+        Utility function to create and publish an order
+        """
+        ord = await self.create_order(order_args, options)
+        return await self.post_order(ord)
+
+    async def post_orders(self, args: list[PostOrdersArgs]):
+        """
+        Posts a batch of orders in a single request
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+        body = [
+            order_to_json(arg.order, self.creds.api_key, arg.orderType) for arg in args
+        ]
+        request_args = RequestArgs(method="POST", request_path=POST_ORDERS, body=body)
+        headers = self.__l2_headers(request_args)
+        return await self.transport.post(
+            "{}{}".format(self.host, POST_ORDERS),
+            headers=headers,
+            data=request_args.serialized_body,
+        )
+
+    async def create_and_post_orders(
+        self,
+        orders_args: list[OrderArgs],
+        options: PartialCreateOrderOptions = None,
+        orderType: OrderType = OrderType.GTC,
+    ):
+        """
+        Utility function to create, sign concurrently and publish a batch of orders
+        in a single request
+        """
+        orders = await self.create_orders(orders_args, options)
+        return await self.post_orders(
+            [PostOrdersArgs(order=order, orderType=orderType) for order in orders]
+        )
+
+    async def cancel(self, order_id):
+        """
+        Cancels an order
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+        body = {"orderID": order_id}
+
+        request_args = RequestArgs(method="DELETE", request_path=CANCEL, body=body)
+        headers = self.__l2_headers(request_args)
+        return await self.transport.delete(
+            "{}{}".format(self.host, CANCEL),
+            headers=headers,
+            data=request_args.serialized_body,
+        )
+
+    async def cancel_orders(self, order_ids):
+        """
+        Cancels orders
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+        body = order_ids
+
+        request_args = RequestArgs(
+            method="DELETE", request_path=CANCEL_ORDERS, body=body
+        )
+        headers = self.__l2_headers(request_args)
+        return await self.transport.delete(
+            "{}{}".format(self.host, CANCEL_ORDERS),
+            headers=headers,
+            data=request_args.serialized_body,
+        )
+
+    async def cancel_all(self):
+        """
+        Cancels all available orders for the user
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+        request_args = RequestArgs(method="DELETE", request_path=CANCEL_ALL)
+        headers = self.__l2_headers(request_args)
+        return await self.transport.delete(
+            "{}{}".format(self.host, CANCEL_ALL), headers=headers
+        )
+
+    async def cancel_market_orders(self, market: str = "", asset_id: str = ""):
+        """
+        Cancels orders
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+        body = {"market": market, "asset_id": asset_id}
+
+        request_args = RequestArgs(
+            method="DELETE", request_path=CANCEL_MARKET_ORDERS, body=body
+        )
+        headers = self.__l2_headers(request_args)
+        return await self.transport.delete(
+            "{}{}".format(self.host, CANCEL_MARKET_ORDERS),
+            headers=headers,
+            data=request_args.serialized_body,
+        )
+
+    async def get_orders(
+        self, params: OpenOrderParams = None, next_cursor="MA==", typed=False
+    ):
+        """
+        Gets orders for the API key, as OpenOrder structs if typed
+        Requires Level 2 authentication
+        """
+        return [
+            order async for order in self.iter_orders(params, next_cursor, typed=typed)
+        ]
+
+    def iter_orders(
+        self,
+        params: OpenOrderParams = None,
+        next_cursor="MA==",
+        prefetch=False,
+        typed=False,
+    ):
+        """
+        Yields orders for the API key page by page, prefetch fetches the next page while
+        the current one is consumed
+        typed yields OpenOrder structs
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        request_args = RequestArgs(method="GET", request_path=ORDERS)
+
+        async def fetch_page(cursor):
+            # signed per page, pages may be fetched long after the first one
+            headers = self.__l2_headers(request_args)
+            url = add_query_open_orders_params(
+                "{}{}".format(self.host, ORDERS), params, cursor
+            )
+            if typed:
+                # decoded straight into structs
+                return decode_page(
+                    await self.transport.get_text(url, headers=headers), OpenOrder
+                )
+            return await self.transport.get(url, headers=headers)
+
+        return aiter_records(fetch_page, next_cursor, prefetch)
+
+    async def get_order_book(self, token_id) -> OrderBookSummary:
+        """
+        Fetches the orderbook for the token_id
+        """
+        raw_obs = await self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_ORDER_BOOK, token_id)
+        )
+        return parse_raw_orderbook_summary(raw_obs)
+
+    async def get_book(self, token_id) -> OrderBook:
+        """
+        Fetches the orderbook for the token_id as an array backed OrderBook, sorted best first
+        """
+        raw_obs = await self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_ORDER_BOOK, token_id)
+        )
+        return parse_raw_orderbook(raw_obs)
+
+    async def get_order_books(self, params: list[BookParams]) -> list[OrderBookSummary]:
+        """
+        Fetches the orderbook for a set of token ids
+        """
+        body = [{"token_id": param.token_id} for param in params]
+        raw_obs = await self.transport.post(
+            "{}{}".format(self.host, GET_ORDER_BOOKS), data=body
+        )
+        return [parse_raw_orderbook_summary(r) for r in raw_obs]
+
+    def get_order_book_hash(self, orderbook: OrderBookSummary) -> str:
+        """
+        Calculates the hash for the given orderbook
+        """
+        return generate_orderbook_summary_hash(orderbook)
+
+    async def get_order(self, order_id):
+        """
+        Fetches the order corresponding to the order_id
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        endpoint = "{}{}".format(GET_ORDER, order_id)
+        request_args = RequestArgs(method="GET", request_path=endpoint)
+        headers = self.__l2_headers(request_args)
+        return await self.transport.get(
+            "{}{}".format(self.host, endpoint), headers=headers
+        )
+
+    async def __lookup_posted_order(self, order: dict) -> Optional[dict]:
+        """
+        The exchange's record of a signed order, None if it isn't known
+        """
+        order_hash = signed_order_hash(order, self.chain_id)
+        if order_hash is None:
+            raise PolyException("order signature doesn't match its signer")
+        try:
+            return await self.get_order(order_hash) or None
+        except PolyApiException as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    async def get_trades(
+        self, params: TradeParams = None, next_cursor="MA==", typed=False
+    ):
+        """
+        Fetches the trade history for a user, as Trade structs if typed
+        Requires Level 2 authentication
+        """
+        return [
+            trade async for trade in self.iter_trades(params, next_cursor, typed=typed)
+        ]
+
+    def iter_trades(
+        self,
+        params: TradeParams = None,
+        next_cursor="MA==",
+        prefetch=False,
+        typed=False,
+    ):
+        """
+        Yields the trade history for a user page by page, prefetch fetches the next page
+        while the current one is consumed
+        typed yields Trade structs
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        request_args = RequestArgs(method="GET", request_path=TRADES)
+
+        async def fetch_page(cursor):
+            # signed per page, pages may be fetched long after the first one
+            headers = self.__l2_headers(request_args)
+            url = add_query_trade_params(
+                "{}{}".format(self.host, TRADES), params, cursor
+            )
+            if typed:
+                # decoded straight into structs
+                return decode_page(
+                    await self.transport.get_text(url, headers=headers), Trade
+                )
+            return await self.transport.get(url, headers=headers)
+
+        return aiter_records(fetch_page, next_cursor, prefetch)
+
+    async def get_last_trade_price(self, token_id):
+        """
+        Fetches the last trade price token_id
+        """
+        return await self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_LAST_TRADE_PRICE, token_id)
+        )
+
+    async def get_last_trades_prices(self, params: list[BookParams]):
+        """
+        Fetches the last trades prices for a set of token ids
+        """
+        body = [{"token_id": param.token_id} for param in params]
+        return await self.transport.post(
+            "{}{}".format(self.host, GET_LAST_TRADES_PRICES), data=body
+        )
+
+    def __get_l2_authenticator(self) -> Optional[L2Authenticator]:
+        if self.signer is None or self.creds is None:
+            return None
+        return L2Authenticator(self.signer.address(), self.creds)
+
+    def __l2_headers(self, request_args: RequestArgs) -> dict:
+        """
+        Level 2 headers of a request, signed now
+        """
+        if (
+            self.__l2_authenticator is None
+            or self.__l2_authenticator.creds is not self.creds
+        ):
+            # creds assigned without set_api_creds
+            self.__l2_authenticator = self.__get_l2_authenticator()
+        return self.__l2_authenticator.headers(request_args, self.__timestamp())
+
+    def __sign_again(self, endpoint: str, method: str, headers: dict, data) -> dict:
+        """
+        The headers of a request being retried, with its auth headers signed now
+        """
+        if POLY_API_KEY in headers:
+            request_path = endpoint[len(self.host) :].partition("?")[0]
+            request_args = RequestArgs(
+                method=method, request_path=request_path, body=data
+            )
+            return dict(headers, **self.__l2_headers(request_args))
+        if POLY_NONCE in headers:
+            return dict(
+                headers,
+                **create_level_1_headers(
+                    self.signer, int(headers[POLY_NONCE]), self.__timestamp()
+                ),
+            )
+        return headers
+
+    def __timestamp(self) -> Optional[int]:
+        """
+        Timestamp for auth headers, None for the local time
+        """
+        return self.server_clock.timestamp() if self.server_clock is not None else None
+
+    def assert_level_1_auth(self):
+        """
+        Level 1 Poly Auth
+        """
+        if self.mode < L1:
+            raise PolyException(L1_AUTH_UNAVAILABLE)
+
+    def assert_level_2_auth(self):
+        """
+        Level 2 Poly Auth
+        """
+        if self.mode < L2:
+            raise PolyException(L2_AUTH_UNAVAILABLE)
+
+    def _get_client_mode(self):
+        if self.signer is not None and self.creds is not None:
+            return L2
+        if self.signer is not None:
+            return L1
+        return L0
+
+    async def get_notifications(self):
+        """
+        Fetches the notifications for a user
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        request_args = RequestArgs(method="GET", request_path=GET_NOTIFICATIONS)
+        headers = self.__l2_headers(request_args)
+        url = "{}{}?signature_type={}".format(
+            self.host, GET_NOTIFICATIONS, self.builder.sig_type
+        )
+        return await self.transport.get(url, headers=headers)
+
+    async def drop_notifications(self, params: DropNotificationParams = None):
+        """
+        Drops the notifications for a user
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        request_args = RequestArgs(method="DELETE", request_path=DROP_NOTIFICATIONS)
+        headers = self.__l2_headers(request_args)
+        url = drop_notifications_query_params(
+            "{}{}".format(self.host, DROP_NOTIFICATIONS), params
+        )
+        return await self.transport.delete(url, headers=headers)
+
+    async def get_balance_allowance(self, params: BalanceAllowanceParams = None):
+        """
+        Fetches the balance & allowance for a user
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        request_args = RequestArgs(method="GET", request_path=GET_BALANCE_ALLOWANCE)
+        headers = self.__l2_headers(request_args)
+        if params.signature_type == -1:
+            params.signature_type = self.builder.sig_type
+        url = add_balance_allowance_params_to_url(
+            "{}{}".format(self.host, GET_BALANCE_ALLOWANCE), params
+        )
+        return await self.transport.get(url, headers=headers)
+
+    async def update_balance_allowance(self, params: BalanceAllowanceParams = None):
+        """
+        Updates the balance & allowance for a user
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        request_args = RequestArgs(method="GET", request_path=UPDATE_BALANCE_ALLOWANCE)
+        headers = self.__l2_headers(request_args)
+        if params.signature_type == -1:
+            params.signature_type = self.builder.sig_type
+        url = add_balance_allowance_params_to_url(
+            "{}{}".format(self.host, UPDATE_BALANCE_ALLOWANCE), params
+        )
+        return await self.transport.get(url, headers=headers)
+
+    async def is_order_scoring(self, params: OrderScoringParams):
+        """
+        Check if the order is currently scoring
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        request_args = RequestArgs(method="GET", request_path=IS_ORDER_SCORING)
+        headers = self.__l2_headers(request_args)
+        url = add_order_scoring_params_to_url(
+            "{}{}".format(self.host, IS_ORDER_SCORING), params
+        )
+        return await self.transport.get(url, headers=headers)
+
+    async def are_orders_scoring(self, params: OrdersScoringParams):
+        """
+        Check if the orders are currently scoring
+        Requires Level 2 authentication
+        """
+        self.assert_level_2_auth()
+        body = params.orderIds
+        request_args = RequestArgs(
+            method="POST", request_path=ARE_ORDERS_SCORING, body=body
+        )
+        headers = self.__l2_headers(request_args)
+        return await self.transport.post(
+            "{}{}".format(self.host, ARE_ORDERS_SCORING),
+            headers=headers,
+            data=request_args.serialized_body,
+        )
+
+    async def get_sampling_markets(self, next_cursor="MA=="):
+        """
+        Get the current sampling markets
+        """
+        return await self.transport.get(
+            "{}{}?next_cursor={}".format(self.host, GET_SAMPLING_MARKETS, next_cursor)
+        )
+
+    async def get_sampling_simplified_markets(self, next_cursor="MA=="):
+        """
+        Get the current sampling simplified markets
+        """
+        return await self.transport.get(
+            "{}{}?next_cursor={}".format(
+                self.host, GET_SAMPLING_SIMPLIFIED_MARKETS, next_cursor
+            )
+        )
+
+    async def get_markets(self, next_cursor="MA=="):
+        """
+        Get the current markets
+        """
+        return await self.transport.get(
+            "{}{}?next_cursor={}".format(self.host, GET_MARKETS, next_cursor)
+        )
+
+    async def get_simplified_markets(self, next_cursor="MA=="):
+        """
+        Get the current simplified markets
+        """
+        return await self.transport.get(
+            "{}{}?next_cursor={}".format(self.host, GET_SIMPLIFIED_MARKETS, next_cursor)
+        )
+
+    def iter_markets(self, next_cursor="MA==", prefetch=False, typed=False):
+        """
+        Yields the current markets page by page, prefetch fetches the next page while the
+        current one is consumed
+        typed yields Market structs
+        """
+        if not typed:
+            return aiter_records(self.get_markets, next_cursor, prefetch)
+
+        async def fetch_page(cursor):
+            return decode_page(
+                await self.transport.get_text(
+                    "{}{}?next_cursor={}".format(self.host, GET_MARKETS, cursor)
+                ),
+                Market,
+            )
+
+        return aiter_records(fetch_page, next_cursor, prefetch)
+
+    def iter_simplified_markets(self, next_cursor="MA==", prefetch=False, typed=False):
+        """
+        Yields the current simplified markets page by page, prefetch fetches the next page
+        while the current one is consumed
+        typed yields SimplifiedMarket structs
+        """
+        if not typed:
+            return aiter_records(self.get_simplified_markets, next_cursor, prefetch)
+
+        async def fetch_page(cursor):
+            return decode_page(
+                await self.transport.get_text(
+                    "{}{}?next_cursor={}".format(
+                        self.host, GET_SIMPLIFIED_MARKETS, cursor
+                    )
+                ),
+                SimplifiedMarket,
+            )
+
+        return aiter_records(fetch_page, next_cursor, prefetch)
+
+    async def get_market(self, condition_id):
+        """
+        Get a market by condition_id
+        """
+        return await self.transport.get(
+            "{}{}{}".format(self.host, GET_MARKET, condition_id)
+        )
+
+    async def get_market_trades_events(self, condition_id):
+        """
+        Get the market's trades events by condition id
+        """
+        return await self.transport.get(
+            "{}{}{}".format(self.host, GET_MARKET_TRADES_EVENTS, condition_id)
+        )
+
+    async def calculate_market_price(
+        self, token_id: str, side: str, amount: float
+    ) -> float:
+        """
+        Calculates the matching price considering an amount and the current orderbook
+        """
+        book = await self.get_order_book(token_id)
+        if book is None:
+            raise Exception("no orderbook")
+        if side == "BUY":
+            if book.asks is None:
+                raise Exception("no match")
+            return self.builder.calculate_buy_market_price(book.asks, amount)
+        else:
+            if book.bids is None:
+                raise Exception("no match")
+            return self.builder.calculate_sell_market_price(book.bids, amount)
@@ -0,0 +1,134 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Optional, Sequence
+
+from .clob_types import TickSize
+from .order_book import BookSide, OrderBook
+from .order_builder.constants import BUY, SELL
+
+
+class BookAnalytics:
+    """
+    Market price and depth analytics over one order book snapshot
+
+    Amounts follow the market order convention:
+    BUY amounts are collateral to spend against the asks,
+    SELL amounts are shares to sell into the bids
+
+    Cumulative size and notional columns are computed once per snapshot, so every
+    query is a bisection over them rather than a walk of the levels
+    """
+
+    def __init__(self, book: OrderBook):
+        self.book = book
+        self._negated_bid_prices = None
+
+    def _side(self, side: str) -> BookSide:
+        if side == BUY:
+            return self.book.asks
+        elif side == SELL:
+            return self.book.bids
+        else:
+            raise ValueError(f"side must be '{BUY}' or '{SELL}'")
+
+    def _fill_index(self, side: str, amount: float) -> int:
+        """
+        Index of the level that completes a fill of amount, len(levels) if it can't be filled
+        """
+        levels = self._side(side)
+        cumulative = (
+            levels.cumulative_notionals if side == BUY else levels.cumulative_sizes
+        )
+        return bisect_left(cumulative, amount)
+
+    def worst_prices(
+        self, side: str, amounts: Sequence[float]
+    ) -> list[Optional[float]]:
+        """
+        Price of the last level needed to fill each amount, None if the book is too thin
+        """
+        prices = self._side(side).prices
+        results = []
+        for amount in amounts:
+            i = self._fill_index(side, amount)
+            results.append(prices[i] if i < len(prices) else None)
+        return results
+
+    def worst_price(self, side: str, amount: float) -> float:
+        """
+        Price of the last level needed to fill amount, i.e. the market price for amount
+        """
+        price = self.worst_prices(side, [amount])[0]
+        if price is None:
+            raise Exception("no match")
+        return price
+
+    def vwaps(self, side: str, amounts: Sequence[float]) -> list[Optional[float]]:
+        """
+        Volume weighted average fill price of each amount, None if the book is too thin
+        """
+        levels = self._side(side)
+        prices = levels.prices
+        cumulative_sizes = levels.cumulative_sizes
+        cumulative_notionals = levels.cumulative_notionals
+
+        results = []
+        for amount in amounts:
+            i = self._fill_index(side, amount)
+            if i >= len(prices) or amount <= 0:
+                results.append(None)
+                continue
+
+            filled_size = cumulative_sizes[i - 1] if i > 0 else 0.0
+            filled_notional = cumulative_notionals[i - 1] if i > 0 else 0.0
+            if side == BUY:
+                # amount is notional, the last level fills the remaining notional
+                size = filled_size + (amount - filled_notional) / prices[i]
+                results.append(amount / size)
+            else:
+                # amount is size, the last level fills the remaining size
+                notional = filled_notional + (amount - filled_size) * prices[i]
+                results.append(notional / amount)
+        return results
+
+    def vwap(self, side: str, amount: float) -> float:
+        """
+        Volume weighted average fill price of amount
+        """
+        price = self.vwaps(side, [amount])[0]
+        if price is None:
+            raise Exception("no match")
+        return price
+
+    def sizes_within(
+        self, side: str, ticks: Sequence[int], tick_size: TickSize
+    ) -> list[float]:
+        """
+        Size resting within each number of ticks of the top of the book:
+        on the asks for BUY, on the bids for SELL
+        """
+        levels = self._side(side)
+        if not levels:
+            return [0.0 for _ in ticks]
+
+        tick = float(tick_size)
+        cumulative_sizes = levels.cumulative_sizes
+        results = []
+        for n in ticks:
+            # half a tick of slack absorbs float noise, levels are a full tick apart
+            if side == BUY:
+                limit = levels.prices[0] + (n + 0.5) * tick
+                count = bisect_right(levels.prices, limit)
+            else:
+                if self._negated_bid_prices is None:
+                    self._negated_bid_prices = array("d", (-p for p in levels.prices))
+                limit = -(levels.prices[0] - (n + 0.5) * tick)
+                count = bisect_right(self._negated_bid_prices, limit)
+            results.append(cumulative_sizes[count - 1] if count > 0 else 0.0)
+        return results
+
+    def size_within(self, side: str, ticks: int, tick_size: TickSize) -> float:
+        """
+        Size resting within ticks of the top of the book
+        """
+        return self.sizes_within(side, [ticks], tick_size)[0]
@@ -0,0 +1,105 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
+
+from .codec import get_codec
+from .constants import END_CURSOR
+from .endpoints import GET_MARKETS
+from .pagination import INITIAL_CURSOR
+
+# next_cursor is read straight from the body, so the next page can be requested
+# before the current one is decoded
+NEXT_CURSOR_PATTERN = re.compile(r'"next_cursor"\s*:\s*"([^"]*)"')
+
+
+def _next_cursor(body: str) -> Optional[str]:
+    match = NEXT_CURSOR_PATTERN.search(body)
+    return match.group(1) if match else None
+
+
+class MarketCatalogue:
+    """
+    In-memory market table keyed by condition_id and by token_id, filled by crawling
+    one of the market listings: GET_MARKETS, GET_SIMPLIFIED_MARKETS, GET_SAMPLING_MARKETS
+    or GET_SAMPLING_SIMPLIFIED_MARKETS
+
+    Crawls are pipelined: the request for the next page is sent as soon as the current
+    page's next_cursor is known, and overlaps with decoding and indexing the current page,
+    so a full crawl costs one round trip per page
+    """
+
+    def __init__(self, client, endpoint: str = GET_MARKETS):
+        """
+        client: ClobClient whose host and transport are used for the crawl
+        endpoint: market listing to crawl
+        """
+        self.client = client
+        self.endpoint = endpoint
+        self.__by_condition_id = {}
+        self.__by_token_id = {}
+
+    def sync(self) -> int:
+        """
+        Crawls the whole listing and replaces the tables, returns the number of markets
+        """
+        by_condition_id = {}
+        by_token_id = {}
+
+        for _, markets in self.crawl_pages():
+            for market in markets:
+                condition_id = market.get("condition_id")
+                if condition_id:
+                    by_condition_id[condition_id] = market
+                for token in market.get("tokens") or []:
+                    token_id = token.get("token_id")
+                    if token_id:
+                        by_token_id[token_id] = market
+
+        # swapped whole so readers always see a complete table
+        self.__by_condition_id = by_condition_id
+        self.__by_token_id = by_token_id
+        return len(by_condition_id)
+
+    def __fetch(self, cursor: str) -> str:
+        return self.client.transport.get_text(
+            "{}{}?next_cursor={}".format(self.client.host, self.endpoint, cursor)
+        )
+
+    def crawl_pages(
+        self, next_cursor: str = INITIAL_CURSOR
+    ) -> Iterator[Tuple[str, list]]:
+        """
+        Yields (cursor, markets) for every page of the listing from next_cursor on
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            cursor = next_cursor
+            pending = executor.submit(self.__fetch, cursor)
+            while pending is not None:
+                body = pending.result()
+                pending = None
+
+                next_cursor = _next_cursor(body)
+                if next_cursor is not None and next_cursor != END_CURSOR:
+                    pending = executor.submit(self.__fetch, next_cursor)
+
+                page = get_codec().decode(body)
+                if next_cursor is None:
+                    # not found in the body, fall back to the decoded page
+                    next_cursor = page.get("next_cursor")
+                    if next_cursor and next_cursor != END_CURSOR:
+                        pending = executor.submit(self.__fetch, next_cursor)
+
+                yield cursor, page.get("data") or []
+                cursor = next_cursor
+
+    def __len__(self) -> int:
+        return len(self.__by_condition_id)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.__by_condition_id.values())
+
+    def get_market(self, condition_id: str) -> Optional[dict]:
+        return self.__by_condition_id.get(condition_id)
+
+    def get_market_by_token(self, token_id: str) -> Optional[dict]:
+        return self.__by_token_id.get(token_id)
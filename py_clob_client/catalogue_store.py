@@ -0,0 +1,224 @@
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+from .catalogue import MarketCatalogue
+from .codec import get_codec
+from .endpoints import GET_MARKETS
+from .pagination import INITIAL_CURSOR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    condition_id TEXT PRIMARY KEY,
+    minimum_tick_size TEXT,
+    neg_risk INTEGER,
+    active INTEGER,
+    closed INTEGER,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    token_id TEXT PRIMARY KEY,
+    condition_id TEXT NOT NULL,
+    outcome TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+LAST_CURSOR = "last_cursor"
+LAST_FULL_REFRESH = "last_full_refresh"
+
+# seconds a market row is trusted for, tick sizes and flags change over time
+DEFAULT_MAX_AGE = 3600.0
+
+
+def _flag(value) -> Optional[int]:
+    return None if value is None else int(bool(value))
+
+
+class CatalogueStore:
+    """
+    On-disk market catalogue in SQLite: market metadata, token ids, tick size and
+    neg risk flag, persisted across restarts
+
+    refresh() crawls the market listing through a MarketCatalogue. New markets are
+    appended to the end of the listing, so an incremental refresh resumes from the last
+    page seen instead of crawling everything again. Markets already stored change too,
+    e.g. their tick size or closed flag, so once the last full crawl is older than
+    max_age a refresh crawls the whole listing again, and rows older than max_age aren't
+    used to warm caches
+    """
+
+    def __init__(
+        self,
+        path: str,
+        client=None,
+        endpoint: str = GET_MARKETS,
+        max_age: float = DEFAULT_MAX_AGE,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        path: SQLite database file, created if needed
+        client: ClobClient used to refresh the store
+        endpoint: market listing to crawl
+        max_age: seconds after which stored markets are crawled again, and no longer
+                 used to warm caches
+        """
+        self.path = path
+        self.client = client
+        self.endpoint = endpoint
+        self.max_age = max_age
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        self.__conn.executescript(SCHEMA)
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Fetches the markets listed since the last refresh, or every market if full or if
+        the last full refresh is older than max_age, returns the number of markets written
+        """
+        if self.client is None:
+            raise Exception("A client is needed to refresh the catalogue")
+
+        started_at = self.clock()
+        last_full_refresh = self.__get_meta(LAST_FULL_REFRESH)
+        if last_full_refresh is None or (
+            started_at - float(last_full_refresh) >= self.max_age
+        ):
+            full = True
+
+        start_cursor = None if full else self.__get_meta(LAST_CURSOR)
+        catalogue = MarketCatalogue(self.client, self.endpoint)
+
+        written = 0
+        last_cursor = None
+        for cursor, markets in catalogue.crawl_pages(start_cursor or INITIAL_CURSOR):
+            # one transaction per page, readers aren't blocked for the whole crawl
+            with self.__lock, self.__conn:
+                self.__write_markets(markets)
+            written += len(markets)
+            last_cursor = cursor
+
+        meta = []
+        if last_cursor is not None:
+            meta.append((LAST_CURSOR, last_cursor))
+        if full:
+            meta.append((LAST_FULL_REFRESH, repr(started_at)))
+        with self.__lock, self.__conn:
+            self.__conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta
+            )
+        return written
+
+    def __write_markets(self, markets: list):
+        market_rows = []
+        token_rows = []
+        updated_at = self.clock()
+        for market in markets:
+            condition_id = market.get("condition_id")
+            if not condition_id:
+                continue
+            tick_size = market.get("minimum_tick_size")
+            market_rows.append(
+                (
+                    condition_id,
+                    str(tick_size) if tick_size is not None else None,
+                    _flag(market.get("neg_risk")),
+                    _flag(market.get("active")),
+                    _flag(market.get("closed")),
+                    get_codec().encode(market),
+                    updated_at,
+                )
+            )
+            for token in market.get("tokens") or []:
+                if token.get("token_id"):
+                    token_rows.append(
+                        (token["token_id"], condition_id, token.get("outcome"))
+                    )
+
+        self.__conn.executemany(
+            "INSERT OR REPLACE INTO markets "
+            "(condition_id, minimum_tick_size, neg_risk, active, closed, data, "
+            "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            market_rows,
+        )
+        self.__conn.executemany(
+            "INSERT OR REPLACE INTO tokens (token_id, condition_id, outcome) "
+            "VALUES (?, ?, ?)",
+            token_rows,
+        )
+
+    def __get_meta(self, key: str) -> Optional[str]:
+        row = self.__query_one("SELECT value FROM meta WHERE key = ?", (key,))
+        return row[0] if row else None
+
+    def __query_one(self, sql: str, params: tuple = ()):
+        with self.__lock:
+            return self.__conn.execute(sql, params).fetchone()
+
+    def __query_all(self, sql: str, params: tuple = ()) -> list:
+        with self.__lock:
+            return self.__conn.execute(sql, params).fetchall()
+
+    def __len__(self) -> int:
+        return self.__query_one("SELECT COUNT(*) FROM markets")[0]
+
+    def __iter__(self) -> Iterator[dict]:
+        decode = get_codec().decode
+        return (decode(data) for data, in self.__query_all("SELECT data FROM markets"))
+
+    def get_market(self, condition_id: str) -> Optional[dict]:
+        row = self.__query_one(
+            "SELECT data FROM markets WHERE condition_id = ?", (condition_id,)
+        )
+        return get_codec().decode(row[0]) if row else None
+
+    def get_market_by_token(self, token_id: str) -> Optional[dict]:
+        row = self.__query_one(
+            "SELECT m.data FROM tokens t JOIN markets m USING (condition_id) "
+            "WHERE t.token_id = ?",
+            (token_id,),
+        )
+        return get_codec().decode(row[0]) if row else None
+
+    def tick_sizes(self) -> dict[str, str]:
+        """
+        Minimum tick size of every token with a known one, written less than max_age ago
+        """
+        return dict(
+            self.__query_all(
+                "SELECT t.token_id, m.minimum_tick_size FROM tokens t "
+                "JOIN markets m USING (condition_id) "
+                "WHERE m.minimum_tick_size IS NOT NULL AND m.updated_at >= ?",
+                (self.clock() - self.max_age,),
+            )
+        )
+
+    def neg_risk(self) -> dict[str, bool]:
+        """
+        Neg risk flag of every token with a known one, written less than max_age ago
+        """
+        return {
+            token_id: bool(neg_risk)
+            for token_id, neg_risk in self.__query_all(
+                "SELECT t.token_id, m.neg_risk FROM tokens t "
+                "JOIN markets m USING (condition_id) "
+                "WHERE m.neg_risk IS NOT NULL AND m.updated_at >= ?",
+                (self.clock() - self.max_age,),
+            )
+        }
+
+    def warm(self, client):
+        """
+        Seeds the tick size and neg risk caches of a ClobClient or AsyncClobClient, with
+        the markets written less than max_age ago
+        """
+        client.load_market_metadata(self.tick_sizes(), self.neg_risk())
+
+    def close(self):
+        self.__conn.close()
@@ -1,9 +1,19 @@
 import logging
 from typing import Optional
 
+from py_order_utils.model import SignedOrder
+
 from .order_builder.builder import OrderBuilder
-from .headers.headers import create_level_1_headers, create_level_2_headers
+from .order_builder.eip712 import signed_order_hash
+from .order_book import OrderBook
+from .headers.headers import (
+    POLY_API_KEY,
+    POLY_NONCE,
+    L2Authenticator,
+    create_level_1_headers,
+)
 from .signer import Signer
+from .clock import ServerClock
 from .config import get_contract_config
 
 from .endpoints import (
@@ -22,6 +32,7 @@ from .endpoints import (
     MID_POINT,
     ORDERS,
     POST_ORDER,
+    POST_ORDERS,
     PRICE,
     TIME,
     TRADES,
@@ -63,22 +74,26 @@ from .clob_types import (
     PartialCreateOrderOptions,
     BookParams,
     MarketOrderArgs,
+    PostOrdersArgs,
 )
-from .exceptions import PolyException
+from .exceptions import PolyApiException, PolyException
 from .http_helpers.helpers import (
     add_query_trade_params,
     add_query_open_orders_params,
-    delete,
-    get,
-    post,
     drop_notifications_query_params,
     add_balance_allowance_params_to_url,
     add_order_scoring_params_to_url,
 )
+from .http_helpers.retry import RetryingTransport, RetryPolicy
+from .http_helpers.transport import HttpTransport
 
-from .constants import L0, L1, L1_AUTH_UNAVAILABLE, L2, L2_AUTH_UNAVAILABLE, END_CURSOR
+from .constants import L0, L1, L1_AUTH_UNAVAILABLE, L2, L2_AUTH_UNAVAILABLE
+from .metadata_cache import DEFAULT_TICK_SIZE_TTL, MetadataCache
+from .pagination import iter_records
+from .structs import Market, OpenOrder, SimplifiedMarket, Trade, decode_page
 from .utilities import (
     parse_raw_orderbook_summary,
+    parse_raw_orderbook,
     generate_orderbook_summary_hash,
     order_to_json,
     is_tick_size_smaller,
@@ -95,6 +110,12 @@ class ClobClient:
         creds: ApiCreds = None,
         signature_type: int = None,
         funder: str = None,
+        signing_workers: int = None,
+        transport: HttpTransport = None,
+        tick_size_cache: MetadataCache = None,
+        neg_risk_cache: MetadataCache = None,
+        retry_policy: RetryPolicy = None,
+        server_clock: ServerClock = None,
     ):
         """
         Initializes the clob client
@@ -107,24 +128,69 @@ class ClobClient:
 
         3) Level 2: Requires the host, chain_id, a private key, and Credentials.
                     Allows access to all endpoints
+
+        An HttpTransport can be passed to tune the connection pool and timeouts,
+        otherwise the client creates its own. Wrapping it in a CoalescingTransport
+        merges identical concurrent public GETs, in a BatchingTransport turns
+        concurrent single token price and book GETs into batch requests
+
+        signing_workers: number of worker processes used to sign batches of orders,
+        see create_orders
+
+        tick_size_cache, neg_risk_cache: caches for the tick size and neg risk of tokens,
+        by default tick sizes expire after DEFAULT_TICK_SIZE_TTL seconds
+
+        retry_policy: if given, failed requests are retried according to it, see
+        RetryingTransport. Order posts are looked up by order hash before being resent
+
+        server_clock: if given, auth headers are timestamped with its estimate of the
+        server time instead of the local time, sample it with
+        server_clock.start(client.get_server_time)
         """
         self.host = host[0:-1] if host.endswith("/") else host
+        self.transport = transport if transport is not None else HttpTransport()
+        if retry_policy is not None:
+            self.transport = RetryingTransport(
+                self.transport,
+                retry_policy,
+                self.__lookup_posted_order,
+                sign_headers=self.__sign_again,
+            )
+        self.server_clock = server_clock
         self.chain_id = chain_id
         self.signer = Signer(key, chain_id) if key else None
         self.creds = creds
         self.mode = self._get_client_mode()
+        self.__l2_authenticator = self.__get_l2_authenticator()
 
         if self.signer:
             self.builder = OrderBuilder(
-                self.signer, sig_type=signature_type, funder=funder
+                self.signer,
+                sig_type=signature_type,
+                funder=funder,
+                signing_workers=signing_workers,
             )
 
         # local cache
-        self.__tick_sizes = {}
-        self.__neg_risk = {}
+        self.__tick_sizes = (
+            tick_size_cache
+            if tick_size_cache is not None
+            else MetadataCache(ttl=DEFAULT_TICK_SIZE_TTL)
+        )
+        self.__neg_risk = (
+            neg_risk_cache if neg_risk_cache is not None else MetadataCache()
+        )
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    def close(self):
+        """
+        Closes the http connections and the signing worker processes, if any
+        """
+        self.transport.close()
+        if self.signer:
+            self.builder.close()
+
     def get_address(self):
         """
         Returns the public address of the signer
@@ -160,14 +226,14 @@ class ClobClient:
         Health check: Confirms that the server is up
         Does not need authentication
         """
-        return get("{}/".format(self.host))
+        return self.transport.get("{}/".format(self.host))
 
     def get_server_time(self):
         """
         Returns the current timestamp on the server
         Does not need authentication
         """
-        return get("{}{}".format(self.host, TIME))
+        return self.transport.get("{}{}".format(self.host, TIME))
 
     def create_api_key(self, nonce: int = None) -> ApiCreds:
         """
@@ -176,9 +242,9 @@ class ClobClient:
         self.assert_level_1_auth()
 
         endpoint = "{}{}".format(self.host, CREATE_API_KEY)
-        headers = create_level_1_headers(self.signer, nonce)
+        headers = create_level_1_headers(self.signer, nonce, self.__timestamp())
 
-        creds_raw = post(endpoint, headers=headers)
+        creds_raw = self.transport.post(endpoint, headers=headers)
         try:
             creds = ApiCreds(
                 api_key=creds_raw["apiKey"],
@@ -197,9 +263,9 @@ class ClobClient:
         self.assert_level_1_auth()
 
         endpoint = "{}{}".format(self.host, DERIVE_API_KEY)
-        headers = create_level_1_headers(self.signer, nonce)
+        headers = create_level_1_headers(self.signer, nonce, self.__timestamp())
 
-        creds_raw = get(endpoint, headers=headers)
+        creds_raw = self.transport.get(endpoint, headers=headers)
         try:
             creds = ApiCreds(
                 api_key=creds_raw["apiKey"],
@@ -226,6 +292,7 @@ class ClobClient:
         """
         self.creds = creds
         self.mode = self._get_client_mode()
+        self.__l2_authenticator = self.__get_l2_authenticator()
 
     def get_api_keys(self):
         """
@@ -235,8 +302,10 @@ class ClobClient:
         self.assert_level_2_auth()
 
         request_args = RequestArgs(method="GET", request_path=GET_API_KEYS)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
-        return get("{}{}".format(self.host, GET_API_KEYS), headers=headers)
+        headers = self.__l2_headers(request_args)
+        return self.transport.get(
+            "{}{}".format(self.host, GET_API_KEYS), headers=headers
+        )
 
     def get_closed_only_mode(self):
         """
@@ -246,8 +315,10 @@ class ClobClient:
         self.assert_level_2_auth()
 
         request_args = RequestArgs(method="GET", request_path=CLOSED_ONLY)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
-        return get("{}{}".format(self.host, CLOSED_ONLY), headers=headers)
+        headers = self.__l2_headers(request_args)
+        return self.transport.get(
+            "{}{}".format(self.host, CLOSED_ONLY), headers=headers
+        )
 
     def delete_api_key(self):
         """
@@ -257,66 +328,120 @@ class ClobClient:
         self.assert_level_2_auth()
 
         request_args = RequestArgs(method="DELETE", request_path=DELETE_API_KEY)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
-        return delete("{}{}".format(self.host, DELETE_API_KEY), headers=headers)
+        headers = self.__l2_headers(request_args)
+        return self.transport.delete(
+            "{}{}".format(self.host, DELETE_API_KEY), headers=headers
+        )
 
     def get_midpoint(self, token_id):
         """
         Get the mid market price for the given market
         """
-        return get("{}{}?token_id={}".format(self.host, MID_POINT, token_id))
+        return self.transport.get(
+            "{}{}?token_id={}".format(self.host, MID_POINT, token_id)
+        )
 
     def get_midpoints(self, params: list[BookParams]):
         """
         Get the mid market prices for a set of token ids
         """
         body = [{"token_id": param.token_id} for param in params]
-        return post("{}{}".format(self.host, MID_POINTS), data=body)
+        return self.transport.post("{}{}".format(self.host, MID_POINTS), data=body)
 
     def get_price(self, token_id, side):
         """
         Get the market price for the given market
         """
-        return get("{}{}?token_id={}&side={}".format(self.host, PRICE, token_id, side))
+        return self.transport.get(
+            "{}{}?token_id={}&side={}".format(self.host, PRICE, token_id, side)
+        )
 
     def get_prices(self, params: list[BookParams]):
         """
         Get the market prices for a set
         """
         body = [{"token_id": param.token_id, "side": param.side} for param in params]
-        return post("{}{}".format(self.host, GET_PRICES), data=body)
+        return self.transport.post("{}{}".format(self.host, GET_PRICES), data=body)
 
     def get_spread(self, token_id):
         """
         Get the spread for the given market
         """
-        return get("{}{}?token_id={}".format(self.host, GET_SPREAD, token_id))
+        return self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_SPREAD, token_id)
+        )
 
     def get_spreads(self, params: list[BookParams]):
         """
         Get the spreads for a set of token ids
         """
         body = [{"token_id": param.token_id} for param in params]
-        return post("{}{}".format(self.host, GET_SPREADS), data=body)
+        return self.transport.post("{}{}".format(self.host, GET_SPREADS), data=body)
 
     def get_tick_size(self, token_id: str) -> TickSize:
-        if token_id in self.__tick_sizes:
-            return self.__tick_sizes[token_id]
+        return self.__tick_sizes.get_or_load(token_id, self.__fetch_tick_size)
 
-        result = get("{}{}?token_id={}".format(self.host, GET_TICK_SIZE, token_id))
-        self.__tick_sizes[token_id] = str(result["minimum_tick_size"])
-
-        return self.__tick_sizes[token_id]
+    def __fetch_tick_size(self, token_id: str) -> TickSize:
+        result = self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_TICK_SIZE, token_id)
+        )
+        return str(result["minimum_tick_size"])
 
     def get_neg_risk(self, token_id: str) -> bool:
-        if token_id in self.__neg_risk:
-            return self.__neg_risk[token_id]
-
-        result = get("{}{}?token_id={}".format(self.host, GET_NEG_RISK, token_id))
-        self.__neg_risk[token_id] = result["neg_risk"]
+        return self.__neg_risk.get_or_load(token_id, self.__fetch_neg_risk)
 
+    def __fetch_neg_risk(self, token_id: str) -> bool:
+        result = self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_NEG_RISK, token_id)
+        )
         return result["neg_risk"]
 
+    def load_market_metadata(self, tick_sizes: dict = None, neg_risk: dict = None):
+        """
+        Seeds the tick size and neg risk caches, keyed by token_id, e.g. from a CatalogueStore
+        """
+        if tick_sizes:
+            self.__tick_sizes.update(tick_sizes)
+        if neg_risk:
+            self.__neg_risk.update(neg_risk)
+
+    def warm(self, token_ids: list[str], markets=None) -> int:
+        """
+        Fills the tick size and neg risk caches of token_ids from market listings: the
+        given markets, e.g. a MarketCatalogue or CatalogueStore, or else the market
+        listing, crawled until every token is found
+        Returns the number of tokens found
+        """
+        remaining = set(token_ids)
+        found = 0
+        if markets is None:
+            markets = self.iter_markets(prefetch=True)
+        for market in markets:
+            found += self.__cache_market_metadata(market, remaining)
+            if not remaining:
+                break
+        return found
+
+    def __cache_market_metadata(self, market: dict, token_ids: set) -> int:
+        """
+        Caches the tick size and neg risk of the market's tokens found in token_ids,
+        removing them from it
+        """
+        tick_size = market.get("minimum_tick_size")
+        neg_risk = market.get("neg_risk")
+        found = 0
+        for token in market.get("tokens") or []:
+            token_id = token.get("token_id")
+            if token_id not in token_ids:
+                continue
+            if tick_size is not None:
+                self.__tick_sizes.set(token_id, str(tick_size))
+            if neg_risk is not None:
+                self.__neg_risk.set(token_id, neg_risk)
+            token_ids.discard(token_id)
+            found += 1
+        return found
+
     def __resolve_tick_size(
         self, token_id: str, tick_size: TickSize = None
     ) -> TickSize:
@@ -333,16 +458,9 @@ class ClobClient:
             tick_size = min_tick_size
         return tick_size
 
-    def create_order(
+    def __resolve_order_options(
         self, order_args: OrderArgs, options: Optional[PartialCreateOrderOptions] = None
-    ):
-        """
-        Creates and signs an order
-        Level 1 Auth required
-        """
-        self.assert_level_1_auth()
-
-        # add resolve_order_options, or similar
+    ) -> CreateOrderOptions:
         tick_size = self.__resolve_tick_size(
             order_args.token_id,
             options.tick_size if options else None,
@@ -364,14 +482,48 @@ class ClobClient:
             else self.get_neg_risk(order_args.token_id)
         )
 
+        return CreateOrderOptions(
+            tick_size=tick_size,
+            neg_risk=neg_risk,
+        )
+
+    def create_order(
+        self, order_args: OrderArgs, options: Optional[PartialCreateOrderOptions] = None
+    ):
+        """
+        Creates and signs an order
+        Level 1 Auth required
+        """
+        self.assert_level_1_auth()
+
         return self.builder.create_order(
-            order_args,
-            CreateOrderOptions(
-                tick_size=tick_size,
-                neg_risk=neg_risk,
-            ),
+            order_args, self.__resolve_order_options(order_args, options)
         )
 
+    def create_orders(
+        self,
+        orders_args: list[OrderArgs],
+        options: Optional[PartialCreateOrderOptions] = None,
+        max_workers: int = None,
+    ) -> list[SignedOrder]:
+        """
+        Creates and signs a batch of orders
+        The signed orders are returned in the same order as orders_args
+        Level 1 Auth required
+
+        Signing is CPU bound and holds the GIL, so the default pool of max_workers
+        threads signs little faster than a loop. Create the client with
+        signing_workers to sign large batches across processes
+        """
+        self.assert_level_1_auth()
+
+        create_options = [
+            self.__resolve_order_options(order_args, options)
+            for order_args in orders_args
+        ]
+
+        return self.builder.create_orders(orders_args, create_options, max_workers)
+
     def create_market_order(
         self,
         order_args: MarketOrderArgs,
@@ -424,12 +576,13 @@ class ClobClient:
         """
         self.assert_level_2_auth()
         body = order_to_json(order, self.creds.api_key, orderType)
-        headers = create_level_2_headers(
-            self.signer,
-            self.creds,
-            RequestArgs(method="POST", request_path=POST_ORDER, body=body),
+        request_args = RequestArgs(method="POST", request_path=POST_ORDER, body=body)
+        headers = self.__l2_headers(request_args)
+        return self.transport.post(
+            "{}{}".format(self.host, POST_ORDER),
+            headers=headers,
+            data=request_args.serialized_body,
         )
-        return post("{}{}".format(self.host, POST_ORDER), headers=headers, data=body)
 
     def create_and_post_order(
         self, order_args: OrderArgs, options: PartialCreateOrderOptions = None
@@ -440,6 +593,38 @@ class ClobClient:
         ord = self.create_order(order_args, options)
         return self.post_order(ord)
 
+    def post_orders(self, args: list[PostOrdersArgs]):
+        """
+        Posts a batch of orders in a single request
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+        body = [
+            order_to_json(arg.order, self.creds.api_key, arg.orderType) for arg in args
+        ]
+        request_args = RequestArgs(method="POST", request_path=POST_ORDERS, body=body)
+        headers = self.__l2_headers(request_args)
+        return self.transport.post(
+            "{}{}".format(self.host, POST_ORDERS),
+            headers=headers,
+            data=request_args.serialized_body,
+        )
+
+    def create_and_post_orders(
+        self,
+        orders_args: list[OrderArgs],
+        options: PartialCreateOrderOptions = None,
+        orderType: OrderType = OrderType.GTC,
+    ):
+        """
+        Utility function to create, sign concurrently and publish a batch of orders
+        in a single request
+        """
+        orders = self.create_orders(orders_args, options)
+        return self.post_orders(
+            [PostOrdersArgs(order=order, orderType=orderType) for order in orders]
+        )
+
     def cancel(self, order_id):
         """
         Cancels an order
@@ -449,8 +634,12 @@ class ClobClient:
         body = {"orderID": order_id}
 
         request_args = RequestArgs(method="DELETE", request_path=CANCEL, body=body)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
-        return delete("{}{}".format(self.host, CANCEL), headers=headers, data=body)
+        headers = self.__l2_headers(request_args)
+        return self.transport.delete(
+            "{}{}".format(self.host, CANCEL),
+            headers=headers,
+            data=request_args.serialized_body,
+        )
 
     def cancel_orders(self, order_ids):
         """
@@ -463,9 +652,11 @@ class ClobClient:
         request_args = RequestArgs(
             method="DELETE", request_path=CANCEL_ORDERS, body=body
         )
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
-        return delete(
-            "{}{}".format(self.host, CANCEL_ORDERS), headers=headers, data=body
+        headers = self.__l2_headers(request_args)
+        return self.transport.delete(
+            "{}{}".format(self.host, CANCEL_ORDERS),
+            headers=headers,
+            data=request_args.serialized_body,
         )
 
     def cancel_all(self):
@@ -475,8 +666,10 @@ class ClobClient:
         """
         self.assert_level_2_auth()
         request_args = RequestArgs(method="DELETE", request_path=CANCEL_ALL)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
-        return delete("{}{}".format(self.host, CANCEL_ALL), headers=headers)
+        headers = self.__l2_headers(request_args)
+        return self.transport.delete(
+            "{}{}".format(self.host, CANCEL_ALL), headers=headers
+        )
 
     def cancel_market_orders(self, market: str = "", asset_id: str = ""):
         """
@@ -489,45 +682,79 @@ class ClobClient:
         request_args = RequestArgs(
             method="DELETE", request_path=CANCEL_MARKET_ORDERS, body=body
         )
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
-        return delete(
-            "{}{}".format(self.host, CANCEL_MARKET_ORDERS), headers=headers, data=body
+        headers = self.__l2_headers(request_args)
+        return self.transport.delete(
+            "{}{}".format(self.host, CANCEL_MARKET_ORDERS),
+            headers=headers,
+            data=request_args.serialized_body,
         )
 
-    def get_orders(self, params: OpenOrderParams = None, next_cursor="MA=="):
+    def get_orders(
+        self, params: OpenOrderParams = None, next_cursor="MA==", typed=False
+    ):
         """
-        Gets orders for the API key
+        Gets orders for the API key, as OpenOrder structs if typed
+        Requires Level 2 authentication
+        """
+        return list(self.iter_orders(params, next_cursor, typed=typed))
+
+    def iter_orders(
+        self,
+        params: OpenOrderParams = None,
+        next_cursor="MA==",
+        prefetch=False,
+        typed=False,
+    ):
+        """
+        Yields orders for the API key page by page, prefetch fetches the next page while
+        the current one is consumed
+        typed yields OpenOrder structs
         Requires Level 2 authentication
         """
         self.assert_level_2_auth()
         request_args = RequestArgs(method="GET", request_path=ORDERS)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
 
-        results = []
-        next_cursor = next_cursor if next_cursor is not None else "MA=="
-        while next_cursor != END_CURSOR:
+        def fetch_page(cursor):
+            # signed per page, pages may be fetched long after the first one
+            headers = self.__l2_headers(request_args)
             url = add_query_open_orders_params(
-                "{}{}".format(self.host, ORDERS), params, next_cursor
+                "{}{}".format(self.host, ORDERS), params, cursor
             )
-            response = get(url, headers=headers)
-            next_cursor = response["next_cursor"]
-            results += response["data"]
+            if typed:
+                # decoded straight into structs
+                return decode_page(
+                    self.transport.get_text(url, headers=headers), OpenOrder
+                )
+            return self.transport.get(url, headers=headers)
 
-        return results
+        return iter_records(fetch_page, next_cursor, prefetch)
 
     def get_order_book(self, token_id) -> OrderBookSummary:
         """
         Fetches the orderbook for the token_id
         """
-        raw_obs = get("{}{}?token_id={}".format(self.host, GET_ORDER_BOOK, token_id))
+        raw_obs = self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_ORDER_BOOK, token_id)
+        )
         return parse_raw_orderbook_summary(raw_obs)
 
+    def get_book(self, token_id) -> OrderBook:
+        """
+        Fetches the orderbook for the token_id as an array backed OrderBook, sorted best first
+        """
+        raw_obs = self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_ORDER_BOOK, token_id)
+        )
+        return parse_raw_orderbook(raw_obs)
+
     def get_order_books(self, params: list[BookParams]) -> list[OrderBookSummary]:
         """
         Fetches the orderbook for a set of token ids
         """
         body = [{"token_id": param.token_id} for param in params]
-        raw_obs = post("{}{}".format(self.host, GET_ORDER_BOOKS), data=body)
+        raw_obs = self.transport.post(
+            "{}{}".format(self.host, GET_ORDER_BOOKS), data=body
+        )
         return [parse_raw_orderbook_summary(r) for r in raw_obs]
 
     def get_order_book_hash(self, orderbook: OrderBookSummary) -> str:
@@ -544,42 +771,117 @@ class ClobClient:
         self.assert_level_2_auth()
         endpoint = "{}{}".format(GET_ORDER, order_id)
         request_args = RequestArgs(method="GET", request_path=endpoint)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
-        return get("{}{}".format(self.host, endpoint), headers=headers)
+        headers = self.__l2_headers(request_args)
+        return self.transport.get("{}{}".format(self.host, endpoint), headers=headers)
 
-    def get_trades(self, params: TradeParams = None, next_cursor="MA=="):
+    def __lookup_posted_order(self, order: dict) -> Optional[dict]:
         """
-        Fetches the trade history for a user
+        The exchange's record of a signed order, None if it isn't known
+        """
+        order_hash = signed_order_hash(order, self.chain_id)
+        if order_hash is None:
+            raise PolyException("order signature doesn't match its signer")
+        try:
+            return self.get_order(order_hash) or None
+        except PolyApiException as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    def get_trades(self, params: TradeParams = None, next_cursor="MA==", typed=False):
+        """
+        Fetches the trade history for a user, as Trade structs if typed
+        Requires Level 2 authentication
+        """
+        return list(self.iter_trades(params, next_cursor, typed=typed))
+
+    def iter_trades(
+        self,
+        params: TradeParams = None,
+        next_cursor="MA==",
+        prefetch=False,
+        typed=False,
+    ):
+        """
+        Yields the trade history for a user page by page, prefetch fetches the next page
+        while the current one is consumed
+        typed yields Trade structs
         Requires Level 2 authentication
         """
         self.assert_level_2_auth()
         request_args = RequestArgs(method="GET", request_path=TRADES)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
 
-        results = []
-        next_cursor = next_cursor if next_cursor is not None else "MA=="
-        while next_cursor != END_CURSOR:
+        def fetch_page(cursor):
+            # signed per page, pages may be fetched long after the first one
+            headers = self.__l2_headers(request_args)
             url = add_query_trade_params(
-                "{}{}".format(self.host, TRADES), params, next_cursor
+                "{}{}".format(self.host, TRADES), params, cursor
             )
-            response = get(url, headers=headers)
-            next_cursor = response["next_cursor"]
-            results += response["data"]
+            if typed:
+                # decoded straight into structs
+                return decode_page(self.transport.get_text(url, headers=headers), Trade)
+            return self.transport.get(url, headers=headers)
 
-        return results
+        return iter_records(fetch_page, next_cursor, prefetch)
 
     def get_last_trade_price(self, token_id):
         """
         Fetches the last trade price token_id
         """
-        return get("{}{}?token_id={}".format(self.host, GET_LAST_TRADE_PRICE, token_id))
+        return self.transport.get(
+            "{}{}?token_id={}".format(self.host, GET_LAST_TRADE_PRICE, token_id)
+        )
 
     def get_last_trades_prices(self, params: list[BookParams]):
         """
         Fetches the last trades prices for a set of token ids
         """
         body = [{"token_id": param.token_id} for param in params]
-        return post("{}{}".format(self.host, GET_LAST_TRADES_PRICES), data=body)
+        return self.transport.post(
+            "{}{}".format(self.host, GET_LAST_TRADES_PRICES), data=body
+        )
+
+    def __get_l2_authenticator(self) -> Optional[L2Authenticator]:
+        if self.signer is None or self.creds is None:
+            return None
+        return L2Authenticator(self.signer.address(), self.creds)
+
+    def __l2_headers(self, request_args: RequestArgs) -> dict:
+        """
+        Level 2 headers of a request, signed now
+        """
+        if (
+            self.__l2_authenticator is None
+            or self.__l2_authenticator.creds is not self.creds
+        ):
+            # creds assigned without set_api_creds
+            self.__l2_authenticator = self.__get_l2_authenticator()
+        return self.__l2_authenticator.headers(request_args, self.__timestamp())
+
+    def __sign_again(self, endpoint: str, method: str, headers: dict, data) -> dict:
+        """
+        The headers of a request being retried, with its auth headers signed now
+        """
+        if POLY_API_KEY in headers:
+            request_path = endpoint[len(self.host) :].partition("?")[0]
+            request_args = RequestArgs(
+                method=method, request_path=request_path, body=data
+            )
+            return dict(headers, **self.__l2_headers(request_args))
+        if POLY_NONCE in headers:
+            return dict(
+                headers,
+                **create_level_1_headers(
+                    self.signer, int(headers[POLY_NONCE]), self.__timestamp()
+                ),
+            )
+        return headers
+
+    def __timestamp(self) -> Optional[int]:
+        """
+        Timestamp for auth headers, None for the local time
+        """
+        return self.server_clock.timestamp() if self.server_clock is not None else None
 
     def assert_level_1_auth(self):
         """
@@ -609,11 +911,11 @@ class ClobClient:
         """
         self.assert_level_2_auth()
         request_args = RequestArgs(method="GET", request_path=GET_NOTIFICATIONS)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
+        headers = self.__l2_headers(request_args)
         url = "{}{}?signature_type={}".format(
             self.host, GET_NOTIFICATIONS, self.builder.sig_type
         )
-        return get(url, headers=headers)
+        return self.transport.get(url, headers=headers)
 
     def drop_notifications(self, params: DropNotificationParams = None):
         """
@@ -622,11 +924,11 @@ class ClobClient:
         """
         self.assert_level_2_auth()
         request_args = RequestArgs(method="DELETE", request_path=DROP_NOTIFICATIONS)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
+        headers = self.__l2_headers(request_args)
         url = drop_notifications_query_params(
             "{}{}".format(self.host, DROP_NOTIFICATIONS), params
         )
-        return delete(url, headers=headers)
+        return self.transport.delete(url, headers=headers)
 
     def get_balance_allowance(self, params: BalanceAllowanceParams = None):
         """
@@ -635,13 +937,13 @@ class ClobClient:
         """
         self.assert_level_2_auth()
         request_args = RequestArgs(method="GET", request_path=GET_BALANCE_ALLOWANCE)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
+        headers = self.__l2_headers(request_args)
         if params.signature_type == -1:
             params.signature_type = self.builder.sig_type
         url = add_balance_allowance_params_to_url(
             "{}{}".format(self.host, GET_BALANCE_ALLOWANCE), params
         )
-        return get(url, headers=headers)
+        return self.transport.get(url, headers=headers)
 
     def update_balance_allowance(self, params: BalanceAllowanceParams = None):
         """
@@ -650,13 +952,13 @@ class ClobClient:
         """
         self.assert_level_2_auth()
         request_args = RequestArgs(method="GET", request_path=UPDATE_BALANCE_ALLOWANCE)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
+        headers = self.__l2_headers(request_args)
         if params.signature_type == -1:
             params.signature_type = self.builder.sig_type
         url = add_balance_allowance_params_to_url(
             "{}{}".format(self.host, UPDATE_BALANCE_ALLOWANCE), params
         )
-        return get(url, headers=headers)
+        return self.transport.get(url, headers=headers)
 
     def is_order_scoring(self, params: OrderScoringParams):
         """
@@ -665,11 +967,11 @@ class ClobClient:
         """
         self.assert_level_2_auth()
         request_args = RequestArgs(method="GET", request_path=IS_ORDER_SCORING)
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
+        headers = self.__l2_headers(request_args)
         url = add_order_scoring_params_to_url(
             "{}{}".format(self.host, IS_ORDER_SCORING), params
         )
-        return get(url, headers=headers)
+        return self.transport.get(url, headers=headers)
 
     def are_orders_scoring(self, params: OrdersScoringParams):
         """
@@ -681,16 +983,18 @@ class ClobClient:
         request_args = RequestArgs(
             method="POST", request_path=ARE_ORDERS_SCORING, body=body
         )
-        headers = create_level_2_headers(self.signer, self.creds, request_args)
-        return post(
-            "{}{}".format(self.host, ARE_ORDERS_SCORING), headers=headers, data=body
+        headers = self.__l2_headers(request_args)
+        return self.transport.post(
+            "{}{}".format(self.host, ARE_ORDERS_SCORING),
+            headers=headers,
+            data=request_args.serialized_body,
         )
 
     def get_sampling_markets(self, next_cursor="MA=="):
         """
         Get the current sampling markets
         """
-        return get(
+        return self.transport.get(
             "{}{}?next_cursor={}".format(self.host, GET_SAMPLING_MARKETS, next_cursor)
         )
 
@@ -698,7 +1002,7 @@ class ClobClient:
         """
         Get the current sampling simplified markets
         """
-        return get(
+        return self.transport.get(
             "{}{}?next_cursor={}".format(
                 self.host, GET_SAMPLING_SIMPLIFIED_MARKETS, next_cursor
             )
@@ -708,27 +1012,71 @@ class ClobClient:
         """
         Get the current markets
         """
-        return get("{}{}?next_cursor={}".format(self.host, GET_MARKETS, next_cursor))
+        return self.transport.get(
+            "{}{}?next_cursor={}".format(self.host, GET_MARKETS, next_cursor)
+        )
 
     def get_simplified_markets(self, next_cursor="MA=="):
         """
         Get the current simplified markets
         """
-        return get(
+        return self.transport.get(
             "{}{}?next_cursor={}".format(self.host, GET_SIMPLIFIED_MARKETS, next_cursor)
         )
 
+    def iter_markets(self, next_cursor="MA==", prefetch=False, typed=False):
+        """
+        Yields the current markets page by page, prefetch fetches the next page while the
+        current one is consumed
+        typed yields Market structs
+        """
+        if not typed:
+            return iter_records(self.get_markets, next_cursor, prefetch)
+        return iter_records(
+            lambda cursor: decode_page(
+                self.transport.get_text(
+                    "{}{}?next_cursor={}".format(self.host, GET_MARKETS, cursor)
+                ),
+                Market,
+            ),
+            next_cursor,
+            prefetch,
+        )
+
+    def iter_simplified_markets(self, next_cursor="MA==", prefetch=False, typed=False):
+        """
+        Yields the current simplified markets page by page, prefetch fetches the next page
+        while the current one is consumed
+        typed yields SimplifiedMarket structs
+        """
+        if not typed:
+            return iter_records(self.get_simplified_markets, next_cursor, prefetch)
+        return iter_records(
+            lambda cursor: decode_page(
+                self.transport.get_text(
+                    "{}{}?next_cursor={}".format(
+                        self.host, GET_SIMPLIFIED_MARKETS, cursor
+                    )
+                ),
+                SimplifiedMarket,
+            ),
+            next_cursor,
+            prefetch,
+        )
+
     def get_market(self, condition_id):
         """
         Get a market by condition_id
         """
-        return get("{}{}{}".format(self.host, GET_MARKET, condition_id))
+        return self.transport.get("{}{}{}".format(self.host, GET_MARKET, condition_id))
 
     def get_market_trades_events(self, condition_id):
         """
         Get the market's trades events by condition id
         """
-        return get("{}{}{}".format(self.host, GET_MARKET_TRADES_EVENTS, condition_id))
+        return self.transport.get(
+            "{}{}{}".format(self.host, GET_MARKET_TRADES_EVENTS, condition_id)
+        )
 
     def calculate_market_price(self, token_id: str, side: str, amount: float) -> float:
         """
@@ -18,6 +18,10 @@ class RequestArgs:
     method: str
     request_path: str
     body: Any = None
+    serialized_body: Optional[str] = None
+    """
+    The body as sent, set by create_level_2_headers when None
+    """
 
 
 @dataclass
@@ -180,6 +184,107 @@ class OrderType(enumerate):
     GTD = "GTD"
 
 
+@dataclass
+class PostOrdersArgs:
+    order: Any
+    """
+    Signed order to post
+    """
+
+    orderType: OrderType = OrderType.GTC
+    """
+    Type of the order
+    """
+
+
+@dataclass
+class OrderEvent:
+    """
+    Order placement, update or cancellation from the user websocket channel
+    """
+
+    id: str
+    type: str
+    """
+    PLACEMENT, UPDATE or CANCELLATION
+    """
+
+    market: str = None
+    asset_id: str = None
+    side: str = None
+    price: str = None
+    original_size: str = None
+    size_matched: str = None
+    outcome: str = None
+    owner: str = None
+    timestamp: str = None
+    associate_trades: list = None
+    raw: dict = None
+    """
+    The event as received
+    """
+
+
+@dataclass
+class TradeEvent:
+    """
+    Trade from the user websocket channel, or from the trade history when backfilled
+    """
+
+    id: str
+    status: str
+    """
+    MATCHED, MINED, CONFIRMED, RETRYING or FAILED
+    """
+
+    market: str = None
+    asset_id: str = None
+    side: str = None
+    price: str = None
+    size: str = None
+    outcome: str = None
+    owner: str = None
+    taker_order_id: str = None
+    maker_orders: list = None
+    matchtime: str = None
+    last_update: str = None
+    backfilled: bool = False
+    """
+    Whether the trade was fetched with get_trades after a disconnect
+    """
+
+    raw: dict = None
+    """
+    The event or trade as received
+    """
+
+
+@dataclass
+class MarketSearchResult:
+    condition_id: str
+    token_ids: list[str]
+    question: str = None
+    market: dict = None
+    """
+    The market as listed
+    """
+
+
+@dataclass
+class RateLimitStats:
+    """
+    Queue wait of the requests of one endpoint group
+    """
+
+    requests: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
 @dataclass
 class OrderScoringParams:
     orderId: str
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Awaitable, Callable
+
+DEFAULT_INTERVAL = 60.0
+DEFAULT_SMOOTHING = 0.3
+# samples slower than this say little about the server clock
+DEFAULT_MAX_RTT = 2.0
+# the server time is whole seconds, truncated: on average half a second behind
+SERVER_TIME_RESOLUTION = 1.0
+
+
+class ServerClock:
+    """
+    Local estimate of the server clock, for auth timestamps
+
+    Each sample compares the server time to the local time halfway through its request,
+    compensating for the round trip, and the offset is an exponential moving average of
+    the samples. Until the first sample the offset is 0, the local time
+
+    Sample it once with sample(client.get_server_time), or in the background with
+    start(client.get_server_time) or start_async(async_client.get_server_time)
+    """
+
+    def __init__(
+        self,
+        smoothing: float = DEFAULT_SMOOTHING,
+        max_rtt: float = DEFAULT_MAX_RTT,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        smoothing: weight of a new sample in the offset, 1 to only keep the last one
+        max_rtt: seconds, samples with a longer round trip are ignored
+        clock: local wall clock
+        """
+        self.smoothing = smoothing
+        self.max_rtt = max_rtt
+        self.clock = clock
+        self.samples = 0
+        self.__offset = 0.0
+        self.__lock = threading.Lock()
+        self.__stop = None
+        self.__task = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def offset(self) -> float:
+        """
+        Seconds to add to the local time to get the server time
+        """
+        return self.__offset
+
+    def add_sample(self, server_time, sent_at: float, received_at: float) -> bool:
+        """
+        Records the server time answered to a request sent and answered at the local
+        times given, returns False if the sample was ignored
+        """
+        rtt = received_at - sent_at
+        if rtt < 0 or rtt > self.max_rtt:
+            return False
+        server_time = float(server_time) + SERVER_TIME_RESOLUTION / 2
+        offset = server_time - (sent_at + rtt / 2)
+        with self.__lock:
+            if self.samples == 0:
+                self.__offset = offset
+            else:
+                self.__offset += self.smoothing * (offset - self.__offset)
+            self.samples += 1
+        return True
+
+    def sample(self, get_server_time: Callable[[], int]) -> bool:
+        sent_at = self.clock()
+        server_time = get_server_time()
+        return self.add_sample(server_time, sent_at, self.clock())
+
+    async def sample_async(self, get_server_time: Callable[[], Awaitable[int]]) -> bool:
+        sent_at = self.clock()
+        server_time = await get_server_time()
+        return self.add_sample(server_time, sent_at, self.clock())
+
+    def now(self) -> float:
+        """
+        Estimated server time, in seconds
+        """
+        return self.clock() + self.__offset
+
+    def timestamp(self) -> int:
+        """
+        Estimated server time, in whole seconds, as used in auth headers
+        """
+        return int(self.now())
+
+    def start(
+        self, get_server_time: Callable[[], int], interval: float = DEFAULT_INTERVAL
+    ):
+        """
+        Samples get_server_time every interval seconds in a daemon thread, the first
+        sample is taken before returning
+        """
+        if self.__stop is not None:
+            return
+        self.__sample_logged(get_server_time)
+        self.__stop = threading.Event()
+        stop = self.__stop
+
+        def run():
+            while not stop.wait(interval):
+                self.__sample_logged(get_server_time)
+
+        threading.Thread(target=run, name="ServerClock", daemon=True).start()
+
+    def __sample_logged(self, get_server_time: Callable[[], int]):
+        try:
+            self.sample(get_server_time)
+        except Exception:
+            self.logger.warning("Couldn't sample the server time", exc_info=True)
+
+    def start_async(
+        self,
+        get_server_time: Callable[[], Awaitable[int]],
+        interval: float = DEFAULT_INTERVAL,
+    ) -> asyncio.Task:
+        """
+        Samples get_server_time every interval seconds in a task of the running loop
+        """
+        if self.__task is not None and not self.__task.done():
+            return self.__task
+
+        async def run():
+            while True:
+                try:
+                    await self.sample_async(get_server_time)
+                except Exception:
+                    self.logger.warning(
+                        "Couldn't sample the server time", exc_info=True
+                    )
+                await asyncio.sleep(interval)
+
+        self.__task = asyncio.ensure_future(run())
+        return self.__task
+
+    def stop(self):
+        if self.__stop is not None:
+            self.__stop.set()
+            self.__stop = None
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
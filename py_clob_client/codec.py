@@ -0,0 +1,69 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JsonCodec:
+    """
+    Compact JSON with the standard library
+    """
+
+    def encode(self, obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    def decode(self, data) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """
+    Compact JSON with orjson, several times faster to decode large responses
+
+    Its output may differ from JsonCodec's, e.g. in how some floats are written. That
+    doesn't matter for signed bodies: they are serialised once, and the bytes signed are
+    the bytes sent
+    """
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def encode(self, obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def decode(self, data) -> Any:
+        return orjson.loads(data)
+
+
+_codec = OrjsonCodec() if orjson is not None else JsonCodec()
+
+
+def get_codec():
+    """
+    The codec bodies are serialised, signed and responses decoded with
+    """
+    return _codec
+
+
+def set_codec(codec):
+    """
+    Replaces the codec, any object with encode(obj) -> str and decode(str | bytes)
+    """
+    global _codec
+    _codec = codec
+
+
+def serialize_body(body, codec=None) -> str:
+    """
+    The request body as sent on the wire, bodies already serialised are kept as they are,
+    others are encoded with codec, the global codec if None
+    """
+    if isinstance(body, str):
+        return body
+    if isinstance(body, bytes):
+        return body.decode("utf-8")
+    return (codec if codec is not None else _codec).encode(body)
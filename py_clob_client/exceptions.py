@@ -7,14 +7,18 @@ class PolyException(Exception):
 
 
 class PolyApiException(PolyException):
-    def __init__(self, resp: Response = None, error_msg=None):
+    def __init__(
+        self, resp: Response = None, error_msg=None, status_code=None, headers=None
+    ):
         assert resp is not None or error_msg is not None
         if resp is not None:
             self.status_code = resp.status_code
             self.error_msg = self._get_message(resp)
+            self.headers = resp.headers
         if error_msg is not None:
             self.error_msg = error_msg
-            self.status_code = None
+            self.status_code = status_code
+            self.headers = headers
 
     def _get_message(self, resp: Response):
         try:
@@ -1,8 +1,10 @@
+import time
+
 from ..clob_types import ApiCreds, RequestArgs
-from ..signing.hmac import build_hmac_signature
+from ..codec import serialize_body
+from ..signing.hmac import HmacSigner
 from ..signer import Signer
 from ..signing.eip712 import sign_clob_auth_message
-from datetime import datetime
 
 POLY_ADDRESS = "POLY_ADDRESS"
 POLY_SIGNATURE = "POLY_SIGNATURE"
@@ -12,11 +14,13 @@ POLY_API_KEY = "POLY_API_KEY"
 POLY_PASSPHRASE = "POLY_PASSPHRASE"
 
 
-def create_level_1_headers(signer: Signer, nonce: int = None):
+def create_level_1_headers(signer: Signer, nonce: int = None, timestamp: int = None):
     """
     Creates Level 1 Poly headers for a request
+    timestamp: seconds, e.g. from a ServerClock, the local time if None
     """
-    timestamp = int(datetime.now().timestamp())
+    if timestamp is None:
+        timestamp = int(time.time())
 
     n = 0
     if nonce is not None:
@@ -33,24 +37,55 @@ def create_level_1_headers(signer: Signer, nonce: int = None):
     return headers
 
 
-def create_level_2_headers(signer: Signer, creds: ApiCreds, request_args: RequestArgs):
+class L2Authenticator:
     """
-    Creates Level 2 Poly headers for a request
+    Creates Level 2 Poly headers for one address and set of credentials
+
+    The secret is decoded and the HMAC keyed once, and the headers that don't change
+    between requests are kept in a template
     """
-    timestamp = int(datetime.now().timestamp())
 
-    hmac_sig = build_hmac_signature(
-        creds.api_secret,
-        timestamp,
-        request_args.method,
-        request_args.request_path,
-        request_args.body,
-    )
+    def __init__(self, address: str, creds: ApiCreds):
+        self.address = address
+        self.creds = creds
+        self.__signer = HmacSigner(creds.api_secret)
+        self.__template = {
+            POLY_ADDRESS: address,
+            POLY_API_KEY: creds.api_key,
+            POLY_PASSPHRASE: creds.api_passphrase,
+        }
 
-    return {
-        POLY_ADDRESS: signer.address(),
-        POLY_SIGNATURE: hmac_sig,
-        POLY_TIMESTAMP: str(timestamp),
-        POLY_API_KEY: creds.api_key,
-        POLY_PASSPHRASE: creds.api_passphrase,
-    }
+    def headers(self, request_args: RequestArgs, timestamp: int = None) -> dict:
+        """
+        Headers of a request, see create_level_2_headers
+        """
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        if request_args.serialized_body is None and request_args.body is not None:
+            request_args.serialized_body = serialize_body(request_args.body)
+
+        headers = self.__template.copy()
+        headers[POLY_SIGNATURE] = self.__signer.sign(
+            timestamp,
+            request_args.method,
+            request_args.request_path,
+            request_args.serialized_body,
+        )
+        headers[POLY_TIMESTAMP] = str(timestamp)
+        return headers
+
+
+def create_level_2_headers(
+    signer: Signer, creds: ApiCreds, request_args: RequestArgs, timestamp: int = None
+):
+    """
+    Creates Level 2 Poly headers for a request
+    timestamp: seconds, e.g. from a ServerClock, the local time if None
+
+    The body is serialised once, into request_args.serialized_body, which is what gets
+    signed and must be sent as the request data
+
+    Clients keep an L2Authenticator instead, to key the HMAC once
+    """
+    return L2Authenticator(signer.address(), creds).headers(request_args, timestamp)
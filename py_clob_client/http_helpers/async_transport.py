@@ -0,0 +1,106 @@
+import asyncio
+
+import aiohttp
+
+from .transport import GET, POST, DELETE, overloadHeaders
+from ..codec import get_codec, serialize_body
+from ..exceptions import PolyApiException
+
+DEFAULT_LIMIT = 100
+DEFAULT_LIMIT_PER_HOST = 0
+
+
+class AsyncHttpTransport:
+    """
+    Pooled, keep-alive asyncio HTTP transport built on aiohttp
+
+    The underlying aiohttp.ClientSession is created lazily, inside the running event loop
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_LIMIT,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        timeout: float = None,
+        codec=None,
+    ):
+        """
+        limit: maximum number of simultaneous connections, 0 for no limit
+        limit_per_host: maximum number of simultaneous connections to a host, 0 for no limit
+        timeout: total seconds allowed per request
+        codec: encodes the request data and decodes the responses, the codec of
+               py_clob_client.codec if None
+
+        Request data already serialised, as a str or bytes, is sent unchanged. The
+        bodies of authenticated requests are serialised, with the codec of
+        py_clob_client.codec, before being signed, so they never reach the codec
+        """
+        self.codec = codec
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._session: aiohttp.ClientSession = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit_per_host
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def _send(self, endpoint: str, method: str, headers=None, data=None) -> str:
+        """
+        Sends the request and returns the undecoded body of its response
+        """
+        try:
+            headers = overloadHeaders(method, headers)
+            async with self._get_session().request(
+                method=method,
+                url=endpoint,
+                headers=headers,
+                data=serialize_body(data, self.codec).encode("utf-8") if data else None,
+            ) as resp:
+                text = await resp.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise PolyApiException(error_msg="Request exception!") from e
+
+        if resp.status != 200:
+            raise PolyApiException(
+                error_msg=self.__decode(text),
+                status_code=resp.status,
+                headers=resp.headers,
+            )
+        return text
+
+    def __decode(self, text: str):
+        codec = self.codec if self.codec is not None else get_codec()
+        try:
+            return codec.decode(text)
+        except ValueError:
+            return text
+
+    async def request(self, endpoint: str, method: str, headers=None, data=None):
+        return self.__decode(await self._send(endpoint, method, headers, data))
+
+    async def post(self, endpoint, headers=None, data=None):
+        return await self.request(endpoint, POST, headers, data)
+
+    async def get(self, endpoint, headers=None, data=None):
+        return await self.request(endpoint, GET, headers, data)
+
+    async def delete(self, endpoint, headers=None, data=None):
+        return await self.request(endpoint, DELETE, headers, data)
+
+    async def get_text(self, endpoint, headers=None) -> str:
+        """
+        GETs endpoint and returns the undecoded body
+        """
+        return await self._send(endpoint, GET, headers)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
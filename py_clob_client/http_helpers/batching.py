@@ -0,0 +1,313 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from ..endpoints import (
+    GET_LAST_TRADE_PRICE,
+    GET_LAST_TRADES_PRICES,
+    GET_ORDER_BOOK,
+    GET_ORDER_BOOKS,
+    GET_PRICES,
+    GET_SPREAD,
+    GET_SPREADS,
+    MID_POINT,
+    MID_POINTS,
+    PRICE,
+)
+
+DEFAULT_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 100
+
+_MISSING = object()
+
+
+def _find(items: list, field: str, token_id: str):
+    for item in items or []:
+        if item.get(field) == token_id:
+            return item
+    return _MISSING
+
+
+def _from_map(response: dict, token_id: str, wrap: Callable):
+    value = (response or {}).get(token_id, _MISSING)
+    return _MISSING if value is _MISSING else wrap(value)
+
+
+def _price(response: dict, token_id: str, side: str):
+    value = ((response or {}).get(token_id) or {}).get(side, _MISSING)
+    return _MISSING if value is _MISSING else {"price": value}
+
+
+def _last_trade_price(response: list, token_id: str):
+    item = _find(response, "token_id", token_id)
+    if item is _MISSING:
+        return _MISSING
+    return {"price": item.get("price"), "side": item.get("side")}
+
+
+class _BatchSpec:
+    """
+    How a single token GET maps to a batch POST, and how to pick its answer out of the
+    batch response
+    """
+
+    __slots__ = ("batch_path", "sided", "extract")
+
+    def __init__(self, batch_path: str, sided: bool, extract: Callable):
+        self.batch_path = batch_path
+        self.sided = sided
+        # extract(response, token_id, side) -> single response, or _MISSING
+        self.extract = extract
+
+
+BATCH_SPECS = {
+    GET_ORDER_BOOK: _BatchSpec(
+        GET_ORDER_BOOKS, False, lambda r, t, s: _find(r, "asset_id", t)
+    ),
+    MID_POINT: _BatchSpec(
+        MID_POINTS, False, lambda r, t, s: _from_map(r, t, lambda v: {"mid": v})
+    ),
+    PRICE: _BatchSpec(GET_PRICES, True, lambda r, t, s: _price(r, t, s)),
+    GET_SPREAD: _BatchSpec(
+        GET_SPREADS, False, lambda r, t, s: _from_map(r, t, lambda v: {"spread": v})
+    ),
+    GET_LAST_TRADE_PRICE: _BatchSpec(
+        GET_LAST_TRADES_PRICES, False, lambda r, t, s: _last_trade_price(r, t)
+    ),
+}
+
+
+def _batchable(endpoint: str, headers, data):
+    """
+    (spec, base url, (token_id, side)) of a batchable GET, None otherwise
+    """
+    if headers is not None or data is not None:
+        return None
+    url = urlsplit(endpoint)
+    spec = BATCH_SPECS.get(url.path)
+    if spec is None:
+        return None
+    query = parse_qs(url.query)
+    token_ids = query.get("token_id")
+    if not token_ids:
+        return None
+    side = query.get("side", [""])[0]
+    if spec.sided and not side:
+        return None
+    base = "{}://{}".format(url.scheme, url.netloc)
+    return spec, base, (token_ids[0], side)
+
+
+def _batch_body(spec: _BatchSpec, keys) -> list:
+    if spec.sided:
+        return [{"token_id": token_id, "side": side} for token_id, side in keys]
+    return [{"token_id": token_id} for token_id, _ in keys]
+
+
+class _Batch:
+    __slots__ = ("spec", "base", "waiters", "closed")
+
+    def __init__(self, spec: _BatchSpec, base: str, closed: threading.Event = None):
+        self.spec = spec
+        self.base = base
+        # (token_id, side) -> futures of the callers waiting for it
+        self.waiters = {}
+        # set once the batch is taken out of the open batches
+        self.closed = closed
+
+    def fail(self, error: Exception):
+        for futures in self.waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+
+    def resolve(self, response):
+        """
+        Hands each caller its answer from the batch response, or the error raised
+        while picking it out of a malformed one
+        """
+        for (token_id, side), futures in self.waiters.items():
+            try:
+                result = self.spec.extract(response, token_id, side)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
+
+
+class BatchingTransport:
+    """
+    Opt-in micro-batcher over an HttpTransport
+
+    Unauthenticated single token GETs to /book, /midpoint, /price, /spread and
+    /last-trade-price made within window seconds of each other, or until max_batch tokens
+    are collected, are sent as one POST to the matching batch endpoint. Each caller gets
+    the answer for its token, shaped like the single token response
+
+    A token missing from the batch response is fetched on its own, so errors for unknown
+    tokens surface as before
+
+    No thread is started: the caller that opens a batch waits out the window, or until
+    the batch is full, then sends it for everyone
+    """
+
+    def __init__(
+        self,
+        transport,
+        window: float = DEFAULT_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        """
+        transport: the HttpTransport requests are sent through
+        window: seconds a batch stays open after its first request
+        max_batch: number of tokens that closes a batch early
+        """
+        self.transport = transport
+        self.window = window
+        self.max_batch = max_batch
+        self.__lock = threading.Lock()
+        self.__open = {}
+
+    def get(self, endpoint, headers=None, data=None):
+        batchable = _batchable(endpoint, headers, data)
+        if batchable is None:
+            return self.transport.get(endpoint, headers, data)
+
+        spec, base, key = batchable
+        future = Future()
+        flush = None
+        with self.__lock:
+            batch = self.__open.get((spec.batch_path, base))
+            opened = batch is None
+            if opened:
+                batch = _Batch(spec, base, threading.Event())
+                self.__open[(spec.batch_path, base)] = batch
+            batch.waiters.setdefault(key, []).append(future)
+            if len(batch.waiters) >= self.max_batch:
+                flush = self.__close(batch)
+
+        if flush is not None:
+            self.__send(flush)
+        elif opened:
+            # returns early if another caller filled the batch and sent it
+            batch.closed.wait(self.window)
+            self.__flush(batch)
+
+        result = future.result()
+        if result is _MISSING:
+            return self.transport.get(endpoint)
+        return result
+
+    def __close(self, batch: _Batch) -> Optional[_Batch]:
+        """
+        Removes the batch from the open batches, None if it was already closed
+        """
+        if self.__open.get((batch.spec.batch_path, batch.base)) is batch:
+            del self.__open[(batch.spec.batch_path, batch.base)]
+            batch.closed.set()
+            return batch
+        return None
+
+    def __flush(self, batch: _Batch):
+        with self.__lock:
+            batch = self.__close(batch)
+        if batch is not None:
+            self.__send(batch)
+
+    def __send(self, batch: _Batch):
+        spec = batch.spec
+        try:
+            response = self.transport.post(
+                "{}{}".format(batch.base, spec.batch_path),
+                data=_batch_body(spec, batch.waiters),
+            )
+        except Exception as e:
+            batch.fail(e)
+            return
+        batch.resolve(response)
+
+    def post(self, endpoint, headers=None, data=None):
+        return self.transport.post(endpoint, headers, data)
+
+    def delete(self, endpoint, headers=None, data=None):
+        return self.transport.delete(endpoint, headers, data)
+
+    def get_text(self, endpoint, headers=None) -> str:
+        return self.transport.get_text(endpoint, headers)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncBatchingTransport:
+    """
+    Micro-batcher over an AsyncHttpTransport, see BatchingTransport
+    """
+
+    def __init__(
+        self,
+        transport,
+        window: float = DEFAULT_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self.transport = transport
+        self.window = window
+        self.max_batch = max_batch
+        self.__open = {}
+
+    async def get(self, endpoint, headers=None, data=None):
+        batchable = _batchable(endpoint, headers, data)
+        if batchable is None:
+            return await self.transport.get(endpoint, headers, data)
+
+        spec, base, key = batchable
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self.__open.get((spec.batch_path, base))
+        if batch is None:
+            batch = self.__open[(spec.batch_path, base)] = _Batch(spec, base)
+            loop.call_later(self.window, self.__flush, batch)
+        batch.waiters.setdefault(key, []).append(future)
+        if len(batch.waiters) >= self.max_batch:
+            self.__flush(batch)
+
+        result = await future
+        if result is _MISSING:
+            return await self.transport.get(endpoint)
+        return result
+
+    def __flush(self, batch: _Batch):
+        if self.__open.get((batch.spec.batch_path, batch.base)) is batch:
+            del self.__open[(batch.spec.batch_path, batch.base)]
+            asyncio.ensure_future(self.__send(batch))
+
+    async def __send(self, batch: _Batch):
+        spec = batch.spec
+        try:
+            response = await self.transport.post(
+                "{}{}".format(batch.base, spec.batch_path),
+                data=_batch_body(spec, batch.waiters),
+            )
+        except Exception as e:
+            batch.fail(e)
+            return
+        batch.resolve(response)
+
+    async def post(self, endpoint, headers=None, data=None):
+        return await self.transport.post(endpoint, headers, data)
+
+    async def delete(self, endpoint, headers=None, data=None):
+        return await self.transport.delete(endpoint, headers, data)
+
+    async def get_text(self, endpoint, headers=None) -> str:
+        return await self.transport.get_text(endpoint, headers)
+
+    async def close(self):
+        await self.transport.close()
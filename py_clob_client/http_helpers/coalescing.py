@@ -0,0 +1,154 @@
+import asyncio
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+from ..metadata_cache import DEFAULT_MAXSIZE, MetadataCache
+
+_MISSING = object()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _ResponseCaches:
+    """
+    Micro-TTL response caches, one per endpoint path
+    """
+
+    def __init__(self, ttls: dict = None, maxsize: int = DEFAULT_MAXSIZE):
+        self.__caches = {
+            path: MetadataCache(ttl=ttl, maxsize=maxsize)
+            for path, ttl in (ttls or {}).items()
+        }
+
+    def for_url(self, url: str) -> Optional[MetadataCache]:
+        if not self.__caches:
+            return None
+        return self.__caches.get(urlsplit(url).path)
+
+
+class CoalescingTransport:
+    """
+    Single-flight layer over an HttpTransport
+
+    Identical unauthenticated GETs in flight at the same time are merged into one request
+    and its result, or error, is handed to every caller. Responses of the endpoints in
+    ttls are also cached for that many seconds
+
+    Merged callers share one decoded response, which must be treated as read-only
+    """
+
+    def __init__(self, transport, ttls: dict = None, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        transport: the HttpTransport requests are sent through
+        ttls: seconds to cache responses for, keyed by endpoint path, e.g.
+              {GET_ORDER_BOOK: 0.25, GET_TICK_SIZE: 60}
+        maxsize: maximum number of cached responses per endpoint
+        """
+        self.transport = transport
+        self.__caches = _ResponseCaches(ttls, maxsize)
+        self.__lock = threading.Lock()
+        self.__in_flight = {}
+
+    def get(self, endpoint, headers=None, data=None):
+        # authenticated requests carry per-caller headers and are never merged
+        if headers is not None or data is not None:
+            return self.transport.get(endpoint, headers, data)
+
+        cache = self.__caches.for_url(endpoint)
+        if cache is not None:
+            cached = cache.get(endpoint, _MISSING)
+            if cached is not _MISSING:
+                return cached
+
+        with self.__lock:
+            call = self.__in_flight.get(endpoint)
+            leader = call is None
+            if leader:
+                call = self.__in_flight[endpoint] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self.transport.get(endpoint)
+            if cache is not None:
+                cache.set(endpoint, call.result)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__in_flight[endpoint]
+            call.done.set()
+
+    def post(self, endpoint, headers=None, data=None):
+        return self.transport.post(endpoint, headers, data)
+
+    def delete(self, endpoint, headers=None, data=None):
+        return self.transport.delete(endpoint, headers, data)
+
+    def get_text(self, endpoint, headers=None) -> str:
+        return self.transport.get_text(endpoint, headers)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncCoalescingTransport:
+    """
+    Single-flight layer over an AsyncHttpTransport, see CoalescingTransport
+    """
+
+    def __init__(self, transport, ttls: dict = None, maxsize: int = DEFAULT_MAXSIZE):
+        self.transport = transport
+        self.__caches = _ResponseCaches(ttls, maxsize)
+        self.__in_flight = {}
+
+    async def get(self, endpoint, headers=None, data=None):
+        if headers is not None or data is not None:
+            return await self.transport.get(endpoint, headers, data)
+
+        cache = self.__caches.for_url(endpoint)
+        if cache is not None:
+            cached = cache.get(endpoint, _MISSING)
+            if cached is not _MISSING:
+                return cached
+
+        call = self.__in_flight.get(endpoint)
+        if call is not None:
+            return await asyncio.shield(call)
+
+        call = self.__in_flight[endpoint] = asyncio.ensure_future(
+            self.transport.get(endpoint)
+        )
+        try:
+            result = await asyncio.shield(call)
+            if cache is not None:
+                cache.set(endpoint, result)
+            return result
+        finally:
+            self.__in_flight.pop(endpoint, None)
+
+    async def post(self, endpoint, headers=None, data=None):
+        return await self.transport.post(endpoint, headers, data)
+
+    async def delete(self, endpoint, headers=None, data=None):
+        return await self.transport.delete(endpoint, headers, data)
+
+    async def get_text(self, endpoint, headers=None) -> str:
+        return await self.transport.get_text(endpoint, headers)
+
+    async def close(self):
+        await self.transport.close()
@@ -0,0 +1,371 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from .transport import DELETE, GET, POST
+from ..clob_types import RateLimitStats
+from ..endpoints import CANCEL_ALL, CANCEL_MARKET_ORDERS, POST_ORDER, POST_ORDERS
+
+# endpoint groups, in priority order: a lower number is served first
+CANCEL_GROUP = "cancel"
+ORDER_GROUP = "order"
+AUTH_GROUP = "auth"
+DATA_GROUP = "data"
+
+GROUP_PRIORITIES = {
+    CANCEL_GROUP: 0,
+    ORDER_GROUP: 1,
+    AUTH_GROUP: 2,
+    DATA_GROUP: 3,
+}
+
+# (requests per second, burst), tune to the limits of the account
+DEFAULT_LIMITS = {
+    CANCEL_GROUP: (20.0, 40),
+    ORDER_GROUP: (20.0, 40),
+    AUTH_GROUP: (5.0, 10),
+    DATA_GROUP: (50.0, 100),
+}
+
+AUTH_PREFIX = "/auth/"
+
+
+def _priority(group: str) -> int:
+    return GROUP_PRIORITIES.get(group, len(GROUP_PRIORITIES))
+
+
+def endpoint_group(method: str, endpoint: str) -> str:
+    """
+    The rate limit group of a request
+    """
+    path = urlsplit(endpoint).path
+    if path.startswith(AUTH_PREFIX):
+        return AUTH_GROUP
+    if method == DELETE or path in (CANCEL_ALL, CANCEL_MARKET_ORDERS):
+        return CANCEL_GROUP
+    if method == POST and path in (POST_ORDER, POST_ORDERS):
+        return ORDER_GROUP
+    return DATA_GROUP
+
+
+class TokenBucket:
+    """
+    rate tokens per second, holding at most capacity
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+
+    def refill(self, now: float):
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def time_to_token(self) -> float:
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class _Waiter:
+    __slots__ = ("order", "group")
+
+    def __init__(self, order: tuple, group: str):
+        self.order = order
+        self.group = group
+
+
+class _LimiterStats:
+    """
+    Queue wait statistics by group
+    """
+
+    def __init__(self):
+        self.__stats_lock = threading.Lock()
+        self.__stats = {}
+
+    def _record(self, group: str, waited: float):
+        with self.__stats_lock:
+            stats = self.__stats.setdefault(group, RateLimitStats())
+            stats.requests += 1
+            stats.total_wait += waited
+            stats.max_wait = max(stats.max_wait, waited)
+
+    def metrics(self) -> dict[str, RateLimitStats]:
+        """
+        Queue wait statistics by group since the limiter was created
+        """
+        with self.__stats_lock:
+            return {
+                group: RateLimitStats(s.requests, s.total_wait, s.max_wait)
+                for group, s in self.__stats.items()
+            }
+
+
+def _buckets(limits: Optional[dict], now: float) -> dict:
+    limits = DEFAULT_LIMITS if limits is None else limits
+    return {
+        group: TokenBucket(rate, burst, now) for group, (rate, burst) in limits.items()
+    }
+
+
+class RateLimiter(_LimiterStats):
+    """
+    Token bucket rate limiter keyed by endpoint group, with an optional bucket shared by
+    every group
+
+    Requests over the limit are queued, not failed. Whenever a token frees up it goes to
+    the waiting request of the highest priority group that can use it, first come first
+    served within a group, so a cancel never waits behind a burst of market data reads
+    """
+
+    def __init__(
+        self,
+        limits: dict = None,
+        global_limit: tuple = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        limits: (requests per second, burst) by group, DEFAULT_LIMITS if None,
+                groups missing from it aren't limited
+        global_limit: (requests per second, burst) shared by all the groups
+        """
+        super().__init__()
+        self.clock = clock
+        now = clock()
+        self.__buckets = _buckets(limits, now)
+        self.__global = (
+            TokenBucket(global_limit[0], global_limit[1], now) if global_limit else None
+        )
+        self.__cond = threading.Condition()
+        self.__waiters = []
+        self.__sequence = itertools.count()
+
+    def __ready(self, waiter: _Waiter) -> bool:
+        bucket = self.__buckets.get(waiter.group)
+        return bucket is None or bucket.tokens >= 1
+
+    def acquire(self, group: str) -> float:
+        """
+        Blocks until a request of the group may be sent, returns the seconds waited
+        """
+        start = self.clock()
+        bucket = self.__buckets.get(group)
+        if bucket is None and self.__global is None:
+            self._record(group, 0.0)
+            return 0.0
+
+        waiter = _Waiter((_priority(group), next(self.__sequence)), group)
+        with self.__cond:
+            self.__waiters.append(waiter)
+            try:
+                while True:
+                    now = self.clock()
+                    for b in self.__buckets.values():
+                        b.refill(now)
+                    if self.__global is not None:
+                        self.__global.refill(now)
+
+                    global_ready = self.__global is None or self.__global.tokens >= 1
+                    ready = [w for w in self.__waiters if self.__ready(w)]
+                    if (
+                        global_ready
+                        and ready
+                        and min(ready, key=lambda w: w.order) is waiter
+                    ):
+                        break
+
+                    # woken on time for the next token, or when a request ahead is sent
+                    timeout = bucket.time_to_token() if bucket is not None else 0.0
+                    if self.__global is not None:
+                        timeout = max(timeout, self.__global.time_to_token())
+                    self.__cond.wait(timeout if timeout > 0 else None)
+
+                if bucket is not None:
+                    bucket.tokens -= 1
+                if self.__global is not None:
+                    self.__global.tokens -= 1
+            finally:
+                self.__waiters.remove(waiter)
+                self.__cond.notify_all()
+
+        waited = self.clock() - start
+        self._record(group, waited)
+        return waited
+
+
+class AsyncRateLimiter(_LimiterStats):
+    """
+    RateLimiter for a single event loop, with the same buckets and priorities
+
+    Waiting requests are futures queued in one lane per group, no thread is used.
+    Whenever tokens free up, the lanes are served in priority order, each first come
+    first served, and a lane whose bucket is empty doesn't hold up the others
+    """
+
+    def __init__(
+        self,
+        limits: dict = None,
+        global_limit: tuple = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        limits: (requests per second, burst) by group, DEFAULT_LIMITS if None,
+                groups missing from it aren't limited
+        global_limit: (requests per second, burst) shared by all the groups
+        """
+        super().__init__()
+        self.clock = clock
+        now = clock()
+        self.__buckets = _buckets(limits, now)
+        self.__global = (
+            TokenBucket(global_limit[0], global_limit[1], now) if global_limit else None
+        )
+        self.__lanes = {}
+        self.__timer = None
+
+    async def acquire(self, group: str) -> float:
+        """
+        Waits until a request of the group may be sent, returns the seconds waited
+        """
+        start = self.clock()
+        bucket = self.__buckets.get(group)
+        if bucket is None and self.__global is None:
+            self._record(group, 0.0)
+            return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        self.__lanes.setdefault(group, deque()).append(future)
+        self.__dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # granted as the caller was cancelled, the tokens go back
+                self.__refund(bucket)
+            self.__dispatch()
+            raise
+
+        waited = self.clock() - start
+        self._record(group, waited)
+        return waited
+
+    def __refund(self, bucket: Optional[TokenBucket]):
+        if bucket is not None:
+            bucket.tokens += 1
+        if self.__global is not None:
+            self.__global.tokens += 1
+
+    def __dispatch(self):
+        """
+        Grants the tokens available to the waiters in priority order, and schedules the
+        next dispatch for when the first token a waiter needs frees up
+        """
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+
+        now = self.clock()
+        for bucket in self.__buckets.values():
+            bucket.refill(now)
+        if self.__global is not None:
+            self.__global.refill(now)
+
+        wait = None
+        for group in sorted(self.__lanes, key=_priority):
+            lane = self.__lanes[group]
+            bucket = self.__buckets.get(group)
+            while lane:
+                if lane[0].done():
+                    # cancelled while waiting
+                    lane.popleft()
+                    continue
+                if self.__global is not None and self.__global.tokens < 1:
+                    wait = self.__global.time_to_token()
+                    break
+                if bucket is not None and bucket.tokens < 1:
+                    token_wait = bucket.time_to_token()
+                    wait = token_wait if wait is None else min(wait, token_wait)
+                    break
+                if bucket is not None:
+                    bucket.tokens -= 1
+                if self.__global is not None:
+                    self.__global.tokens -= 1
+                lane.popleft().set_result(None)
+            if not lane:
+                del self.__lanes[group]
+            if self.__global is not None and self.__global.tokens < 1 and self.__lanes:
+                wait = self.__global.time_to_token()
+                break
+
+        if wait is not None:
+            self.__timer = asyncio.get_running_loop().call_later(wait, self.__dispatch)
+
+
+class RateLimitedTransport:
+    """
+    Queues the requests of an HttpTransport through a RateLimiter
+    """
+
+    def __init__(self, transport, limiter: Optional[RateLimiter] = None):
+        self.transport = transport
+        self.limiter = limiter if limiter is not None else RateLimiter()
+
+    def post(self, endpoint, headers=None, data=None):
+        self.limiter.acquire(endpoint_group(POST, endpoint))
+        return self.transport.post(endpoint, headers, data)
+
+    def get(self, endpoint, headers=None, data=None):
+        self.limiter.acquire(endpoint_group(GET, endpoint))
+        return self.transport.get(endpoint, headers, data)
+
+    def delete(self, endpoint, headers=None, data=None):
+        self.limiter.acquire(endpoint_group(DELETE, endpoint))
+        return self.transport.delete(endpoint, headers, data)
+
+    def get_text(self, endpoint, headers=None) -> str:
+        self.limiter.acquire(endpoint_group(GET, endpoint))
+        return self.transport.get_text(endpoint, headers)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport:
+    """
+    Queues the requests of an AsyncHttpTransport through an AsyncRateLimiter
+    """
+
+    def __init__(self, transport, limiter: Optional[AsyncRateLimiter] = None):
+        self.transport = transport
+        self.limiter = limiter if limiter is not None else AsyncRateLimiter()
+
+    async def __acquire(self, method: str, endpoint: str):
+        await self.limiter.acquire(endpoint_group(method, endpoint))
+
+    async def post(self, endpoint, headers=None, data=None):
+        await self.__acquire(POST, endpoint)
+        return await self.transport.post(endpoint, headers, data)
+
+    async def get(self, endpoint, headers=None, data=None):
+        await self.__acquire(GET, endpoint)
+        return await self.transport.get(endpoint, headers, data)
+
+    async def delete(self, endpoint, headers=None, data=None):
+        await self.__acquire(DELETE, endpoint)
+        return await self.transport.delete(endpoint, headers, data)
+
+    async def get_text(self, endpoint, headers=None) -> str:
+        await self.__acquire(GET, endpoint)
+        return await self.transport.get_text(endpoint, headers)
+
+    async def close(self):
+        await self.transport.close()
@@ -0,0 +1,463 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from .transport import DELETE, GET, POST
+from ..codec import get_codec
+from ..endpoints import (
+    GET_LAST_TRADES_PRICES,
+    GET_ORDER_BOOKS,
+    GET_PRICES,
+    GET_SPREADS,
+    MID_POINTS,
+    POST_ORDER,
+    POST_ORDERS,
+)
+from ..exceptions import PolyApiException
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 0.1
+DEFAULT_MAX_DELAY = 5.0
+DEFAULT_MAX_RETRY_AFTER = 30.0
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+# statuses whose Retry-After header is honoured
+RETRY_AFTER_STATUSES = frozenset((429, 503))
+# statuses of requests refused before they were processed
+REFUSED_STATUSES = frozenset((429,))
+
+# POSTs that only read, safe to send twice
+READ_ONLY_POSTS = frozenset(
+    (GET_ORDER_BOOKS, MID_POINTS, GET_PRICES, GET_SPREADS, GET_LAST_TRADES_PRICES)
+)
+ORDER_POSTS = frozenset((POST_ORDER, POST_ORDERS))
+
+# how a failed request may be retried
+SAFE = "safe"
+LOOKUP = "lookup"
+UNSAFE = "unsafe"
+
+
+def retry_mode(method: str, endpoint: str) -> str:
+    """
+    SAFE if the request can be sent again as is, LOOKUP if it places orders and is only
+    sent again once they are known not to be on the book, UNSAFE otherwise
+    """
+    if method in (GET, DELETE):
+        return SAFE
+    path = urlsplit(endpoint).path
+    if method == POST and path in READ_ONLY_POSTS:
+        return SAFE
+    if method == POST and path in ORDER_POSTS:
+        return LOOKUP
+    return UNSAFE
+
+
+class RetryBudget:
+    """
+    Caps retries to a share of the requests sent
+
+    Every request earns ratio of a retry and every retry spends a whole one, with at
+    most reserve retries saved up. While a server is down, retries stop once the saved
+    ones are spent instead of multiplying the load on it
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0):
+        """
+        ratio: retries earned per request
+        reserve: maximum number of retries saved up, and the number it starts with
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self.__tokens = reserve
+        self.__lock = threading.Lock()
+
+    def deposit(self):
+        with self.__lock:
+            self.__tokens = min(self.reserve, self.__tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Spends a retry, False if none is left
+        """
+        with self.__lock:
+            if self.__tokens < 1:
+                return False
+            self.__tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before a failed request is sent again
+
+    Connection failures and RETRY_STATUSES are retried up to max_attempts, waiting a
+    random delay of up to base_delay * 2 ** (retry - 1), capped at max_delay, or what
+    the Retry-After header of a 429 or 503 asks for
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+        retry_statuses: frozenset = RETRY_STATUSES,
+        budget: Optional[RetryBudget] = None,
+        jitter: Callable[[], float] = random.random,
+    ):
+        """
+        max_attempts: number of times a request is sent, including the first
+        base_delay, max_delay: seconds, bounds of the exponential backoff
+        max_retry_after: longest Retry-After honoured, longer ones fail the request
+        retry_statuses: response statuses worth retrying
+        budget: RetryBudget shared by every request, RetryBudget() if None
+        jitter: uniform [0, 1) source of the random delays
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = retry_statuses
+        self.budget = budget if budget is not None else RetryBudget()
+        self.jitter = jitter
+
+    def retryable(self, error: Exception) -> bool:
+        if not isinstance(error, PolyApiException):
+            return False
+        if error.status_code is None:
+            # raised by the transport for a failed connection, not by the server
+            return error.__cause__ is not None
+        return error.status_code in self.retry_statuses
+
+    def refused(self, error: PolyApiException) -> bool:
+        """
+        True if the server certainly didn't process the failed request
+        """
+        if error.status_code in REFUSED_STATUSES:
+            return True
+        return isinstance(error.__cause__, requests.ConnectTimeout)
+
+    def retry_after(self, error: PolyApiException) -> Optional[float]:
+        """
+        Seconds asked for by the Retry-After header of the response, if any
+        """
+        if error.status_code not in RETRY_AFTER_STATUSES:
+            return None
+        value = (getattr(error, "headers", None) or {}).get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, retry: int, error: PolyApiException) -> Optional[float]:
+        """
+        Seconds to wait before the retry-th retry, None if it shouldn't be made
+        """
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+        backoff = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return self.jitter() * backoff
+
+
+def _order_response(record: dict) -> dict:
+    """
+    Post order response of an order found on the book after its post failed
+    """
+    return {
+        "success": True,
+        "errorMsg": "",
+        "orderID": record.get("id"),
+        "status": (record.get("status") or "").lower(),
+    }
+
+
+def _posted_orders(endpoint: str, data) -> list:
+    """
+    The signed orders in a post order body
+    """
+    if isinstance(data, (str, bytes)):
+        data = get_codec().decode(data)
+    bodies = data if urlsplit(endpoint).path == POST_ORDERS else [data]
+    return [body["order"] for body in bodies]
+
+
+def _recovered(endpoint: str, records: list):
+    """
+    The response to return if every order was found, None otherwise
+    """
+    if not records or not all(records):
+        return None
+    if urlsplit(endpoint).path == POST_ORDERS:
+        return [_order_response(record) for record in records]
+    return _order_response(records[0])
+
+
+class _Retries:
+    """
+    Retry decisions for one request, shared by RetryingTransport and
+    AsyncRetryingTransport so both retry the same way
+    """
+
+    def __init__(self, policy: RetryPolicy, endpoint: str, method: str, lookup: bool):
+        """
+        lookup: whether order posts can be looked up before being sent again
+        """
+        self.policy = policy
+        self.endpoint = endpoint
+        self.mode = retry_mode(method, endpoint)
+        self.can_lookup = lookup
+        self.attempt = 1
+        # whether the orders must be looked up before the next attempt
+        self.lookup = False
+        policy.budget.deposit()
+
+    def delay(self, error: PolyApiException) -> float:
+        """
+        Seconds to wait before the next attempt, raises error if there shouldn't be one
+        """
+        policy = self.policy
+        refused = policy.refused(error)
+        if (
+            self.attempt >= policy.max_attempts
+            or not policy.retryable(error)
+            or (self.mode == UNSAFE and not refused)
+            or (self.mode == LOOKUP and not refused and not self.can_lookup)
+        ):
+            raise error
+        delay = policy.delay(self.attempt, error)
+        if delay is None or not policy.budget.withdraw():
+            raise error
+        self.attempt += 1
+        self.lookup = self.mode == LOOKUP and not refused
+        return delay
+
+    def recovered(self, records: Optional[list], error: PolyApiException):
+        """
+        The response to return if the lookup found every posted order, None to send the
+        post again, raises error if the lookup failed or found only some of them
+        """
+        if records is None or (any(records) and not all(records)):
+            # sending the batch again would duplicate the orders on the book
+            raise error
+        return _recovered(self.endpoint, records)
+
+
+class RetryingTransport:
+    """
+    Retries the failed requests of an HttpTransport according to a RetryPolicy
+
+    GETs, cancels and the read only batch POSTs are retried as they are. A failed order
+    post may still have reached the book, so it is only sent again once order_lookup
+    finds none of its orders there, and if all of them are found their ids are returned
+    as if the post had succeeded. Other POSTs are only retried when the server refused
+    them, e.g. with a 429
+
+    Auth headers are timestamped, and a retry may come long after the first attempt,
+    e.g. after a Retry-After, so sign_headers signs them again before every retry
+
+    The error returned to the caller is the last one raised by the transport, with its
+    status, headers, body and cause
+    """
+
+    def __init__(
+        self,
+        transport,
+        policy: Optional[RetryPolicy] = None,
+        order_lookup: Callable[[dict], Optional[dict]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        sign_headers: Callable[[str, str, dict, object], dict] = None,
+    ):
+        """
+        transport: the HttpTransport requests are sent through
+        policy: RetryPolicy() if None
+        order_lookup: returns the exchange's record of a signed order, as posted in an
+                      order body, or None if it isn't known. Order posts aren't retried
+                      without it. ClobClient provides one when given a retry_policy
+        sign_headers: returns the headers of a request signed again, given its endpoint,
+                      method, headers and data. Headers are resent as they are without
+                      it. ClobClient provides one when given a retry_policy
+        """
+        self.transport = transport
+        self.policy = policy if policy is not None else RetryPolicy()
+        self.order_lookup = order_lookup
+        self.sleep = sleep
+        self.sign_headers = sign_headers
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def __lookup(self, endpoint: str, data) -> Optional[list]:
+        try:
+            return [
+                self.order_lookup(order) for order in _posted_orders(endpoint, data)
+            ]
+        except Exception:
+            self.logger.warning("order lookup failed", exc_info=True)
+            return None
+
+    def __send(
+        self, endpoint: str, method: str, headers, data, send: Callable[[dict], object]
+    ):
+        """
+        Calls send with the headers until it succeeds or the policy gives up, data being
+        the body it sends
+        """
+        retries = _Retries(self.policy, endpoint, method, self.order_lookup is not None)
+        while True:
+            try:
+                return send(headers)
+            except PolyApiException as e:
+                error = e
+
+            delay = retries.delay(error)
+            self.logger.debug(
+                "retrying %s %s in %.3fs after %r", method, endpoint, delay, error
+            )
+            self.sleep(delay)
+            if retries.lookup:
+                recovered = retries.recovered(self.__lookup(endpoint, data), error)
+                if recovered is not None:
+                    return recovered
+            if headers is not None and self.sign_headers is not None:
+                headers = self.sign_headers(endpoint, method, headers, data)
+
+    def request(self, endpoint: str, method: str, headers=None, data=None):
+        send = getattr(self.transport, method.lower())
+        return self.__send(
+            endpoint,
+            method,
+            headers,
+            data,
+            lambda headers: send(endpoint, headers, data),
+        )
+
+    def post(self, endpoint, headers=None, data=None):
+        return self.request(endpoint, POST, headers, data)
+
+    def get(self, endpoint, headers=None, data=None):
+        return self.request(endpoint, GET, headers, data)
+
+    def delete(self, endpoint, headers=None, data=None):
+        return self.request(endpoint, DELETE, headers, data)
+
+    def get_text(self, endpoint, headers=None) -> str:
+        return self.__send(
+            endpoint,
+            GET,
+            headers,
+            None,
+            lambda headers: self.transport.get_text(endpoint, headers),
+        )
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRetryingTransport:
+    """
+    Retries the failed requests of an AsyncHttpTransport, see RetryingTransport
+
+    order_lookup may be a coroutine function
+    """
+
+    def __init__(
+        self,
+        transport,
+        policy: Optional[RetryPolicy] = None,
+        order_lookup: Callable = None,
+        sign_headers: Callable[[str, str, dict, object], dict] = None,
+    ):
+        self.transport = transport
+        self.policy = policy if policy is not None else RetryPolicy()
+        self.order_lookup = order_lookup
+        self.sign_headers = sign_headers
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def __lookup(self, endpoint: str, data) -> Optional[list]:
+        try:
+            records = []
+            for order in _posted_orders(endpoint, data):
+                record = self.order_lookup(order)
+                if asyncio.iscoroutine(record):
+                    record = await record
+                records.append(record)
+            return records
+        except Exception:
+            self.logger.warning("order lookup failed", exc_info=True)
+            return None
+
+    async def __send(
+        self,
+        endpoint: str,
+        method: str,
+        headers,
+        data,
+        send: Callable[[dict], Awaitable],
+    ):
+        """
+        Awaits send with the headers until it succeeds or the policy gives up, see
+        RetryingTransport
+        """
+        retries = _Retries(self.policy, endpoint, method, self.order_lookup is not None)
+        while True:
+            try:
+                return await send(headers)
+            except PolyApiException as e:
+                error = e
+
+            delay = retries.delay(error)
+            self.logger.debug(
+                "retrying %s %s in %.3fs after %r", method, endpoint, delay, error
+            )
+            await asyncio.sleep(delay)
+            if retries.lookup:
+                records = await self.__lookup(endpoint, data)
+                recovered = retries.recovered(records, error)
+                if recovered is not None:
+                    return recovered
+            if headers is not None and self.sign_headers is not None:
+                headers = self.sign_headers(endpoint, method, headers, data)
+
+    async def request(self, endpoint: str, method: str, headers=None, data=None):
+        send = getattr(self.transport, method.lower())
+        return await self.__send(
+            endpoint,
+            method,
+            headers,
+            data,
+            lambda headers: send(endpoint, headers, data),
+        )
+
+    async def post(self, endpoint, headers=None, data=None):
+        return await self.request(endpoint, POST, headers, data)
+
+    async def get(self, endpoint, headers=None, data=None):
+        return await self.request(endpoint, GET, headers, data)
+
+    async def delete(self, endpoint, headers=None, data=None):
+        return await self.request(endpoint, DELETE, headers, data)
+
+    async def get_text(self, endpoint, headers=None) -> str:
+        return await self.__send(
+            endpoint,
+            GET,
+            headers,
+            None,
+            lambda headers: self.transport.get_text(endpoint, headers),
+        )
+
+    async def close(self):
+        await self.transport.close()
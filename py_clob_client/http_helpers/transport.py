@@ -0,0 +1,113 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..codec import get_codec, serialize_body
+from ..exceptions import PolyApiException
+
+GET = "GET"
+POST = "POST"
+DELETE = "DELETE"
+PUT = "PUT"
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+def overloadHeaders(method: str, headers: dict) -> dict:
+    if headers is None:
+        headers = dict()
+    headers["User-Agent"] = "py_clob_client"
+
+    headers["Accept"] = "*/*"
+    headers["Connection"] = "keep-alive"
+    headers["Content-Type"] = "application/json"
+
+    if method == GET:
+        headers["Accept-Encoding"] = "gzip"
+
+    return headers
+
+
+class HttpTransport:
+    """
+    Pooled, keep-alive HTTP transport
+
+    Every request goes through a single requests.Session, so connections (and their
+    TLS sessions) are reused across calls instead of being re-established per request
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        timeout=None,
+        codec=None,
+    ):
+        """
+        pool_connections: number of per-host connection pools to keep
+        pool_maxsize: maximum number of connections kept alive per host
+        pool_block: if True, never open more than pool_maxsize connections to a host,
+                    callers wait for a free connection instead
+        timeout: seconds, or a (connect, read) tuple, applied to every request
+        codec: encodes the request data and decodes the responses, the codec of
+               py_clob_client.codec if None
+
+        Request data already serialised, as a str or bytes, is sent unchanged. The
+        bodies of authenticated requests are serialised, with the codec of
+        py_clob_client.codec, before being signed, so they never reach the codec
+        """
+        self.timeout = timeout
+        self.codec = codec
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _send(self, endpoint: str, method: str, headers=None, data=None):
+        try:
+            headers = overloadHeaders(method, headers)
+            resp = self.session.request(
+                method=method,
+                url=endpoint,
+                headers=headers,
+                data=serialize_body(data, self.codec).encode("utf-8") if data else None,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            raise PolyApiException(error_msg="Request exception!") from e
+
+        if resp.status_code != 200:
+            raise PolyApiException(resp)
+        return resp
+
+    def request(self, endpoint: str, method: str, headers=None, data=None):
+        resp = self._send(endpoint, method, headers, data)
+        codec = self.codec if self.codec is not None else get_codec()
+        try:
+            return codec.decode(resp.content)
+        except ValueError:
+            return resp.text
+
+    def post(self, endpoint, headers=None, data=None):
+        return self.request(endpoint, POST, headers, data)
+
+    def get(self, endpoint, headers=None, data=None):
+        return self.request(endpoint, GET, headers, data)
+
+    def delete(self, endpoint, headers=None, data=None):
+        return self.request(endpoint, DELETE, headers, data)
+
+    def get_text(self, endpoint, headers=None) -> str:
+        """
+        GETs endpoint and returns the undecoded body
+        """
+        return self._send(endpoint, GET, headers).text
+
+    def close(self):
+        self.session.close()
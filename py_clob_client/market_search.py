@@ -0,0 +1,182 @@
+import re
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+from .clob_types import MarketSearchResult
+
+TERM_PATTERN = re.compile(r"\w+")
+OR = "OR"
+PREFIX = "*"
+# length of the n-grams indexed for substring searches
+GRAM_SIZE = 3
+
+
+def tokenize(text: str) -> list[str]:
+    return TERM_PATTERN.findall(text.lower()) if text else []
+
+
+def _market_text(market: dict) -> Iterable[str]:
+    yield market.get("question") or ""
+    yield market.get("description") or ""
+    for tag in market.get("tags") or []:
+        yield tag
+    for token in market.get("tokens") or []:
+        yield token.get("outcome") or ""
+
+
+class MarketSearchIndex:
+    """
+    Inverted index over the question, description, tags and outcome names of markets
+
+    Queries are whitespace separated terms, all of which must match, grouped with OR
+    (upper case) into alternatives. A term ending with * matches every word it prefixes:
+
+        "election 2024"             both terms
+        "trump OR biden"            either term
+        "elect* senate OR house"    (elect* and senate) or house
+    """
+
+    def __init__(self, markets: Iterable[dict] = ()):
+        """
+        markets: markets to index, e.g. a synced MarketCatalogue or a CatalogueStore
+        """
+        self.__markets = []
+        self.__postings = {}
+        self.__terms = None
+        # every substring of up to GRAM_SIZE characters of the terms -> the terms
+        self.__grams = {}
+        for market in markets:
+            self.add(market)
+
+    def add(self, market: dict):
+        """
+        Indexes one more market
+        """
+        doc_id = len(self.__markets)
+        self.__markets.append(market)
+        for text in _market_text(market):
+            for term in tokenize(text):
+                postings = self.__postings.get(term)
+                if postings is None:
+                    postings = self.__postings[term] = set()
+                    self.__add_grams(term)
+                postings.add(doc_id)
+        self.__terms = None
+
+    def __add_grams(self, term: str):
+        for size in range(1, GRAM_SIZE + 1):
+            for i in range(len(term) - size + 1):
+                self.__grams.setdefault(term[i : i + size], set()).add(term)
+
+    def __len__(self) -> int:
+        return len(self.__markets)
+
+    def __sorted_terms(self) -> list[str]:
+        if self.__terms is None:
+            self.__terms = sorted(self.__postings)
+        return self.__terms
+
+    def __match_term(self, term: str) -> set:
+        if term.endswith(PREFIX):
+            prefix = term[: -len(PREFIX)].lower()
+            terms = self.__sorted_terms()
+            matches = set()
+            i = bisect_left(terms, prefix)
+            while i < len(terms) and terms[i].startswith(prefix):
+                matches |= self.__postings[terms[i]]
+                i += 1
+            return matches
+
+        # terms like "u.s." hold several words, all of them must match
+        matches = None
+        for word in tokenize(term):
+            postings = self.__postings.get(word, set())
+            matches = postings if matches is None else matches & postings
+        return matches if matches is not None else set()
+
+    def __match_group(self, terms: list[str]) -> set:
+        matches = None
+        # rarest first, the intersection shrinks fastest
+        for postings in sorted(map(self.__match_term, terms), key=len):
+            matches = postings if matches is None else matches & postings
+            if not matches:
+                break
+        return matches or set()
+
+    def match(self, query: str) -> list[dict]:
+        """
+        Markets matching the query, in indexing order
+        """
+        groups = [[]]
+        for term in query.split():
+            if term == OR:
+                groups.append([])
+            else:
+                groups[-1].append(term)
+
+        doc_ids = set()
+        for group in groups:
+            if group:
+                doc_ids |= self.__match_group(group)
+        return [self.__markets[doc_id] for doc_id in sorted(doc_ids)]
+
+    def __containing(self, word: str) -> set:
+        if len(word) <= GRAM_SIZE:
+            terms = self.__grams.get(word, ())
+        else:
+            # terms having every n-gram of the word, intersected rarest first, are
+            # the candidates, kept if the n-grams are in sequence
+            grams = sorted(
+                (
+                    self.__grams.get(word[i : i + GRAM_SIZE], set())
+                    for i in range(len(word) - GRAM_SIZE + 1)
+                ),
+                key=len,
+            )
+            terms = [term for term in grams[0].intersection(*grams[1:]) if word in term]
+
+        matches = set()
+        for term in terms:
+            matches |= self.__postings[term]
+        return matches
+
+    def match_substring(self, text: str) -> Optional[list[dict]]:
+        """
+        Candidates for a substring search: the markets having, for every word of text, a
+        word containing it, in indexing order. A superset of the markets whose text
+        contains text, to be checked by the caller. None if text has no word to narrow
+        the search by, e.g. if it is empty or only punctuation
+        """
+        words = set(tokenize(text))
+        if not words:
+            return None
+
+        doc_ids = None
+        # longest first, they are contained in the fewest words
+        for word in sorted(words, key=len, reverse=True):
+            matches = self.__containing(word)
+            doc_ids = matches if doc_ids is None else doc_ids & matches
+            if not doc_ids:
+                break
+        return [self.__markets[doc_id] for doc_id in sorted(doc_ids)]
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> list[MarketSearchResult]:
+        """
+        Condition and token ids of the markets matching the query, in indexing order
+        """
+        markets = self.match(query)
+        if limit is not None:
+            markets = markets[:limit]
+        return [
+            MarketSearchResult(
+                condition_id=market.get("condition_id"),
+                token_ids=[
+                    token.get("token_id") for token in market.get("tokens") or []
+                ],
+                question=market.get("question"),
+                market=market,
+            )
+            for market in markets
+        ]
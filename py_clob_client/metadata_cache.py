@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+DEFAULT_MAXSIZE = 10000
+# tick sizes change as prices approach 0 or 1
+DEFAULT_TICK_SIZE_TTL = 300.0
+
+_MISSING = object()
+
+
+class MetadataCache:
+    """
+    Thread-safe cache with per-entry TTL and LRU eviction past maxsize
+
+    get_or_load loads a missing key once: concurrent misses on the same key wait for
+    the first caller's load instead of issuing their own request
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        maxsize: Optional[int] = DEFAULT_MAXSIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        ttl: seconds an entry stays valid, None for no expiry
+        maxsize: maximum number of entries, None for no limit
+        clock: monotonic time source
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__key_locks = {}
+        self.__pending = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and self.clock() >= expires_at:
+                del self.__entries[key]
+                return default
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        with self.__lock:
+            self.__entries[key] = (value, expires_at)
+            self.__entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self.__entries) > self.maxsize:
+                    self.__entries.popitem(last=False)
+
+    def update(self, values: dict):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def invalidate(self, key: Hashable):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[Hashable], Any]) -> Any:
+        """
+        Cached value of key, loaded with loader(key) on a miss
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self.__lock:
+            key_lock = self.__key_locks.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                # loaded by another thread while this one waited
+                value = self.get(key, _MISSING)
+                if value is _MISSING:
+                    value = loader(key)
+                    self.set(key, value)
+                return value
+        finally:
+            with self.__lock:
+                if self.__key_locks.get(key) is key_lock:
+                    del self.__key_locks[key]
+
+    async def get_or_load_async(
+        self, key: Hashable, loader: Callable[[Hashable], Awaitable[Any]]
+    ) -> Any:
+        """
+        Async version of get_or_load, concurrent misses in the same event loop share one
+        load, and its error if it fails
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # futures can only be awaited in their own loop
+        pending_key = (asyncio.get_running_loop(), key)
+        pending = self.__pending.get(pending_key)
+        if pending is None:
+            pending = asyncio.ensure_future(loader(key))
+            self.__pending[pending_key] = pending
+
+            def loaded(future: asyncio.Future):
+                # done even if every caller was cancelled meanwhile
+                self.__pending.pop(pending_key, None)
+                if not future.cancelled() and future.exception() is None:
+                    self.set(key, future.result())
+
+            pending.add_done_callback(loaded)
+
+        return await asyncio.shield(pending)
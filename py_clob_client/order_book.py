@@ -0,0 +1,222 @@
+from array import array
+from itertools import accumulate
+from typing import Optional
+
+from .clob_types import OrderBookSummary, OrderSummary
+
+
+class BookSide:
+    """
+    One side of an order book, as parallel price and size columns sorted best first
+    """
+
+    __slots__ = ("prices", "sizes", "_cumulative_sizes", "_cumulative_notionals")
+
+    def __init__(self, prices: array, sizes: array):
+        self.prices = prices
+        self.sizes = sizes
+        self._cumulative_sizes = None
+        self._cumulative_notionals = None
+
+    @classmethod
+    def from_levels(cls, levels, descending: bool) -> "BookSide":
+        """
+        Builds a side from (price, size) pairs in any order, prices and sizes
+        being numbers or numeric strings
+        """
+        ordered = sorted(
+            ((float(price), float(size)) for price, size in levels),
+            key=lambda level: level[0],
+            reverse=descending,
+        )
+        return cls(
+            array("d", [price for price, _ in ordered]),
+            array("d", [size for _, size in ordered]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __iter__(self):
+        return zip(self.prices, self.sizes)
+
+    @property
+    def best_price(self) -> Optional[float]:
+        return self.prices[0] if self.prices else None
+
+    @property
+    def best_size(self) -> Optional[float]:
+        return self.sizes[0] if self.sizes else None
+
+    def depth(self, levels: int) -> "BookSide":
+        """
+        The best `levels` levels of this side
+        """
+        return BookSide(self.prices[:levels], self.sizes[:levels])
+
+    @property
+    def cumulative_sizes(self) -> array:
+        """
+        cumulative_sizes[i] is the total size of levels 0..i
+        """
+        if self._cumulative_sizes is None:
+            self._cumulative_sizes = array("d", accumulate(self.sizes))
+        return self._cumulative_sizes
+
+    @property
+    def cumulative_notionals(self) -> array:
+        """
+        cumulative_notionals[i] is the total price * size of levels 0..i
+        """
+        if self._cumulative_notionals is None:
+            self._cumulative_notionals = array(
+                "d", accumulate(p * s for p, s in zip(self.prices, self.sizes))
+            )
+        return self._cumulative_notionals
+
+    def to_summaries(self) -> list[OrderSummary]:
+        return [
+            OrderSummary(price=str(price), size=str(size))
+            for price, size in zip(self.prices, self.sizes)
+        ]
+
+
+class OrderBook:
+    """
+    Compact order book: bids sorted by descending price and asks by ascending price,
+    so index 0 of each side is the top of the book
+    """
+
+    __slots__ = (
+        "market",
+        "asset_id",
+        "timestamp",
+        "hash",
+        "bids",
+        "asks",
+        "_raw",
+    )
+
+    def __init__(
+        self,
+        market: str = None,
+        asset_id: str = None,
+        timestamp: str = None,
+        bids: BookSide = None,
+        asks: BookSide = None,
+        hash: str = None,
+    ):
+        self.market = market
+        self.asset_id = asset_id
+        self.timestamp = timestamp
+        self.hash = hash
+        self.bids = bids if bids is not None else BookSide(array("d"), array("d"))
+        self.asks = asks if asks is not None else BookSide(array("d"), array("d"))
+        # raw book the arrays were parsed from, only kept on request, for to_summary
+        self._raw = None
+
+    @classmethod
+    def from_raw(cls, raw_obs: dict, keep_raw: bool = False) -> "OrderBook":
+        """
+        Parses a raw book, as returned by the /book endpoint
+
+        keep_raw: keep a reference to raw_obs so that to_summary gives back the server
+                  strings, at the cost of keeping the whole raw book alive
+        """
+        book = cls(
+            market=raw_obs["market"],
+            asset_id=raw_obs["asset_id"],
+            timestamp=raw_obs["timestamp"],
+            bids=BookSide.from_levels(
+                ((bid["price"], bid["size"]) for bid in raw_obs["bids"]), True
+            ),
+            asks=BookSide.from_levels(
+                ((ask["price"], ask["size"]) for ask in raw_obs["asks"]), False
+            ),
+            hash=raw_obs["hash"],
+        )
+        if keep_raw:
+            book._raw = raw_obs
+        return book
+
+    @classmethod
+    def from_summary(cls, summary: OrderBookSummary) -> "OrderBook":
+        return cls(
+            market=summary.market,
+            asset_id=summary.asset_id,
+            timestamp=summary.timestamp,
+            bids=BookSide.from_levels(
+                ((bid.price, bid.size) for bid in summary.bids or []), True
+            ),
+            asks=BookSide.from_levels(
+                ((ask.price, ask.size) for ask in summary.asks or []), False
+            ),
+            hash=summary.hash,
+        )
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.bids.best_price
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.asks.best_price
+
+    @property
+    def midpoint(self) -> Optional[float]:
+        if not self.bids or not self.asks:
+            return None
+        return (self.bids.prices[0] + self.asks.prices[0]) / 2
+
+    @property
+    def spread(self) -> Optional[float]:
+        if not self.bids or not self.asks:
+            return None
+        return self.asks.prices[0] - self.bids.prices[0]
+
+    def depth(self, levels: int) -> "OrderBook":
+        """
+        A book holding the best `levels` levels of each side
+        """
+        return OrderBook(
+            market=self.market,
+            asset_id=self.asset_id,
+            timestamp=self.timestamp,
+            bids=self.bids.depth(levels),
+            asks=self.asks.depth(levels),
+            hash=self.hash,
+        )
+
+    def to_summary(self) -> OrderBookSummary:
+        """
+        Converts the book to an OrderBookSummary
+
+        A book parsed with keep_raw gives the same summary as parse_raw_orderbook_summary,
+        with the levels in server order and the prices and sizes as the server sent them.
+        Otherwise the levels are best first and the numbers formatted by str
+        """
+        if self._raw is not None:
+            raw_obs = self._raw
+            return OrderBookSummary(
+                market=raw_obs["market"],
+                asset_id=raw_obs["asset_id"],
+                timestamp=raw_obs["timestamp"],
+                bids=[
+                    OrderSummary(size=bid["size"], price=bid["price"])
+                    for bid in raw_obs["bids"]
+                ],
+                asks=[
+                    OrderSummary(size=ask["size"], price=ask["price"])
+                    for ask in raw_obs["asks"]
+                ],
+                hash=raw_obs["hash"],
+            )
+
+        return OrderBookSummary(
+            market=self.market,
+            asset_id=self.asset_id,
+            timestamp=self.timestamp,
+            bids=self.bids.to_summaries(),
+            asks=self.asks.to_summaries(),
+            hash=self.hash,
+        )
@@ -1,4 +1,5 @@
-from py_order_utils.builders import OrderBuilder as UtilsOrderBuilder
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 from py_order_utils.signer import Signer as UtilsSigner
 from py_order_utils.model import (
     EOA,
@@ -8,12 +9,11 @@ from py_order_utils.model import (
     SELL as UtilsSell,
 )
 
+from .eip712 import FastOrderBuilder
 from .helpers import (
-    to_token_decimals,
-    round_down,
-    round_normal,
-    decimal_places,
-    round_up,
+    fraction_to_token_decimals,
+    round_down_to_int,
+    round_normal_to_int,
 )
 from .constants import BUY, SELL
 from ..config import get_contract_config
@@ -35,8 +35,30 @@ ROUNDING_CONFIG: dict[TickSize, RoundConfig] = {
 }
 
 
+# Order builder of a signing worker process, see OrderBuilder.create_orders
+_worker_builder = None
+
+
+def _init_signing_worker(private_key: str, chain_id: int, sig_type, funder):
+    """
+    Loads the key once per signing worker process
+    """
+    global _worker_builder
+    _worker_builder = OrderBuilder(
+        Signer(private_key, chain_id), sig_type=sig_type, funder=funder
+    )
+
+
+def _create_order_in_worker(
+    order_args: OrderArgs, options: CreateOrderOptions
+) -> SignedOrder:
+    return _worker_builder.create_order(order_args, options)
+
+
 class OrderBuilder:
-    def __init__(self, signer: Signer, sig_type=None, funder=None):
+    def __init__(
+        self, signer: Signer, sig_type=None, funder=None, signing_workers: int = None
+    ):
         self.signer = signer
 
         # Signature type used sign orders, defaults to EOA type
@@ -47,69 +69,87 @@ class OrderBuilder:
         # Defaults to the address of the signer
         self.funder = funder if funder is not None else self.signer.address()
 
-    def get_order_amounts(
-        self, side: str, size: float, price: float, round_config: RoundConfig
-    ):
-        raw_price = round_normal(price, round_config.price)
+        # Exchange order builders keyed by (chain_id, neg_risk), created lazily
+        # and reused across orders
+        self.__utils_signer = None
+        self.__order_builders = {}
 
-        if side == BUY:
-            raw_taker_amt = round_down(size, round_config.size)
+        # Number of worker processes used to sign batches of orders, see create_orders.
+        # The process pool is started lazily, on the first batch
+        self.signing_workers = signing_workers
+        self.__signing_pool = None
 
-            raw_maker_amt = raw_taker_amt * raw_price
-            if decimal_places(raw_maker_amt) > round_config.amount:
-                raw_maker_amt = round_up(raw_maker_amt, round_config.amount + 4)
-                if decimal_places(raw_maker_amt) > round_config.amount:
-                    raw_maker_amt = round_down(raw_maker_amt, round_config.amount)
+    def _get_order_builder(self, neg_risk: bool) -> FastOrderBuilder:
+        """
+        Returns the exchange order builder for the signer's chain and the neg risk flag
+        """
+        chain_id = self.signer.get_chain_id()
+        key = (chain_id, bool(neg_risk))
 
-            maker_amount = to_token_decimals(raw_maker_amt)
-            taker_amount = to_token_decimals(raw_taker_amt)
+        order_builder = self.__order_builders.get(key)
+        if order_builder is None:
+            if self.__utils_signer is None:
+                self.__utils_signer = UtilsSigner(key=self.signer.private_key)
 
-            return UtilsBuy, maker_amount, taker_amount
-        elif side == SELL:
-            raw_maker_amt = round_down(size, round_config.size)
+            contract_config = get_contract_config(chain_id, neg_risk)
+            order_builder = FastOrderBuilder(
+                contract_config.exchange,
+                chain_id,
+                self.__utils_signer,
+            )
+            self.__order_builders[key] = order_builder
 
-            raw_taker_amt = raw_maker_amt * raw_price
-            if decimal_places(raw_taker_amt) > round_config.amount:
-                raw_taker_amt = round_up(raw_taker_amt, round_config.amount + 4)
-                if decimal_places(raw_taker_amt) > round_config.amount:
-                    raw_taker_amt = round_down(raw_taker_amt, round_config.amount)
+        return order_builder
 
-            maker_amount = to_token_decimals(raw_maker_amt)
-            taker_amount = to_token_decimals(raw_taker_amt)
+    def get_order_amounts(
+        self, side: str, size: float, price: float, round_config: RoundConfig
+    ):
+        # fixed point: price and size are quantised once, everything after that is
+        # integer arithmetic in 10^-price and 10^-size units
+        price_units = round_normal_to_int(price, round_config.price)
+        size_units = round_down_to_int(size, round_config.size)
 
-            return UtilsSell, maker_amount, taker_amount
+        shares = fraction_to_token_decimals(
+            size_units, 10**round_config.size, round_config.amount
+        )
+        notional = fraction_to_token_decimals(
+            size_units * price_units,
+            10 ** (round_config.size + round_config.price),
+            round_config.amount,
+        )
+
+        if side == BUY:
+            return UtilsBuy, notional, shares
+        elif side == SELL:
+            return UtilsSell, shares, notional
         else:
             raise ValueError(f"order_args.side must be '{BUY}' or '{SELL}'")
 
     def get_market_order_amounts(
         self, side: str, amount: float, price: float, round_config: RoundConfig
     ):
-        raw_price = round_normal(price, round_config.price)
+        price_units = round_normal_to_int(price, round_config.price)
+        amount_units = round_down_to_int(amount, round_config.size)
 
-        if side == BUY:
-            raw_maker_amt = round_down(amount, round_config.size)
-            raw_taker_amt = raw_maker_amt / raw_price
-            if decimal_places(raw_taker_amt) > round_config.amount:
-                raw_taker_amt = round_up(raw_taker_amt, round_config.amount + 4)
-                if decimal_places(raw_taker_amt) > round_config.amount:
-                    raw_taker_amt = round_down(raw_taker_amt, round_config.amount)
+        maker_amount = fraction_to_token_decimals(
+            amount_units, 10**round_config.size, round_config.amount
+        )
 
-            maker_amount = to_token_decimals(raw_maker_amt)
-            taker_amount = to_token_decimals(raw_taker_amt)
+        if side == BUY:
+            taker_amount = fraction_to_token_decimals(
+                amount_units * 10**round_config.price,
+                price_units * 10**round_config.size,
+                round_config.amount,
+            )
 
             return UtilsBuy, maker_amount, taker_amount
 
         elif side == SELL:
-            raw_maker_amt = round_down(amount, round_config.size)
-
-            raw_taker_amt = raw_maker_amt * raw_price
-            if decimal_places(raw_taker_amt) > round_config.amount:
-                raw_taker_amt = round_up(raw_taker_amt, round_config.amount + 4)
-                if decimal_places(raw_taker_amt) > round_config.amount:
-                    raw_taker_amt = round_down(raw_taker_amt, round_config.amount)
-
-            maker_amount = to_token_decimals(raw_maker_amt)
-            taker_amount = to_token_decimals(raw_taker_amt)
+            taker_amount = fraction_to_token_decimals(
+                amount_units * price_units,
+                10 ** (round_config.size + round_config.price),
+                round_config.amount,
+            )
 
             return UtilsSell, maker_amount, taker_amount
         else:
@@ -142,17 +182,56 @@ class OrderBuilder:
             signatureType=self.sig_type,
         )
 
-        contract_config = get_contract_config(
-            self.signer.get_chain_id(), options.neg_risk
-        )
+        return self._get_order_builder(options.neg_risk).build_signed_order(data)
+
+    def create_orders(
+        self,
+        orders_args: list[OrderArgs],
+        options: list[CreateOrderOptions],
+        max_workers: int = None,
+    ) -> list[SignedOrder]:
+        """
+        Creates and signs a batch of orders, options[i] being the options of orders_args[i]
+        The signed orders are returned in the same order as orders_args
 
-        order_builder = UtilsOrderBuilder(
-            contract_config.exchange,
-            self.signer.get_chain_id(),
-            UtilsSigner(key=self.signer.private_key),
+        If the builder was created with signing_workers, the orders are signed across
+        that many worker processes, otherwise on a pool of max_workers threads, which
+        only overlaps the little of the signing that releases the GIL
+        """
+        if len(orders_args) != len(options):
+            raise ValueError("orders_args and options must have the same length")
+
+        if not self.signing_workers:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(self.create_order, orders_args, options))
+
+        if self.__signing_pool is None:
+            self.__signing_pool = ProcessPoolExecutor(
+                max_workers=self.signing_workers,
+                initializer=_init_signing_worker,
+                initargs=(
+                    self.signer.private_key,
+                    self.signer.get_chain_id(),
+                    self.sig_type,
+                    self.funder,
+                ),
+            )
+
+        # hand each worker a few orders at a time to amortise the IPC round trips
+        chunksize = max(1, len(orders_args) // (self.signing_workers * 4))
+        return list(
+            self.__signing_pool.map(
+                _create_order_in_worker, orders_args, options, chunksize=chunksize
+            )
         )
 
-        return order_builder.build_signed_order(data)
+    def close(self):
+        """
+        Shuts down the signing worker processes, if any
+        """
+        if self.__signing_pool is not None:
+            self.__signing_pool.shutdown()
+            self.__signing_pool = None
 
     def create_market_order(
         self, order_args: MarketOrderArgs, options: CreateOrderOptions
@@ -181,17 +260,7 @@ class OrderBuilder:
             signatureType=self.sig_type,
         )
 
-        contract_config = get_contract_config(
-            self.signer.get_chain_id(), options.neg_risk
-        )
-
-        order_builder = UtilsOrderBuilder(
-            contract_config.exchange,
-            self.signer.get_chain_id(),
-            UtilsSigner(key=self.signer.private_key),
-        )
-
-        return order_builder.build_signed_order(data)
+        return self._get_order_builder(options.neg_risk).build_signed_order(data)
 
     def calculate_buy_market_price(
         self, positions: list[OrderSummary], amount_to_match: float
@@ -0,0 +1,176 @@
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from eth_keys import keys
+from eth_utils import keccak
+from poly_eip712_structs import make_domain
+from py_order_utils.builders import OrderBuilder as UtilsOrderBuilder
+from py_order_utils.model import Order
+from py_order_utils.signer import Signer as UtilsSigner
+from py_order_utils.utils import generate_seed, normalize_address, prepend_zx
+
+from ..config import get_contract_config
+
+EXCHANGE_DOMAIN_NAME = "Polymarket CTF Exchange"
+EXCHANGE_DOMAIN_VERSION = "1"
+
+# NOTE: fields are ordered, and must match py_order_utils.model.Order
+ORDER_TYPE = (
+    "Order(uint256 salt,address maker,address signer,address taker,uint256 tokenId,"
+    "uint256 makerAmount,uint256 takerAmount,uint256 expiration,uint256 nonce,"
+    "uint256 feeRateBps,uint8 side,uint8 signatureType)"
+)
+ORDER_TYPE_HASH = keccak(text=ORDER_TYPE)
+
+ORDER_UINT_FIELDS = (
+    (1 * 32, "salt"),
+    (5 * 32, "tokenId"),
+    (6 * 32, "makerAmount"),
+    (7 * 32, "takerAmount"),
+    (8 * 32, "expiration"),
+    (9 * 32, "nonce"),
+    (10 * 32, "feeRateBps"),
+    (11 * 32, "side"),
+    (12 * 32, "signatureType"),
+)
+ORDER_ADDRESS_FIELDS = (
+    (2 * 32 + 12, "maker"),
+    (3 * 32 + 12, "signer"),
+    (4 * 32 + 12, "taker"),
+)
+ORDER_ENCODED_SIZE = 13 * 32
+
+EIP712_PREFIX = b"\x19\x01"
+# eth_account reports v as 27/28 for plain message hashes
+V_OFFSET = 27
+
+
+@lru_cache(maxsize=None)
+def get_exchange_domain_separator(exchange_address: str, chain_id: int) -> bytes:
+    """
+    Returns the EIP712 domain separator hash of the exchange contract on the chain
+    """
+    return make_domain(
+        name=EXCHANGE_DOMAIN_NAME,
+        version=EXCHANGE_DOMAIN_VERSION,
+        chainId=str(chain_id),
+        verifyingContract=normalize_address(exchange_address),
+    ).hash_struct()
+
+
+_buffers = threading.local()
+
+
+def _get_order_buffer() -> bytearray:
+    """
+    Returns this thread's order encoding buffer, with the type hash already in place
+    """
+    buffer = getattr(_buffers, "order", None)
+    if buffer is None:
+        buffer = bytearray(ORDER_ENCODED_SIZE)
+        buffer[0:32] = ORDER_TYPE_HASH
+        _buffers.order = buffer
+    return buffer
+
+
+def hash_order(order: Order) -> bytes:
+    """
+    EIP712 struct hash of an Order, encoding its fixed layout directly
+    """
+    buffer = _get_order_buffer()
+    for offset, name in ORDER_UINT_FIELDS:
+        buffer[offset : offset + 32] = order[name].to_bytes(32, "big")
+    for offset, name in ORDER_ADDRESS_FIELDS:
+        buffer[offset - 12 : offset] = bytes(12)
+        buffer[offset : offset + 20] = bytes.fromhex(order[name][2:])
+    return keccak(buffer)
+
+
+def order_digest(domain_separator: bytes, order: Order) -> bytes:
+    """
+    EIP712 digest of an Order, the hash that gets signed
+    """
+    return keccak(EIP712_PREFIX + domain_separator + hash_order(order))
+
+
+def _order_fields(order: dict) -> dict:
+    """
+    The signed fields of a posted order, as encoded by hash_order
+    """
+    fields = {name: int(order[name]) for _, name in ORDER_UINT_FIELDS if name != "side"}
+    fields["side"] = 0 if order["side"] in ("BUY", 0) else 1
+    for _, name in ORDER_ADDRESS_FIELDS:
+        fields[name] = normalize_address(order[name])
+    return fields
+
+
+def signed_order_hash(order: dict, chain_id: int) -> Optional[str]:
+    """
+    Hash of a signed order, as posted in an order body, which the exchange uses as the
+    order id
+
+    The order doesn't say which exchange it was signed for, so the digest of each
+    exchange is tried against its signature. None if the signature matches neither
+    """
+    fields = _order_fields(order)
+    signature = bytes.fromhex(order["signature"][2:])
+    if len(signature) != 65:
+        return None
+    r = int.from_bytes(signature[0:32], "big")
+    s = int.from_bytes(signature[32:64], "big")
+    v = signature[64] - V_OFFSET if signature[64] >= V_OFFSET else signature[64]
+
+    try:
+        order_signature = keys.Signature(vrs=(v, r, s))
+    except Exception:
+        return None
+
+    for neg_risk in (False, True):
+        exchange = get_contract_config(chain_id, neg_risk).exchange
+        digest = order_digest(get_exchange_domain_separator(exchange, chain_id), fields)
+        try:
+            recovered = order_signature.recover_public_key_from_msg_hash(digest)
+        except Exception:
+            # no key recovers from this digest, it may still be the other exchange's
+            continue
+        if recovered.to_checksum_address() == fields["signer"]:
+            return prepend_zx(digest.hex())
+    return None
+
+
+class FastOrderBuilder(UtilsOrderBuilder):
+    """
+    Exchange order builder with a specialised signing path
+
+    The domain separator is computed once per exchange and chain, the Order struct is
+    encoded without going through the generic EIP712 machinery, and the private key is
+    parsed once. Signatures are byte for byte identical to UtilsOrderBuilder's
+    """
+
+    def __init__(
+        self,
+        exchange_address: str,
+        chain_id: int,
+        signer: UtilsSigner,
+        salt_generator=generate_seed,
+    ):
+        super().__init__(exchange_address, chain_id, signer, salt_generator)
+        self.domain_separator_hash = get_exchange_domain_separator(
+            self.contract_address, chain_id
+        )
+        self.private_key = keys.PrivateKey(signer.account.key)
+
+    def build_order_signature(self, _order: Order) -> str:
+        """
+        Signs the order
+        """
+        signature = self.private_key.sign_msg_hash(
+            order_digest(self.domain_separator_hash, _order)
+        )
+        v, r, s = signature.vrs
+        return prepend_zx(
+            (
+                r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([v + V_OFFSET])
+            ).hex()
+        )
@@ -1,6 +1,8 @@
 from math import floor, ceil
 from decimal import Decimal
 
+TOKEN_DECIMALS = 6
+
 
 def round_down(x: float, sig_digits: int) -> float:
     return floor(x * (10**sig_digits)) / (10**sig_digits)
@@ -15,7 +17,7 @@ def round_up(x: float, sig_digits: int) -> float:
 
 
 def to_token_decimals(x: float) -> int:
-    f = (10**6) * x
+    f = (10**TOKEN_DECIMALS) * x
     if decimal_places(f) > 0:
         f = round_normal(f, 0)
     return int(f)
@@ -23,3 +25,30 @@ def to_token_decimals(x: float) -> int:
 
 def decimal_places(x: float) -> int:
     return abs(Decimal(x.__str__()).as_tuple().exponent)
+
+
+def round_down_to_int(x: float, sig_digits: int) -> int:
+    """
+    x rounded down to sig_digits decimals, as an integer number of 10^-sig_digits units
+    """
+    return floor(x * (10**sig_digits))
+
+
+def round_normal_to_int(x: float, sig_digits: int) -> int:
+    """
+    x rounded to sig_digits decimals, as an integer number of 10^-sig_digits units
+    """
+    return round(x * (10**sig_digits))
+
+
+def fraction_to_token_decimals(
+    numerator: int, denominator: int, amount_digits: int
+) -> int:
+    """
+    numerator / denominator in token decimals (10^-6 units), using integer arithmetic only
+
+    Like the raw amounts of the order builder, the value is first rounded up to
+    amount_digits + 4 decimals, then down to amount_digits decimals
+    """
+    rounded_up = -((-numerator * 10 ** (amount_digits + 4)) // denominator)
+    return (rounded_up // 10**4) * 10 ** (TOKEN_DECIMALS - amount_digits)
@@ -0,0 +1,102 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Iterator
+
+from .constants import END_CURSOR
+
+INITIAL_CURSOR = "MA=="
+
+
+def _is_last(next_cursor: str) -> bool:
+    return not next_cursor or next_cursor == END_CURSOR
+
+
+def iter_pages(
+    fetch_page: Callable[[str], dict],
+    next_cursor: str = INITIAL_CURSOR,
+    prefetch: bool = False,
+) -> Iterator[list]:
+    """
+    Yields the data of every page of a cursor paginated endpoint, starting at next_cursor
+
+    fetch_page: fetches the page at a cursor, returning its data and next_cursor
+    prefetch: fetch the next page in a background thread while the current one is consumed
+
+    At most one page, two with prefetch, is held at a time
+    """
+    next_cursor = next_cursor if next_cursor is not None else INITIAL_CURSOR
+    if next_cursor == END_CURSOR:
+        return
+
+    if not prefetch:
+        while True:
+            response = fetch_page(next_cursor)
+            next_cursor = response.get("next_cursor")
+            yield response["data"]
+            if _is_last(next_cursor):
+                return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch_page, next_cursor)
+        while future is not None:
+            response = future.result()
+            next_cursor = response.get("next_cursor")
+            future = (
+                None
+                if _is_last(next_cursor)
+                else executor.submit(fetch_page, next_cursor)
+            )
+            yield response["data"]
+
+
+def iter_records(
+    fetch_page: Callable[[str], dict],
+    next_cursor: str = INITIAL_CURSOR,
+    prefetch: bool = False,
+) -> Iterator:
+    """
+    Yields the records of every page of a cursor paginated endpoint, see iter_pages
+    """
+    for page in iter_pages(fetch_page, next_cursor, prefetch):
+        yield from page
+
+
+async def aiter_pages(
+    fetch_page: Callable[[str], Awaitable[dict]],
+    next_cursor: str = INITIAL_CURSOR,
+    prefetch: bool = False,
+) -> AsyncIterator[list]:
+    """
+    Async version of iter_pages, prefetching in a task of the running loop
+    """
+    next_cursor = next_cursor if next_cursor is not None else INITIAL_CURSOR
+    if next_cursor == END_CURSOR:
+        return
+
+    fetch = asyncio.ensure_future(fetch_page(next_cursor))
+    try:
+        while fetch is not None:
+            response = await fetch
+            fetch = None
+            next_cursor = response.get("next_cursor")
+            if prefetch and not _is_last(next_cursor):
+                fetch = asyncio.ensure_future(fetch_page(next_cursor))
+            yield response["data"]
+            if not prefetch and not _is_last(next_cursor):
+                fetch = asyncio.ensure_future(fetch_page(next_cursor))
+    finally:
+        if fetch is not None:
+            fetch.cancel()
+
+
+async def aiter_records(
+    fetch_page: Callable[[str], Awaitable[dict]],
+    next_cursor: str = INITIAL_CURSOR,
+    prefetch: bool = False,
+) -> AsyncIterator:
+    """
+    Yields the records of every page of a cursor paginated endpoint, see aiter_pages
+    """
+    async for page in aiter_pages(fetch_page, next_cursor, prefetch):
+        for record in page:
+            yield record
@@ -1,28 +1,63 @@
+from functools import lru_cache
+
 from poly_eip712_structs import make_domain
 from eth_utils import keccak
 from py_order_utils.utils import prepend_zx
 
 from .model import ClobAuth
+from ..metadata_cache import MetadataCache
 from ..signer import Signer
 
 CLOB_DOMAIN_NAME = "ClobAuthDomain"
 CLOB_VERSION = "1"
 MSG_TO_SIGN = "This message attests that I control the given wallet"
 
+EIP712_PREFIX = b"\x19\x01"
+# signatures of recent (address, chain id, timestamp, nonce), enough for a burst of
+# key creations and derivations within the same second
+L1_SIGNATURE_CACHE_SIZE = 256
+
+_l1_signatures = MetadataCache(maxsize=L1_SIGNATURE_CACHE_SIZE)
+
 
+@lru_cache(maxsize=None)
 def get_clob_auth_domain(chain_id: int):
     return make_domain(name=CLOB_DOMAIN_NAME, version=CLOB_VERSION, chainId=chain_id)
 
 
-def sign_clob_auth_message(signer: Signer, timestamp: int, nonce: int) -> str:
+@lru_cache(maxsize=None)
+def get_clob_auth_domain_separator(chain_id: int) -> bytes:
+    """
+    Returns the EIP712 domain separator hash of the ClobAuth domain on the chain
+    """
+    return get_clob_auth_domain(chain_id).hash_struct()
+
+
+def _sign_clob_auth_message(signer: Signer, timestamp: int, nonce: int) -> str:
     clob_auth_msg = ClobAuth(
         address=signer.address(),
         timestamp=str(timestamp),
         nonce=nonce,
         message=MSG_TO_SIGN,
     )
-    chain_id = signer.get_chain_id()
     auth_struct_hash = prepend_zx(
-        keccak(clob_auth_msg.signable_bytes(get_clob_auth_domain(chain_id))).hex()
+        keccak(
+            EIP712_PREFIX
+            + get_clob_auth_domain_separator(signer.get_chain_id())
+            + clob_auth_msg.hash_struct()
+        ).hex()
     )
     return prepend_zx(signer.sign(auth_struct_hash))
+
+
+def sign_clob_auth_message(signer: Signer, timestamp: int, nonce: int) -> str:
+    """
+    Signs the ClobAuth message of L1 headers
+
+    Signatures are deterministic, recent ones are reused for the same address, chain,
+    timestamp and nonce
+    """
+    key = (signer.address(), signer.get_chain_id(), str(timestamp), nonce)
+    return _l1_signatures.get_or_load(
+        key, lambda _: _sign_clob_auth_message(signer, timestamp, nonce)
+    )
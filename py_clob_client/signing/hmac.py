@@ -2,21 +2,52 @@ import hmac
 import hashlib
 import base64
 
+from ..codec import serialize_body
+
+
+def build_hmac_message(timestamp, method: str, requestPath: str, body=None) -> bytes:
+    """
+    The payload signed for a request
+    A serialised body is signed as is, it must be the exact request data
+    """
+    message = str(timestamp) + str(method) + str(requestPath)
+    if body:
+        message += serialize_body(body)
+    return bytes(message, "utf-8")
+
 
 def build_hmac_signature(
     secret: str, timestamp: str, method: str, requestPath: str, body=None
 ):
     """
     Creates an HMAC signature by signing a payload with the secret
+    A serialised body is signed as is, it must be the exact request data
     """
     base64_secret = base64.urlsafe_b64decode(secret)
-    message = str(timestamp) + str(method) + str(requestPath)
-    if body:
-        # NOTE: Necessary to replace single quotes with double quotes
-        # to generate the same hmac message as go and typescript
-        message += str(body).replace("'", '"')
-
-    h = hmac.new(base64_secret, bytes(message, "utf-8"), hashlib.sha256)
+    h = hmac.new(
+        base64_secret,
+        build_hmac_message(timestamp, method, requestPath, body),
+        hashlib.sha256,
+    )
 
     # ensure base64 encoded
     return (base64.urlsafe_b64encode(h.digest())).decode("utf-8")
+
+
+class HmacSigner:
+    """
+    Signs payloads with one secret, decoded and keyed once
+
+    Each signature starts from a copy of the keyed HMAC context, so signing is thread
+    safe and gives the same result as build_hmac_signature
+    """
+
+    __slots__ = ("__keyed",)
+
+    def __init__(self, secret: str):
+        self.__keyed = hmac.new(base64.urlsafe_b64decode(secret), None, hashlib.sha256)
+
+    def sign(self, timestamp, method: str, requestPath: str, body=None) -> str:
+        h = self.__keyed.copy()
+        h.update(build_hmac_message(timestamp, method, requestPath, body))
+        return base64.urlsafe_b64encode(h.digest()).decode("utf-8")
@@ -0,0 +1,342 @@
+from typing import Any, Callable, Optional
+
+from .codec import get_codec
+from .order_book import OrderBook
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+def _number(value) -> Optional[float]:
+    return float(value) if value != "" else None
+
+
+def _integer(value) -> Optional[int]:
+    return int(value) if value != "" else None
+
+
+def _boolean(value) -> Optional[bool]:
+    # bool("false") is True, flags sent as strings are parsed
+    if isinstance(value, str):
+        flag = value.strip().lower()
+        if flag in ("true", "1"):
+            return True
+        if flag in ("false", "0"):
+            return False
+        if flag == "":
+            return None
+        raise ValueError("not a boolean: {!r}".format(value))
+    return bool(value)
+
+
+class _Structs:
+    """
+    Converts a list of objects into structs
+    """
+
+    __slots__ = ("struct",)
+
+    def __init__(self, struct):
+        self.struct = struct
+
+    def __call__(self, values: list) -> list:
+        return [self.struct.from_dict(value) for value in values]
+
+
+def _raw(value):
+    return value
+
+
+# msgspec types of the converters, decoded with strict=False so numbers and flags sent
+# as strings are parsed
+_ANNOTATIONS = {str: str, _number: float, _integer: int, _boolean: bool, _raw: Any}
+
+
+def _annotation(convert):
+    if isinstance(convert, _Structs):
+        return list[convert.struct]
+    return _ANNOTATIONS[convert]
+
+
+class Struct:
+    """
+    Typed record of a response object
+
+    Subclasses list their FIELDS as (name, converter) pairs, the name being the key in
+    the response. Values are converted once, when decoded, keys missing from the
+    response are None and unknown keys are ignored
+
+    With msgspec installed, the structs are msgspec Structs and raw responses are
+    decoded straight into them, without building the intermediate dicts
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+
+    @classmethod
+    def from_dict(cls, raw: dict):
+        get = raw.get
+        values = {}
+        for name, convert in cls.FIELDS:
+            value = get(name)
+            if value is not None:
+                values[name] = convert(value)
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        d = {}
+        for name, _ in self.FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, list):
+                value = [v.to_dict() if isinstance(v, Struct) else v for v in value]
+            d[name] = value
+        return d
+
+
+class _SlotsStruct(Struct):
+    """
+    Struct with __slots__, when msgspec isn't installed
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        for name, _ in self.FIELDS:
+            setattr(self, name, kwargs.get(name))
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n, _ in self.FIELDS)
+
+    def __repr__(self) -> str:
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join("{}={!r}".format(n, getattr(self, n)) for n, _ in self.FIELDS),
+        )
+
+
+def _define(name: str, fields: tuple) -> type:
+    """
+    A Struct subclass with the fields, a msgspec Struct if msgspec is installed
+    """
+    if msgspec is None:
+        return type(
+            name,
+            (_SlotsStruct,),
+            {
+                "FIELDS": fields,
+                "__slots__": tuple(n for n, _ in fields),
+                "__module__": __name__,
+            },
+        )
+    return msgspec.defstruct(
+        name,
+        [(n, Optional[_annotation(convert)], None) for n, convert in fields],
+        bases=(msgspec.Struct, Struct),
+        module=__name__,
+        namespace={"FIELDS": fields},
+        gc=False,
+    )
+
+
+OpenOrder = _define(
+    "OpenOrder",
+    (
+        ("id", str),
+        ("status", str),
+        ("owner", str),
+        ("maker_address", str),
+        ("market", str),
+        ("asset_id", str),
+        ("side", str),
+        ("original_size", _number),
+        ("size_matched", _number),
+        ("price", _number),
+        ("outcome", str),
+        ("expiration", _integer),
+        ("order_type", str),
+        ("associate_trades", _raw),
+        ("created_at", _integer),
+    ),
+)
+
+MakerOrder = _define(
+    "MakerOrder",
+    (
+        ("order_id", str),
+        ("owner", str),
+        ("maker_address", str),
+        ("matched_amount", _number),
+        ("price", _number),
+        ("fee_rate_bps", _number),
+        ("asset_id", str),
+        ("outcome", str),
+        ("side", str),
+    ),
+)
+
+Trade = _define(
+    "Trade",
+    (
+        ("id", str),
+        ("taker_order_id", str),
+        ("market", str),
+        ("asset_id", str),
+        ("side", str),
+        ("size", _number),
+        ("fee_rate_bps", _number),
+        ("price", _number),
+        ("status", str),
+        ("match_time", _integer),
+        ("last_update", _integer),
+        ("outcome", str),
+        ("bucket_index", _integer),
+        ("owner", str),
+        ("maker_address", str),
+        ("maker_orders", _Structs(MakerOrder)),
+        ("transaction_hash", str),
+        ("trader_side", str),
+    ),
+)
+
+MarketToken = _define(
+    "MarketToken",
+    (
+        ("token_id", str),
+        ("outcome", str),
+        ("price", _number),
+        ("winner", _boolean),
+    ),
+)
+
+Market = _define(
+    "Market",
+    (
+        ("condition_id", str),
+        ("question_id", str),
+        ("question", str),
+        ("description", str),
+        ("market_slug", str),
+        ("end_date_iso", str),
+        ("game_start_time", str),
+        ("tokens", _Structs(MarketToken)),
+        ("tags", _raw),
+        ("rewards", _raw),
+        ("active", _boolean),
+        ("closed", _boolean),
+        ("archived", _boolean),
+        ("accepting_orders", _boolean),
+        ("enable_order_book", _boolean),
+        ("minimum_order_size", _number),
+        ("minimum_tick_size", _number),
+        ("maker_base_fee", _number),
+        ("taker_base_fee", _number),
+        ("seconds_delay", _integer),
+        ("neg_risk", _boolean),
+        ("neg_risk_market_id", str),
+        ("neg_risk_request_id", str),
+        ("icon", str),
+        ("image", str),
+    ),
+)
+
+SimplifiedMarket = _define(
+    "SimplifiedMarket",
+    (
+        ("condition_id", str),
+        ("tokens", _Structs(MarketToken)),
+        ("rewards", _raw),
+        ("active", _boolean),
+        ("closed", _boolean),
+        ("archived", _boolean),
+        ("accepting_orders", _boolean),
+    ),
+)
+
+_page_types = {}
+
+
+def _page_type(struct) -> type:
+    """
+    msgspec type of a page of structs of a cursor paginated endpoint
+    """
+    page = _page_types.get(struct)
+    if page is None:
+        page = msgspec.defstruct(
+            "{}Page".format(struct.__name__),
+            [
+                ("data", Optional[list[struct]], None),
+                ("next_cursor", Optional[str], None),
+                ("limit", Any, None),
+                ("count", Any, None),
+            ],
+            gc=False,
+        )
+        _page_types[struct] = page
+    return page
+
+
+def _fast_decode(response, struct, type_: Callable[[type], Any]):
+    """
+    Decodes a raw response straight into type_(struct), None if it can't be: without
+    msgspec, or with values such as empty numbers that only from_dict converts
+    """
+    if (
+        msgspec is None
+        or not isinstance(response, (str, bytes))
+        or not issubclass(struct, msgspec.Struct)
+    ):
+        return None
+    try:
+        return msgspec.json.decode(response, type=type_(struct), strict=False)
+    except msgspec.ValidationError:
+        return None
+
+
+def _decoded(response) -> Any:
+    if isinstance(response, (str, bytes)):
+        return get_codec().decode(response)
+    return response
+
+
+def decode_list(response, struct) -> list:
+    """
+    Decodes a list response, raw or already decoded, into structs
+    """
+    structs = _fast_decode(response, struct, lambda s: Optional[list[s]])
+    if structs is not None:
+        return structs
+    return [struct.from_dict(raw) for raw in _decoded(response) or []]
+
+
+def decode_page(response, struct) -> dict:
+    """
+    Decodes a page of a cursor paginated endpoint, raw or already decoded, with its
+    data as structs
+    """
+    fast = _fast_decode(response, struct, _page_type)
+    if fast is not None:
+        return {
+            "data": fast.data or [],
+            "next_cursor": fast.next_cursor,
+            "limit": fast.limit,
+            "count": fast.count,
+        }
+    page = _decoded(response)
+    return {
+        "data": decode_list(page.get("data"), struct),
+        "next_cursor": page.get("next_cursor"),
+        "limit": page.get("limit"),
+        "count": page.get("count"),
+    }
+
+
+def decode_order_book(response) -> OrderBook:
+    """
+    Decodes a book response, raw or already decoded, into an OrderBook with numeric
+    prices and sizes
+    """
+    return OrderBook.from_raw(_decoded(response))
@@ -1,6 +1,7 @@
 import hashlib
 
 from .clob_types import OrderBookSummary, OrderSummary, TickSize
+from .order_book import OrderBook
 
 
 def parse_raw_orderbook_summary(raw_obs: any) -> OrderBookSummary:
@@ -24,6 +25,13 @@ def parse_raw_orderbook_summary(raw_obs: any) -> OrderBookSummary:
     return orderbookSummary
 
 
+def parse_raw_orderbook(raw_obs: any) -> OrderBook:
+    """
+    Parses a raw book into an array backed OrderBook, sorted best first
+    """
+    return OrderBook.from_raw(raw_obs)
+
+
 def generate_orderbook_summary_hash(orderbook: OrderBookSummary) -> str:
     orderbook.hash = ""
     hash = hashlib.sha1(str(orderbook.json).encode("utf-8")).hexdigest()
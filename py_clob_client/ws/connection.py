@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+from ..codec import get_codec
+
+WSS_HOST = "wss://ws-subscriptions-clob.polymarket.com"
+MARKET_CHANNEL = "market"
+USER_CHANNEL = "user"
+
+PING = "PING"
+PONG = "PONG"
+DEFAULT_PING_INTERVAL = 10
+DEFAULT_RECONNECT_DELAY = 1.0
+DEFAULT_MAX_RECONNECT_DELAY = 30.0
+
+
+class ChannelSubscriber(ABC):
+    """
+    Base for CLOB websocket channel subscribers
+
+    Keeps one connection to the channel open: subscribes on connect, keeps the connection
+    alive with PINGs, hands every decoded event to on_event and reconnects with
+    exponential backoff whenever the connection drops
+    """
+
+    channel: str = None
+
+    def __init__(
+        self,
+        host: str = WSS_HOST,
+        ping_interval: float = DEFAULT_PING_INTERVAL,
+        reconnect_delay: float = DEFAULT_RECONNECT_DELAY,
+        max_reconnect_delay: float = DEFAULT_MAX_RECONNECT_DELAY,
+    ):
+        """
+        host: websocket host, the channel path is appended to it
+        ping_interval: seconds between keep-alive PINGs
+        reconnect_delay: seconds to wait before the first reconnection attempt, doubled on
+        every consecutive failure up to max_reconnect_delay
+        """
+        self.url = "{}/ws/{}".format(host.rstrip("/"), self.channel)
+        self.ping_interval = ping_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._stopped = False
+        self._loop = None
+        self._ws = None
+        self._thread = None
+
+    @abstractmethod
+    def subscription(self) -> dict:
+        """
+        The subscription message sent on every connection
+        """
+
+    @abstractmethod
+    def on_event(self, event: dict):
+        """
+        Handles one decoded channel event
+        """
+
+    async def on_connect(self):
+        """
+        Called after every successful subscription
+        """
+
+    def handle_message(self, message: str):
+        """
+        Decodes a raw channel message, a single event or a list of events
+
+        An event that on_event fails to handle is logged and skipped, so a malformed
+        event or a raising callback doesn't end the subscription
+        """
+        if message == PONG:
+            return
+        try:
+            payload = get_codec().decode(message)
+        except ValueError:
+            self.logger.warning("Couldn't parse websocket message: %s", message)
+            return
+
+        for event in payload if isinstance(payload, list) else [payload]:
+            if not isinstance(event, dict):
+                continue
+            try:
+                self.on_event(event)
+            except Exception:
+                self.logger.error(
+                    "Couldn't handle websocket event: %s", event, exc_info=True
+                )
+
+    async def run(self):
+        """
+        Runs the subscription until stop() is called
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stopped = False
+        delay = self.reconnect_delay
+
+        while not self._stopped:
+            try:
+                async with connect(self.url) as ws:
+                    self._ws = ws
+                    await ws.send(get_codec().encode(self.subscription()))
+                    await self.on_connect()
+                    delay = self.reconnect_delay
+
+                    pinger = asyncio.ensure_future(self._ping(ws))
+                    try:
+                        async for message in ws:
+                            self.handle_message(message)
+                    finally:
+                        pinger.cancel()
+            except (OSError, asyncio.TimeoutError, WebSocketException) as e:
+                self.logger.warning("Websocket connection to %s lost: %s", self.url, e)
+            finally:
+                self._ws = None
+
+            if self._stopped:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send(PING)
+
+    def reconnect(self):
+        """
+        Drops the current connection, run() reconnects and resubscribes
+        """
+        ws = self._ws
+        if ws is not None:
+            asyncio.ensure_future(ws.close())
+
+    def start(self) -> threading.Thread:
+        """
+        Runs the subscription on its own event loop in a daemon thread
+        """
+        self._thread = threading.Thread(
+            target=asyncio.run, args=(self.run(),), daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """
+        Stops the subscription, from any thread
+        """
+        self._stopped = True
+        loop, ws = self._loop, self._ws
+        if loop is not None and ws is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(ws.close(), loop)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
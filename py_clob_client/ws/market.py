@@ -0,0 +1,386 @@
+import asyncio
+import time
+from array import array
+from typing import Callable, Optional
+
+from .connection import MARKET_CHANNEL, WSS_HOST, ChannelSubscriber
+from ..clob_types import OrderBookSummary
+from ..order_book import BookSide, OrderBook
+from ..order_builder.constants import BUY
+from ..utilities import generate_orderbook_summary_hash, parse_raw_orderbook_summary
+
+BOOK_EVENT = "book"
+PRICE_CHANGE_EVENT = "price_change"
+
+# seconds between two resyncs of a token, and between two reconnections
+DEFAULT_MIN_RESYNC_INTERVAL = 5.0
+
+
+def _timestamp(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _LocalSide:
+    """
+    One side of a local book, best first, updated in place: numeric price and size
+    columns for the published books, and the server strings for the hash
+    """
+
+    __slots__ = ("descending", "prices", "sizes", "levels")
+
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self.prices = array("d")
+        self.sizes = array("d")
+        self.levels = []
+
+    def __find(self, price: float) -> int:
+        """
+        Index of the level at price, or where it would be inserted
+        """
+        prices = self.prices
+        lo, hi = 0, len(prices)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (prices[mid] > price) if self.descending else (prices[mid] < price):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def set_level(self, price: str, size: str):
+        value = float(price)
+        i = self.__find(value)
+        found = i < len(self.prices) and self.prices[i] == value
+        if float(size) == 0:
+            if found:
+                del self.prices[i]
+                del self.sizes[i]
+                del self.levels[i]
+        elif found:
+            self.sizes[i] = float(size)
+            self.levels[i] = (price, size)
+        else:
+            self.prices.insert(i, value)
+            self.sizes.insert(i, float(size))
+            self.levels.insert(i, (price, size))
+
+    def snapshot(self) -> BookSide:
+        return BookSide(self.prices[:], self.sizes[:])
+
+    def to_raw(self) -> list:
+        """
+        The levels in the /book endpoint order, worst first
+        """
+        return [{"price": price, "size": size} for price, size in reversed(self.levels)]
+
+
+class _LocalBook:
+    """
+    Mutable book state of one token
+    """
+
+    __slots__ = ("market", "timestamp", "hash", "bids", "asks")
+
+    def __init__(self, market: str, timestamp: str, hash: str):
+        self.market = market
+        self.timestamp = timestamp
+        self.hash = hash
+        self.bids = _LocalSide(descending=True)
+        self.asks = _LocalSide(descending=False)
+
+    @classmethod
+    def from_summary(cls, summary: OrderBookSummary) -> "_LocalBook":
+        book = cls(summary.market, summary.timestamp, summary.hash)
+        for bid in summary.bids or []:
+            book.bids.set_level(bid.price, bid.size)
+        for ask in summary.asks or []:
+            book.asks.set_level(ask.price, ask.size)
+        return book
+
+    def set_level(self, side: str, price: str, size: str):
+        (self.bids if side == BUY else self.asks).set_level(price, size)
+
+    def to_order_book(self, asset_id: str) -> OrderBook:
+        return OrderBook(
+            market=self.market,
+            asset_id=asset_id,
+            timestamp=self.timestamp,
+            bids=self.bids.snapshot(),
+            asks=self.asks.snapshot(),
+            hash=self.hash,
+        )
+
+    def to_raw(self, asset_id: str) -> dict:
+        """
+        The book as the /book endpoint would return it: bids ascending and asks descending
+        """
+        return {
+            "market": self.market,
+            "asset_id": asset_id,
+            "timestamp": self.timestamp,
+            "hash": self.hash,
+            "bids": self.bids.to_raw(),
+            "asks": self.asks.to_raw(),
+        }
+
+
+class BookStreamer(ChannelSubscriber):
+    """
+    Local order book mirror fed by the market websocket channel
+
+    Applies book snapshots and price changes for the subscribed tokens and publishes each
+    new state as an immutable OrderBook, so get_book never takes a lock and never sees a
+    partially applied update
+
+    With verify_hash, every update that carries a server hash is checked against
+    generate_orderbook_summary_hash. A book that doesn't match is dropped and fetched
+    again with the client's get_order_book, the changes received meanwhile being
+    replayed on top of it. Without a client, or if the fetch fails, the connection is
+    re-established to get a fresh snapshot, at most once every min_resync_interval
+    """
+
+    channel = MARKET_CHANNEL
+
+    def __init__(
+        self,
+        token_ids: list[str],
+        host: str = WSS_HOST,
+        verify_hash: bool = True,
+        on_update: Callable[[OrderBook], None] = None,
+        client=None,
+        min_resync_interval: float = DEFAULT_MIN_RESYNC_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        **kwargs,
+    ):
+        """
+        token_ids: tokens to mirror
+        on_update: called with every newly published book
+        client: ClobClient or AsyncClobClient used to resync a token whose hash doesn't
+                match
+        min_resync_interval: seconds between two resyncs of a token, and between two
+                             reconnections
+        kwargs: connection settings, see ChannelSubscriber
+        """
+        super().__init__(host, **kwargs)
+        self.token_ids = list(token_ids)
+        self.verify_hash = verify_hash
+        self.on_update = on_update
+        self.client = client
+        self.min_resync_interval = min_resync_interval
+        self.clock = clock
+        self.hash_mismatches = 0
+
+        self.__subscribed = set(self.token_ids)
+        self.__local_books = {}
+        self.__books = {}
+        # changes received while a token is being fetched, replayed on the fetched book
+        self.__resyncing = {}
+        self.__last_resync = {}
+        self.__resync_tasks = set()
+        self.__last_reconnect = None
+        self.__reconnect_pending = False
+
+    def subscription(self) -> dict:
+        return {"assets_ids": self.token_ids, "type": MARKET_CHANNEL}
+
+    def get_book(self, token_id: str) -> Optional[OrderBook]:
+        """
+        Current book of the token, None until its first snapshot arrives
+        """
+        return self.__books.get(token_id)
+
+    def get_books(self) -> dict[str, OrderBook]:
+        """
+        Current books of every synced token
+        """
+        return dict(self.__books)
+
+    def on_event(self, event: dict):
+        event_type = event.get("event_type")
+        if event_type == BOOK_EVENT:
+            self.__apply_snapshot(event)
+        elif event_type == PRICE_CHANGE_EVENT:
+            self.__apply_price_change(event)
+
+    def __apply_snapshot(self, event: dict):
+        asset_id = event.get("asset_id")
+        if asset_id not in self.__subscribed:
+            return
+        # a fresh snapshot supersedes a resync in flight
+        self.__resyncing.pop(asset_id, None)
+
+        book = _LocalBook(
+            event.get("market"), event.get("timestamp"), event.get("hash")
+        )
+        for bid in event.get("bids") or []:
+            book.bids.set_level(bid["price"], bid["size"])
+        for ask in event.get("asks") or []:
+            book.asks.set_level(ask["price"], ask["size"])
+
+        self.__local_books[asset_id] = book
+        self.__publish(asset_id, book, bool(book.hash))
+
+    def __apply_price_change(self, event: dict):
+        if "price_changes" in event:
+            changes = event["price_changes"]
+        else:
+            # single asset format, the hash is on the event
+            changes = [
+                dict(change, asset_id=event.get("asset_id"), hash=event.get("hash"))
+                for change in event.get("changes") or []
+            ]
+        timestamp = event.get("timestamp")
+
+        touched = {}
+        for change in changes:
+            asset_id = change.get("asset_id")
+            pending = self.__resyncing.get(asset_id)
+            if pending is not None:
+                pending.append((timestamp, change))
+                continue
+            book = self.__local_books.get(asset_id)
+            if book is None:
+                # no snapshot yet, the snapshot will include this change
+                continue
+            book.set_level(change["side"], change["price"], change["size"])
+            book.hash = change.get("hash")
+            # only the last change of a token has a hash matching the whole message
+            touched[asset_id] = bool(book.hash)
+
+        for asset_id, hashed in touched.items():
+            book = self.__local_books[asset_id]
+            if timestamp is not None:
+                book.timestamp = timestamp
+            self.__publish(asset_id, book, hashed)
+
+    def __publish(self, asset_id: str, book: _LocalBook, hashed: bool):
+        """
+        hashed: whether the update carried a server hash to check the book against
+        """
+        if self.verify_hash and hashed and not self.__hash_matches(asset_id, book):
+            self.hash_mismatches += 1
+            self.logger.warning("Book hash mismatch for %s, resyncing", asset_id)
+            self.__local_books.pop(asset_id, None)
+            self.__books.pop(asset_id, None)
+            self.__resync(asset_id)
+            return
+
+        order_book = book.to_order_book(asset_id)
+        self.__books[asset_id] = order_book
+        if self.on_update is not None:
+            self.on_update(order_book)
+
+    @staticmethod
+    def __hash_matches(asset_id: str, book: _LocalBook) -> bool:
+        summary = parse_raw_orderbook_summary(book.to_raw(asset_id))
+        return generate_orderbook_summary_hash(summary) == book.hash
+
+    def __resync(self, asset_id: str):
+        """
+        Fetches the token's book again, changes received meanwhile are kept for it
+        """
+        if self.client is None:
+            self.__request_reconnect()
+            return
+
+        pending = []
+        self.__resyncing[asset_id] = pending
+        now = self.clock()
+        last = self.__last_resync.get(asset_id)
+        delay = 0.0 if last is None else max(0.0, last + self.min_resync_interval - now)
+        self.__last_resync[asset_id] = now + delay
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # fed outside of run(), fetch in place
+            if asyncio.iscoroutinefunction(self.client.get_order_book):
+                self.__resync_failed(asset_id, pending, "no running event loop")
+                return
+            try:
+                summary = self.client.get_order_book(asset_id)
+            except Exception as e:
+                self.__resync_failed(asset_id, pending, e)
+                return
+            self.__apply_resync(asset_id, pending, summary)
+            return
+
+        task = asyncio.ensure_future(self.__fetch(asset_id, pending, delay))
+        self.__resync_tasks.add(task)
+        task.add_done_callback(self.__resync_tasks.discard)
+
+    async def __fetch(self, asset_id: str, pending: list, delay: float):
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            if asyncio.iscoroutinefunction(self.client.get_order_book):
+                summary = await self.client.get_order_book(asset_id)
+            else:
+                summary = await asyncio.get_running_loop().run_in_executor(
+                    None, self.client.get_order_book, asset_id
+                )
+        except Exception as e:
+            self.__resync_failed(asset_id, pending, e)
+            return
+        self.__apply_resync(asset_id, pending, summary)
+
+    def __apply_resync(self, asset_id: str, pending: list, summary: OrderBookSummary):
+        if self.__resyncing.get(asset_id) is not pending:
+            # superseded by a websocket snapshot
+            return
+        del self.__resyncing[asset_id]
+
+        book = _LocalBook.from_summary(summary)
+        fetched_at = _timestamp(book.timestamp)
+        hashed = False
+        for timestamp, change in pending:
+            if _timestamp(timestamp) < fetched_at:
+                continue
+            book.set_level(change["side"], change["price"], change["size"])
+            book.hash = change.get("hash")
+            hashed = bool(book.hash)
+            if timestamp is not None:
+                book.timestamp = timestamp
+
+        self.__local_books[asset_id] = book
+        self.__publish(asset_id, book, hashed)
+
+    def __resync_failed(self, asset_id: str, pending: list, error):
+        self.logger.error("Couldn't fetch the book of %s: %s", asset_id, error)
+        if self.__resyncing.get(asset_id) is pending:
+            del self.__resyncing[asset_id]
+            self.__request_reconnect()
+
+    def __request_reconnect(self):
+        """
+        Reconnects for fresh snapshots, at most once every min_resync_interval
+        """
+        if self.__reconnect_pending:
+            return
+        now = self.clock()
+        if (
+            self.__last_reconnect is None
+            or now - self.__last_reconnect >= self.min_resync_interval
+        ):
+            self.__last_reconnect = now
+            self.reconnect()
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self.__reconnect_pending = True
+        loop.call_later(
+            self.__last_reconnect + self.min_resync_interval - now,
+            self.__deferred_reconnect,
+        )
+
+    def __deferred_reconnect(self):
+        self.__reconnect_pending = False
+        self.__last_reconnect = self.clock()
+        self.reconnect()
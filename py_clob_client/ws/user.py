@@ -0,0 +1,221 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from .connection import USER_CHANNEL, WSS_HOST, ChannelSubscriber
+from ..clob_types import ApiCreds, OrderEvent, TradeEvent, TradeParams
+
+ORDER_EVENT = "order"
+TRADE_EVENT = "trade"
+
+# (trade id, status) pairs remembered to drop trades seen both live and in a backfill
+MAX_SEEN_TRADES = 10000
+
+# seconds subtracted from the local clock when no trade has been seen yet, for clock skew
+BACKFILL_MARGIN = 60
+
+DEFAULT_BACKFILL_ATTEMPTS = 3
+DEFAULT_BACKFILL_DELAY = 0.5
+
+
+def parse_order_event(event: dict) -> OrderEvent:
+    return OrderEvent(
+        id=event.get("id"),
+        type=event.get("type"),
+        market=event.get("market"),
+        asset_id=event.get("asset_id"),
+        side=event.get("side"),
+        price=event.get("price"),
+        original_size=event.get("original_size"),
+        size_matched=event.get("size_matched"),
+        outcome=event.get("outcome"),
+        owner=event.get("owner"),
+        timestamp=event.get("timestamp"),
+        associate_trades=event.get("associate_trades"),
+        raw=event,
+    )
+
+
+def parse_trade_event(event: dict, backfilled: bool = False) -> TradeEvent:
+    """
+    Parses a trade event, or a trade as returned by get_trades
+    """
+    return TradeEvent(
+        id=event.get("id"),
+        status=event.get("status"),
+        market=event.get("market"),
+        asset_id=event.get("asset_id"),
+        side=event.get("side"),
+        price=event.get("price"),
+        size=event.get("size"),
+        outcome=event.get("outcome"),
+        owner=event.get("owner"),
+        taker_order_id=event.get("taker_order_id"),
+        maker_orders=event.get("maker_orders"),
+        matchtime=event.get("matchtime", event.get("match_time")),
+        last_update=event.get("last_update"),
+        backfilled=backfilled,
+        raw=event,
+    )
+
+
+class UserStreamer(ChannelSubscriber):
+    """
+    Streams the user's order and trade events from the user websocket channel
+
+    After a reconnection, trades matched while disconnected are backfilled with
+    get_trades(after=...) on the given client, so no fill is missed. Trades seen both live
+    and in a backfill are only emitted once. A backfill that keeps failing is retried from
+    the same point on the next reconnection
+    """
+
+    channel = USER_CHANNEL
+
+    def __init__(
+        self,
+        creds: ApiCreds = None,
+        markets: list[str] = None,
+        client=None,
+        on_order: Callable[[OrderEvent], None] = None,
+        on_trade: Callable[[TradeEvent], None] = None,
+        host: str = WSS_HOST,
+        backfill_attempts: int = DEFAULT_BACKFILL_ATTEMPTS,
+        backfill_delay: float = DEFAULT_BACKFILL_DELAY,
+        **kwargs,
+    ):
+        """
+        creds: API credentials, defaults to the client's
+        markets: condition ids to subscribe to, all of the user's markets if None
+        client: ClobClient or AsyncClobClient used to backfill trades after a disconnect
+        backfill_attempts: times a backfill is tried on each reconnection
+        backfill_delay: seconds to wait before the first retry, doubled on every retry
+        kwargs: connection settings, see ChannelSubscriber
+        """
+        super().__init__(host, **kwargs)
+        if creds is None and client is not None:
+            creds = client.creds
+        if creds is None:
+            raise Exception(
+                "API credentials are needed to subscribe to the user channel"
+            )
+
+        self.creds = creds
+        self.markets = list(markets) if markets else []
+        self.client = client
+        self.on_order = on_order
+        self.on_trade = on_trade
+        self.backfill_attempts = backfill_attempts
+        self.backfill_delay = backfill_delay
+
+        self.last_trade_time = None
+        # start of a backfill that hasn't succeeded yet
+        self.__backfill_after = None
+        self.__connected_once = False
+        self.__seen_trades = OrderedDict()
+
+    def subscription(self) -> dict:
+        return {
+            "auth": {
+                "apiKey": self.creds.api_key,
+                "secret": self.creds.api_secret,
+                "passphrase": self.creds.api_passphrase,
+            },
+            "markets": self.markets,
+            "type": USER_CHANNEL,
+        }
+
+    def on_event(self, event: dict):
+        event_type = event.get("event_type")
+        if event_type == ORDER_EVENT:
+            if self.on_order is not None:
+                self.on_order(parse_order_event(event))
+        elif event_type == TRADE_EVENT:
+            self.__emit_trade(parse_trade_event(event))
+
+    async def on_connect(self):
+        if self.__connected_once:
+            await self.backfill()
+        else:
+            self.__connected_once = True
+            if self.last_trade_time is None:
+                # trades matched from now on are delivered live or backfilled
+                self.last_trade_time = int(time.time()) - BACKFILL_MARGIN
+
+    async def backfill(self) -> bool:
+        """
+        Emits the trades matched since the last trade seen, or since the start of the last
+        failed backfill, False if it failed
+        """
+        if self.client is None or self.last_trade_time is None:
+            return True
+
+        # inclusive of the last second, duplicates are dropped
+        after = self.last_trade_time - 1
+        if self.__backfill_after is not None:
+            after = min(after, self.__backfill_after)
+        self.__backfill_after = after
+
+        markets = self.markets or [None]
+        delay = self.backfill_delay
+        for attempt in range(1, self.backfill_attempts + 1):
+            failed = []
+            for market in markets:
+                try:
+                    trades = await self.__get_trades(
+                        TradeParams(market=market, after=after)
+                    )
+                except Exception as e:
+                    self.logger.warning(
+                        "Couldn't backfill trades (attempt %d): %s", attempt, e
+                    )
+                    failed.append(market)
+                    continue
+
+                for trade in sorted(trades, key=self.__match_time):
+                    self.__emit_trade(parse_trade_event(trade, backfilled=True))
+
+            if not failed:
+                self.__backfill_after = None
+                return True
+            markets = failed
+            if attempt < self.backfill_attempts:
+                await asyncio.sleep(delay)
+                delay *= 2
+
+        self.logger.error(
+            "Couldn't backfill trades since %d, retrying on the next reconnection",
+            after,
+        )
+        return False
+
+    async def __get_trades(self, params: TradeParams) -> list:
+        if asyncio.iscoroutinefunction(self.client.get_trades):
+            return await self.client.get_trades(params)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.client.get_trades, params
+        )
+
+    def __emit_trade(self, trade: TradeEvent):
+        key = (trade.id, trade.status)
+        if key in self.__seen_trades:
+            return
+        self.__seen_trades[key] = None
+        if len(self.__seen_trades) > MAX_SEEN_TRADES:
+            self.__seen_trades.popitem(last=False)
+
+        match_time = self.__match_time(trade.raw)
+        if match_time and (
+            self.last_trade_time is None or match_time > self.last_trade_time
+        ):
+            self.last_trade_time = match_time
+
+        if self.on_trade is not None:
+            self.on_trade(trade)
+
+    @staticmethod
+    def __match_time(trade: dict) -> int:
+        try:
+            return int(trade.get("matchtime", trade.get("match_time")))
+        except (TypeError, ValueError):
+            return 0
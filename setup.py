@@ -22,6 +22,12 @@ setuptools.setup(
         "python-dotenv",
         "requests",
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "fast": ["orjson"],
+        "typed": ["msgspec"],
+        "ws": ["websockets>=13.0"],
+    },
     project_urls={
         "Bug Tracker": "https://github.com/Polymarket/py-clob-client/issues",
     },
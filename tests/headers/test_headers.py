@@ -9,10 +9,12 @@ from py_clob_client.headers.headers import (
     POLY_PASSPHRASE,
     POLY_SIGNATURE,
     POLY_TIMESTAMP,
+    L2Authenticator,
     create_level_1_headers,
     create_level_2_headers,
 )
 from py_clob_client.signer import Signer
+from py_clob_client.signing.hmac import build_hmac_signature
 
 # publicly known private key
 private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
@@ -82,3 +84,31 @@ class TestHeaders(TestCase):
         )
         self.assertEqual(l2_headers[POLY_API_KEY], creds.api_key)
         self.assertEqual(l2_headers[POLY_PASSPHRASE], creds.api_passphrase)
+
+    def test_l2_authenticator(self):
+        authenticator = L2Authenticator(signer.address(), creds)
+        request_args = RequestArgs(
+            method="POST", request_path="/order", body={"hash": "0x123"}
+        )
+        headers = authenticator.headers(request_args, timestamp=1000000)
+
+        self.assertEqual(request_args.serialized_body, '{"hash":"0x123"}')
+        self.assertEqual(
+            headers,
+            {
+                POLY_ADDRESS: signer.address(),
+                POLY_SIGNATURE: build_hmac_signature(
+                    creds.api_secret, 1000000, "POST", "/order", '{"hash":"0x123"}'
+                ),
+                POLY_TIMESTAMP: "1000000",
+                POLY_API_KEY: creds.api_key,
+                POLY_PASSPHRASE: creds.api_passphrase,
+            },
+        )
+
+        # the template isn't shared with the returned headers
+        headers[POLY_API_KEY] = "changed"
+        self.assertEqual(
+            authenticator.headers(request_args, timestamp=1)[POLY_API_KEY],
+            creds.api_key,
+        )
@@ -0,0 +1,93 @@
+import json
+from urllib.parse import parse_qs, urlsplit
+
+
+def market(condition_id: str, *token_ids: str, outcomes=(), **fields) -> dict:
+    """
+    A market of a market listing, with a Yes token per token id, or a token per outcome
+    whose id is the condition id and the outcome index, fields being added to it
+    """
+    tokens = [{"token_id": t, "outcome": "Yes"} for t in token_ids]
+    tokens += [
+        {"token_id": "{}-{}".format(condition_id, i), "outcome": outcome}
+        for i, outcome in enumerate(outcomes)
+    ]
+    raw = {
+        "condition_id": condition_id,
+        "question": "Question {}".format(condition_id),
+        "tokens": tokens,
+    }
+    raw.update(fields)
+    return raw
+
+
+def next_cursor(endpoint: str) -> str:
+    return parse_qs(urlsplit(endpoint).query)["next_cursor"][0]
+
+
+class FakeTransport:
+    """
+    Records every request and replies with canned responses, in order, or with the
+    page of pages at the request's next_cursor
+    """
+
+    def __init__(self, responses=(), pages: dict = None):
+        self.responses = list(responses)
+        self.pages = pages
+        self.requests = []
+
+    def _reply(self, method, endpoint, headers, data):
+        self.requests.append((method, endpoint, headers, data))
+        if self.pages is not None:
+            return self.pages[next_cursor(endpoint)]
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def endpoints(self) -> list:
+        return [endpoint for _, endpoint, _, _ in self.requests]
+
+    def cursors(self) -> list:
+        return [next_cursor(endpoint) for endpoint in self.endpoints()]
+
+    def get(self, endpoint, headers=None, data=None):
+        return self._reply("GET", endpoint, headers, data)
+
+    def post(self, endpoint, headers=None, data=None):
+        return self._reply("POST", endpoint, headers, data)
+
+    def delete(self, endpoint, headers=None, data=None):
+        return self._reply("DELETE", endpoint, headers, data)
+
+    def get_text(self, endpoint, headers=None):
+        response = self._reply("GET", endpoint, headers, None)
+        return response if isinstance(response, str) else json.dumps(response)
+
+    def close(self):
+        pass
+
+
+class AsyncFakeTransport(FakeTransport):
+    async def get(self, endpoint, headers=None, data=None):
+        return super().get(endpoint, headers, data)
+
+    async def post(self, endpoint, headers=None, data=None):
+        return super().post(endpoint, headers, data)
+
+    async def delete(self, endpoint, headers=None, data=None):
+        return super().delete(endpoint, headers, data)
+
+    async def get_text(self, endpoint, headers=None):
+        return super().get_text(endpoint, headers)
+
+    async def close(self):
+        pass
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
@@ -0,0 +1,201 @@
+import asyncio
+import threading
+from unittest import TestCase
+
+from py_clob_client.client import ClobClient
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.http_helpers.batching import (
+    AsyncBatchingTransport,
+    BatchingTransport,
+)
+
+
+def batch_response(endpoint, data):
+    tokens = [item["token_id"] for item in data if item["token_id"] != "unknown"]
+    if endpoint.endswith("/books"):
+        return [
+            {
+                "market": "0xaabbcc",
+                "asset_id": t,
+                "timestamp": "1",
+                "bids": [],
+                "asks": [],
+                "hash": "",
+            }
+            for t in tokens
+        ]
+    if endpoint.endswith("/midpoints"):
+        return {t: "0.5" for t in tokens}
+    if endpoint.endswith("/prices"):
+        return {t: {"BUY": "0.4", "SELL": "0.6"} for t in tokens}
+    if endpoint.endswith("/spreads"):
+        return {t: "0.02" for t in tokens}
+    if endpoint.endswith("/last-trades-prices"):
+        return [{"token_id": t, "price": "0.45", "side": "BUY"} for t in tokens]
+    raise AssertionError(endpoint)
+
+
+class FakeTransport:
+    def __init__(self):
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get(self, endpoint, headers=None, data=None):
+        with self.lock:
+            self.requests.append(("GET", endpoint, data))
+        if "unknown" in endpoint:
+            raise PolyApiException(error_msg="No orderbook exists")
+        return {"endpoint": endpoint}
+
+    def post(self, endpoint, headers=None, data=None):
+        with self.lock:
+            self.requests.append(("POST", endpoint, data))
+        return batch_response(endpoint, data)
+
+
+class AsyncFakeTransport(FakeTransport):
+    async def get(self, endpoint, headers=None, data=None):
+        return super().get(endpoint, headers, data)
+
+    async def post(self, endpoint, headers=None, data=None):
+        return super().post(endpoint, headers, data)
+
+
+def run_threads(fns):
+    results = [None] * len(fns)
+
+    def run(i):
+        results[i] = fns[i]()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(fns))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestBatchingTransport(TestCase):
+    def test_batches_concurrent_calls(self):
+        inner = FakeTransport()
+        client = ClobClient(
+            "http://clob", transport=BatchingTransport(inner, window=0.05)
+        )
+
+        results = run_threads(
+            [lambda t=str(i): client.get_midpoint(t) for i in range(10)]
+            + [lambda: client.get_midpoint("3")]
+            + [
+                lambda: client.get_price("1", "BUY"),
+                lambda: client.get_price("2", "SELL"),
+            ]
+            + [lambda: client.get_spread("1"), lambda: client.get_last_trade_price("2")]
+            + [lambda: client.get_order_book("7")]
+        )
+
+        self.assertEqual(results[:11], [{"mid": "0.5"}] * 11)
+        self.assertEqual(results[11:13], [{"price": "0.4"}, {"price": "0.6"}])
+        self.assertEqual(results[13], {"spread": "0.02"})
+        self.assertEqual(results[14], {"price": "0.45", "side": "BUY"})
+        self.assertEqual(results[15].asset_id, "7")
+
+        posts = {endpoint: data for method, endpoint, data in inner.requests}
+        self.assertEqual(len(inner.requests), 5)
+        self.assertEqual(
+            sorted(item["token_id"] for item in posts["http://clob/midpoints"]),
+            sorted(str(i) for i in range(10)),
+        )
+        self.assertEqual(
+            sorted(posts["http://clob/prices"], key=lambda item: item["token_id"]),
+            [{"token_id": "1", "side": "BUY"}, {"token_id": "2", "side": "SELL"}],
+        )
+
+    def test_max_batch(self):
+        inner = FakeTransport()
+        transport = BatchingTransport(inner, window=10, max_batch=3)
+
+        results = run_threads(
+            [
+                lambda t=str(i): transport.get(
+                    "http://clob/spread?token_id={}".format(t)
+                )
+                for i in range(3)
+            ]
+        )
+        # the third token closed the batch long before the window
+        self.assertEqual(results, [{"spread": "0.02"}] * 3)
+        self.assertEqual(len(inner.requests), 1)
+
+    def test_passthrough_and_missing_tokens(self):
+        inner = FakeTransport()
+        transport = BatchingTransport(inner, window=0.001)
+
+        transport.get("http://clob/markets?next_cursor=MA==")
+        transport.get("http://clob/midpoint?token_id=1", headers={"k": "v"})
+        self.assertEqual([r[0] for r in inner.requests], ["GET", "GET"])
+
+        # not in the batch response, fetched on its own and failing as it would
+        with self.assertRaises(PolyApiException):
+            transport.get("http://clob/book?token_id=unknown")
+        self.assertEqual([r[0] for r in inner.requests], ["GET", "GET", "POST", "GET"])
+
+    def test_malformed_batch_response(self):
+        class MalformedTransport(FakeTransport):
+            def post(self, endpoint, headers=None, data=None):
+                super().post(endpoint, headers, data)
+                # a list where a token map is expected
+                return ["0.5"]
+
+        inner = MalformedTransport()
+        transport = BatchingTransport(inner, window=0.01)
+
+        def get(token_id):
+            try:
+                return transport.get(
+                    "http://clob/midpoint?token_id={}".format(token_id)
+                )
+            except Exception as e:
+                return e
+
+        results = run_threads([lambda t=str(i): get(t) for i in range(3)])
+        # every caller got the error instead of waiting forever
+        self.assertTrue(all(isinstance(r, AttributeError) for r in results))
+        self.assertEqual(len(inner.requests), 1)
+
+        class AsyncMalformedTransport(MalformedTransport):
+            async def post(self, endpoint, headers=None, data=None):
+                return super().post(endpoint, headers, data)
+
+        transport = AsyncBatchingTransport(AsyncMalformedTransport(), window=0.01)
+
+        async def main():
+            return await asyncio.wait_for(
+                asyncio.gather(
+                    *[
+                        transport.get("http://clob/spread?token_id={}".format(i))
+                        for i in range(3)
+                    ],
+                    return_exceptions=True,
+                ),
+                5,
+            )
+
+        results = asyncio.run(main())
+        self.assertTrue(all(isinstance(r, AttributeError) for r in results))
+
+    def test_async(self):
+        inner = AsyncFakeTransport()
+        transport = AsyncBatchingTransport(inner, window=0.01)
+
+        async def main():
+            return await asyncio.gather(
+                *[
+                    transport.get("http://clob/midpoint?token_id={}".format(i))
+                    for i in range(5)
+                ],
+                transport.get("http://clob/price?token_id=1&side=SELL"),
+            )
+
+        results = asyncio.run(main())
+        self.assertEqual(results, [{"mid": "0.5"}] * 5 + [{"price": "0.6"}])
+        self.assertEqual(len(inner.requests), 2)
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+
+from py_clob_client.endpoints import GET_ORDER_BOOK, GET_TICK_SIZE
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.http_helpers.coalescing import (
+    AsyncCoalescingTransport,
+    CoalescingTransport,
+)
+
+
+class SlowTransport:
+    def __init__(self, delay=0.05, error=None):
+        self.delay = delay
+        self.error = error
+        self.requests = []
+
+    def get(self, endpoint, headers=None, data=None):
+        self.requests.append((endpoint, headers))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"endpoint": endpoint}
+
+    def post(self, endpoint, headers=None, data=None):
+        self.requests.append((endpoint, headers))
+        return data
+
+
+class AsyncSlowTransport:
+    def __init__(self):
+        self.requests = []
+
+    async def get(self, endpoint, headers=None, data=None):
+        self.requests.append((endpoint, headers))
+        await asyncio.sleep(0.01)
+        return {"endpoint": endpoint}
+
+
+def concurrently(n, fn):
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestCoalescingTransport(TestCase):
+    def test_merges_identical_gets(self):
+        inner = SlowTransport()
+        transport = CoalescingTransport(inner)
+        url = "http://clob" + GET_ORDER_BOOK + "?token_id=1"
+
+        results, errors = concurrently(8, lambda: transport.get(url))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [{"endpoint": url}] * 8)
+        self.assertEqual(len(inner.requests), 1)
+
+        # nothing in flight and no ttl, the next call goes out
+        transport.get(url)
+        self.assertEqual(len(inner.requests), 2)
+
+    def test_authenticated_gets_are_not_merged(self):
+        inner = SlowTransport()
+        transport = CoalescingTransport(inner)
+
+        concurrently(4, lambda: transport.get("http://clob/data/orders", {"k": "v"}))
+        self.assertEqual(len(inner.requests), 4)
+
+        self.assertEqual(transport.post("http://clob/order", data={"a": 1}), {"a": 1})
+
+    def test_errors_reach_every_caller(self):
+        inner = SlowTransport(error=PolyApiException(error_msg="down"))
+        transport = CoalescingTransport(inner)
+
+        results, errors = concurrently(4, lambda: transport.get("http://clob/price"))
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(len(inner.requests), 1)
+
+    def test_ttl(self):
+        inner = SlowTransport(delay=0)
+        transport = CoalescingTransport(inner, ttls={GET_TICK_SIZE: 0.2})
+        tick_size = "http://clob" + GET_TICK_SIZE + "?token_id=1"
+        book = "http://clob" + GET_ORDER_BOOK + "?token_id=1"
+
+        transport.get(tick_size)
+        transport.get(tick_size)
+        transport.get(book)
+        transport.get(book)
+        self.assertEqual(
+            [endpoint for endpoint, _ in inner.requests], [tick_size, book, book]
+        )
+
+        time.sleep(0.25)
+        transport.get(tick_size)
+        self.assertEqual(len(inner.requests), 4)
+
+    def test_async(self):
+        inner = AsyncSlowTransport()
+        transport = AsyncCoalescingTransport(inner)
+
+        async def main():
+            return await asyncio.gather(
+                *[transport.get("http://clob/midpoint?token_id=1") for _ in range(8)],
+                transport.get("http://clob/midpoint?token_id=2"),
+            )
+
+        results = asyncio.run(main())
+        self.assertEqual(len(results), 9)
+        self.assertEqual(results[0], {"endpoint": "http://clob/midpoint?token_id=1"})
+        self.assertEqual(len(inner.requests), 2)
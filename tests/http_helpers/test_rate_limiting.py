@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+
+from py_clob_client.http_helpers.rate_limiting import (
+    AUTH_GROUP,
+    CANCEL_GROUP,
+    DATA_GROUP,
+    ORDER_GROUP,
+    AsyncRateLimitedTransport,
+    AsyncRateLimiter,
+    RateLimitedTransport,
+    RateLimiter,
+    endpoint_group,
+)
+
+
+class RecordingTransport:
+    def __init__(self):
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def _record(self, method, endpoint):
+        with self.lock:
+            self.requests.append((method, endpoint))
+        return {}
+
+    def get(self, endpoint, headers=None, data=None):
+        return self._record("GET", endpoint)
+
+    def post(self, endpoint, headers=None, data=None):
+        return self._record("POST", endpoint)
+
+    def delete(self, endpoint, headers=None, data=None):
+        return self._record("DELETE", endpoint)
+
+
+class TestRateLimiter(TestCase):
+    def test_endpoint_group(self):
+        self.assertEqual(
+            endpoint_group("GET", "http://clob/book?token_id=1"), DATA_GROUP
+        )
+        self.assertEqual(endpoint_group("POST", "http://clob/books"), DATA_GROUP)
+        self.assertEqual(endpoint_group("POST", "http://clob/order"), ORDER_GROUP)
+        self.assertEqual(endpoint_group("POST", "http://clob/orders"), ORDER_GROUP)
+        self.assertEqual(endpoint_group("DELETE", "http://clob/order"), CANCEL_GROUP)
+        self.assertEqual(
+            endpoint_group("DELETE", "http://clob/cancel-all"), CANCEL_GROUP
+        )
+        self.assertEqual(endpoint_group("GET", "http://clob/auth/api-keys"), AUTH_GROUP)
+        self.assertEqual(
+            endpoint_group("DELETE", "http://clob/auth/api-key"), AUTH_GROUP
+        )
+
+    def test_queues_over_the_limit(self):
+        limiter = RateLimiter({DATA_GROUP: (100.0, 2)})
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire(DATA_GROUP)
+        # 2 from the burst, 4 more at 100 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.035)
+
+        stats = limiter.metrics()[DATA_GROUP]
+        self.assertEqual(stats.requests, 6)
+        self.assertGreater(stats.max_wait, 0)
+        self.assertAlmostEqual(stats.mean_wait, stats.total_wait / 6)
+
+        # unlimited groups go straight through
+        self.assertEqual(limiter.acquire(CANCEL_GROUP), 0.0)
+
+    def test_cancels_jump_ahead(self):
+        # one shared bucket, emptied by the first request
+        limiter = RateLimiter(limits={}, global_limit=(20.0, 1))
+        limiter.acquire(DATA_GROUP)
+
+        order = []
+
+        def acquire(group):
+            limiter.acquire(group)
+            order.append(group)
+
+        threads = [
+            threading.Thread(target=acquire, args=(DATA_GROUP,)) for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.01)
+        cancel = threading.Thread(target=acquire, args=(CANCEL_GROUP,))
+        cancel.start()
+        for thread in threads + [cancel]:
+            thread.join()
+
+        self.assertEqual(order[0], CANCEL_GROUP)
+        self.assertEqual(order[1:], [DATA_GROUP] * 3)
+
+    def test_data_bursts_dont_hold_cancels(self):
+        limiter = RateLimiter({DATA_GROUP: (1.0, 1), CANCEL_GROUP: (10.0, 1)})
+        limiter.acquire(DATA_GROUP)
+
+        waiting = threading.Thread(target=limiter.acquire, args=(DATA_GROUP,))
+        waiting.start()
+        time.sleep(0.01)
+        # the data bucket is empty for a second, the cancel doesn't wait for it
+        self.assertLess(limiter.acquire(CANCEL_GROUP), 0.5)
+        waiting.join()
+
+    def test_transport(self):
+        inner = RecordingTransport()
+        limiter = RateLimiter()
+        transport = RateLimitedTransport(inner, limiter)
+
+        transport.get("http://clob/midpoint?token_id=1")
+        transport.post("http://clob/order")
+        transport.delete("http://clob/order")
+
+        self.assertEqual(len(inner.requests), 3)
+        self.assertEqual(
+            sorted(limiter.metrics()), sorted([DATA_GROUP, ORDER_GROUP, CANCEL_GROUP])
+        )
+
+
+class AsyncRecordingTransport(RecordingTransport):
+    async def get(self, endpoint, headers=None, data=None):
+        return self._record("GET", endpoint)
+
+    async def delete(self, endpoint, headers=None, data=None):
+        return self._record("DELETE", endpoint)
+
+
+class TestAsyncRateLimiter(TestCase):
+    def test_queues_over_the_limit(self):
+        limiter = AsyncRateLimiter({DATA_GROUP: (100.0, 2)})
+
+        async def main():
+            start = time.monotonic()
+            await asyncio.gather(*[limiter.acquire(DATA_GROUP) for _ in range(6)])
+            return time.monotonic() - start
+
+        # 2 from the burst, 4 more at 100 per second
+        self.assertGreaterEqual(asyncio.run(main()), 0.035)
+        self.assertEqual(limiter.metrics()[DATA_GROUP].requests, 6)
+
+    def test_cancels_jump_ahead(self):
+        limiter = AsyncRateLimiter(limits={}, global_limit=(20.0, 1))
+        order = []
+
+        async def acquire(group):
+            await limiter.acquire(group)
+            order.append(group)
+
+        async def main():
+            await limiter.acquire(DATA_GROUP)
+            data = [asyncio.ensure_future(acquire(DATA_GROUP)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            await asyncio.gather(acquire(CANCEL_GROUP), *data)
+
+        threads = threading.active_count()
+        asyncio.run(main())
+        self.assertEqual(order, [CANCEL_GROUP] + [DATA_GROUP] * 3)
+        # waiting doesn't take a thread
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_lanes_dont_hold_each_other(self):
+        limiter = AsyncRateLimiter({DATA_GROUP: (1.0, 1), CANCEL_GROUP: (10.0, 1)})
+
+        async def main():
+            await limiter.acquire(DATA_GROUP)
+            waiting = asyncio.ensure_future(limiter.acquire(DATA_GROUP))
+            await asyncio.sleep(0.01)
+            # the data bucket is empty for a second, the cancel doesn't wait for it
+            waited = await limiter.acquire(CANCEL_GROUP)
+            waiting.cancel()
+            return waited
+
+        self.assertLess(asyncio.run(main()), 0.5)
+
+    def test_cancelled_waiters_are_skipped(self):
+        limiter = AsyncRateLimiter({DATA_GROUP: (50.0, 1)})
+
+        async def main():
+            await limiter.acquire(DATA_GROUP)
+            first = asyncio.ensure_future(limiter.acquire(DATA_GROUP))
+            second = asyncio.ensure_future(limiter.acquire(DATA_GROUP))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await asyncio.wait_for(second, 1)
+
+        self.assertLess(asyncio.run(main()), 0.5)
+
+    def test_transport(self):
+        inner = AsyncRecordingTransport()
+        limiter = AsyncRateLimiter()
+        transport = AsyncRateLimitedTransport(inner, limiter)
+
+        async def main():
+            await transport.get("http://clob/midpoint?token_id=1")
+            await transport.delete("http://clob/order")
+
+        asyncio.run(main())
+        self.assertEqual(len(inner.requests), 2)
+        self.assertEqual(sorted(limiter.metrics()), sorted([DATA_GROUP, CANCEL_GROUP]))
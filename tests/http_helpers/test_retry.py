@@ -0,0 +1,329 @@
+import asyncio
+from unittest import TestCase
+
+import requests
+
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.http_helpers.retry import (
+    LOOKUP,
+    SAFE,
+    UNSAFE,
+    AsyncRetryingTransport,
+    RetryBudget,
+    RetryingTransport,
+    RetryPolicy,
+    retry_mode,
+)
+
+
+def connection_error(cause=None) -> PolyApiException:
+    try:
+        raise PolyApiException(error_msg="Request exception!") from (
+            cause or requests.ConnectionError("reset")
+        )
+    except PolyApiException as e:
+        return e
+
+
+def status_error(status_code: int, headers: dict = None) -> PolyApiException:
+    return PolyApiException(error_msg="error", status_code=status_code, headers=headers)
+
+
+class ScriptedTransport:
+    """
+    Raises the scripted errors, then answers with the response
+    """
+
+    def __init__(self, errors: list, response=None):
+        self.errors = list(errors)
+        self.response = response
+        self.requests = []
+
+    def _request(self, method, endpoint, data):
+        self.requests.append((method, endpoint, data))
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.response
+
+    def get(self, endpoint, headers=None, data=None):
+        return self._request("GET", endpoint, data)
+
+    def post(self, endpoint, headers=None, data=None):
+        return self._request("POST", endpoint, data)
+
+    def delete(self, endpoint, headers=None, data=None):
+        return self._request("DELETE", endpoint, data)
+
+
+def policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(jitter=lambda: 0.0, **kwargs)
+
+
+def retrying(transport, order_lookup=None, **kwargs) -> RetryingTransport:
+    return RetryingTransport(
+        transport, policy(**kwargs), order_lookup, sleep=lambda _: None
+    )
+
+
+class TestRetryPolicy(TestCase):
+    def test_retry_mode(self):
+        self.assertEqual(retry_mode("GET", "http://clob/book?token_id=1"), SAFE)
+        self.assertEqual(retry_mode("DELETE", "http://clob/order"), SAFE)
+        self.assertEqual(retry_mode("POST", "http://clob/books"), SAFE)
+        self.assertEqual(retry_mode("POST", "http://clob/order"), LOOKUP)
+        self.assertEqual(retry_mode("POST", "http://clob/orders"), LOOKUP)
+        self.assertEqual(retry_mode("POST", "http://clob/auth/api-key"), UNSAFE)
+
+    def test_retryable(self):
+        p = RetryPolicy()
+        self.assertTrue(p.retryable(connection_error()))
+        self.assertTrue(p.retryable(status_error(503)))
+        self.assertTrue(p.retryable(status_error(429)))
+        self.assertFalse(p.retryable(status_error(400)))
+        self.assertFalse(p.retryable(PolyApiException(error_msg="no cause")))
+        self.assertFalse(p.retryable(ValueError()))
+
+    def test_refused(self):
+        p = RetryPolicy()
+        self.assertTrue(p.refused(status_error(429)))
+        self.assertTrue(p.refused(connection_error(requests.ConnectTimeout())))
+        self.assertFalse(p.refused(connection_error()))
+        self.assertFalse(p.refused(status_error(503)))
+
+    def test_backoff(self):
+        p = RetryPolicy(base_delay=0.1, max_delay=0.5, jitter=lambda: 1.0)
+        self.assertEqual(
+            [p.delay(retry, status_error(500)) for retry in range(1, 6)],
+            [0.1, 0.2, 0.4, 0.5, 0.5],
+        )
+        p = RetryPolicy(base_delay=0.1, jitter=lambda: 0.5)
+        self.assertEqual(p.delay(2, status_error(500)), 0.1)
+
+    def test_retry_after(self):
+        p = RetryPolicy(max_retry_after=10)
+        self.assertEqual(p.delay(1, status_error(429, {"Retry-After": "3"})), 3.0)
+        self.assertEqual(p.delay(1, status_error(503, {"Retry-After": "0"})), 0.0)
+        self.assertIsNone(p.delay(1, status_error(429, {"Retry-After": "60"})))
+        delay = p.delay(
+            1, status_error(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        )
+        self.assertEqual(delay, 0.0)
+        # only honoured for 429 and 503
+        self.assertLess(p.delay(1, status_error(500, {"Retry-After": "3"})), 1)
+
+    def test_budget(self):
+        budget = RetryBudget(ratio=0.5, reserve=2)
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+
+class TestRetryingTransport(TestCase):
+    def test_retries_gets(self):
+        transport = ScriptedTransport(
+            [connection_error(), status_error(502)], response={"mid": "0.5"}
+        )
+        self.assertEqual(
+            retrying(transport).get("http://clob/midpoint?token_id=1"), {"mid": "0.5"}
+        )
+        self.assertEqual(len(transport.requests), 3)
+
+    def test_signs_headers_again(self):
+        transport = ScriptedTransport([status_error(503)] * 2, response={})
+        signed = []
+
+        def sign_headers(endpoint, method, headers, data):
+            signed.append((endpoint, method, headers, data))
+            return {"signature": len(signed)}
+
+        t = RetryingTransport(
+            transport, policy(), sleep=lambda _: None, sign_headers=sign_headers
+        )
+        t.delete("http://clob/order", {"signature": 0}, '{"orderID":"0x1"}')
+        self.assertEqual(
+            signed,
+            [
+                ("http://clob/order", "DELETE", {"signature": 0}, '{"orderID":"0x1"}'),
+                ("http://clob/order", "DELETE", {"signature": 1}, '{"orderID":"0x1"}'),
+            ],
+        )
+
+        # requests without headers aren't signed
+        transport = ScriptedTransport([status_error(503)], response={})
+        t.transport = transport
+        t.get("http://clob/midpoint?token_id=1")
+        self.assertEqual(len(signed), 2)
+
+    def test_retries_cancels(self):
+        transport = ScriptedTransport([status_error(503)], response={"canceled": []})
+        retrying(transport).delete("http://clob/order", data={"orderID": "0x1"})
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_gives_up(self):
+        errors = [status_error(500) for _ in range(4)]
+        transport = ScriptedTransport(list(errors))
+        with self.assertRaises(PolyApiException) as cm:
+            retrying(transport, max_attempts=4).get("http://clob/time")
+        # the last error, untouched
+        self.assertIs(cm.exception, errors[-1])
+        self.assertEqual(len(transport.requests), 4)
+
+    def test_keeps_error_context(self):
+        cause = requests.ConnectionError("reset")
+        transport = ScriptedTransport([connection_error(cause)] * 4)
+        with self.assertRaises(PolyApiException) as cm:
+            retrying(transport).get("http://clob/time")
+        self.assertIs(cm.exception.__cause__, cause)
+
+    def test_does_not_retry_client_errors(self):
+        transport = ScriptedTransport([status_error(400)])
+        with self.assertRaises(PolyApiException):
+            retrying(transport).get("http://clob/time")
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_budget_stops_retries(self):
+        transport = ScriptedTransport([status_error(500)] * 10)
+        t = retrying(transport, budget=RetryBudget(ratio=0, reserve=1))
+        with self.assertRaises(PolyApiException):
+            t.get("http://clob/time")
+        # one retry from the reserve, then none left
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_unsafe_posts(self):
+        transport = ScriptedTransport([connection_error()])
+        with self.assertRaises(PolyApiException):
+            retrying(transport).post("http://clob/auth/api-key")
+        self.assertEqual(len(transport.requests), 1)
+
+        # refused by the server, safe to send again
+        transport = ScriptedTransport([status_error(429)], response={"apiKey": "k"})
+        retrying(transport).post("http://clob/auth/api-key")
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_order_post_without_lookup(self):
+        transport = ScriptedTransport([connection_error()])
+        with self.assertRaises(PolyApiException):
+            retrying(transport).post("http://clob/order", data={"order": {}})
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_order_post_not_on_the_book(self):
+        lookups = []
+
+        def lookup(order):
+            lookups.append(order)
+            return None
+
+        transport = ScriptedTransport(
+            [connection_error()], response={"success": True, "orderID": "0x1"}
+        )
+        response = retrying(transport, lookup).post(
+            "http://clob/order", data={"order": {"salt": 1}}
+        )
+        self.assertEqual(response, {"success": True, "orderID": "0x1"})
+        self.assertEqual(lookups, [{"salt": 1}])
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_order_post_on_the_book(self):
+        transport = ScriptedTransport([status_error(502)])
+        response = retrying(
+            transport, lambda order: {"id": "0x1", "status": "LIVE"}
+        ).post("http://clob/order", data={"order": {"salt": 1}})
+        self.assertEqual(
+            response,
+            {"success": True, "errorMsg": "", "orderID": "0x1", "status": "live"},
+        )
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_order_post_refused(self):
+        lookups = []
+        transport = ScriptedTransport([status_error(429)], response={"success": True})
+        retrying(transport, lookups.append).post(
+            "http://clob/order", data={"order": {}}
+        )
+        self.assertEqual(lookups, [])
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_order_post_lookup_fails(self):
+        def lookup(order):
+            raise PolyApiException(error_msg="down", status_code=500)
+
+        error = connection_error()
+        transport = ScriptedTransport([error])
+        with self.assertRaises(PolyApiException) as cm:
+            retrying(transport, lookup).post("http://clob/order", data={"order": {}})
+        self.assertIs(cm.exception, error)
+
+    def test_request_and_get_text(self):
+        transport = ScriptedTransport([status_error(503)], response={"mid": "0.5"})
+        t = retrying(transport)
+        # same argument order as HttpTransport.request
+        self.assertEqual(t.request("http://clob/midpoint", "GET"), {"mid": "0.5"})
+        self.assertEqual(transport.requests[-1][:2], ("GET", "http://clob/midpoint"))
+
+        texts = [status_error(429), connection_error(), "{}"]
+
+        def get_text(endpoint, headers=None):
+            text = texts.pop(0)
+            if isinstance(text, Exception):
+                raise text
+            return text
+
+        transport.get_text = get_text
+        self.assertEqual(t.get_text("http://clob/markets"), "{}")
+        self.assertEqual(texts, [])
+
+        # client errors aren't retried
+        texts = [status_error(400), "{}"]
+        with self.assertRaises(PolyApiException):
+            t.get_text("http://clob/markets")
+        self.assertEqual(texts, ["{}"])
+
+    def test_batch_post_partly_on_the_book(self):
+        records = {1: {"id": "0x1", "status": "LIVE"}}
+        transport = ScriptedTransport([connection_error()])
+        data = [{"order": {"salt": 1}}, {"order": {"salt": 2}}]
+        with self.assertRaises(PolyApiException):
+            retrying(transport, lambda o: records.get(o["salt"])).post(
+                "http://clob/orders", data=data
+            )
+        self.assertEqual(len(transport.requests), 1)
+
+        records[2] = {"id": "0x2", "status": "MATCHED"}
+        transport = ScriptedTransport([connection_error()])
+        response = retrying(transport, lambda o: records.get(o["salt"])).post(
+            "http://clob/orders", data=data
+        )
+        self.assertEqual(
+            [(r["orderID"], r["status"]) for r in response],
+            [("0x1", "live"), ("0x2", "matched")],
+        )
+
+
+class AsyncScriptedTransport(ScriptedTransport):
+    async def get(self, endpoint, headers=None, data=None):
+        return self._request("GET", endpoint, data)
+
+    async def post(self, endpoint, headers=None, data=None):
+        return self._request("POST", endpoint, data)
+
+
+class TestAsyncRetryingTransport(TestCase):
+    def test_retries_gets(self):
+        transport = AsyncScriptedTransport([status_error(503)], response="ok")
+        t = AsyncRetryingTransport(transport, policy())
+        self.assertEqual(asyncio.run(t.get("http://clob/time")), "ok")
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_order_post_on_the_book(self):
+        async def lookup(order):
+            return {"id": "0x1", "status": "LIVE"}
+
+        transport = AsyncScriptedTransport([connection_error()])
+        t = AsyncRetryingTransport(transport, policy(), lookup)
+        response = asyncio.run(t.post("http://clob/order", data={"order": {}}))
+        self.assertEqual(response["orderID"], "0x1")
+        self.assertEqual(len(transport.requests), 1)
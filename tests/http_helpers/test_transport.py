@@ -0,0 +1,137 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import TestCase
+
+from py_clob_client.codec import JsonCodec
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.http_helpers.transport import (
+    GET,
+    POST,
+    HttpTransport,
+    overloadHeaders,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    ports = []
+    bodies = []
+
+    def _reply(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        _Handler.ports.append(self.client_address[1])
+        if self.path == "/fail":
+            self._reply(400, {"error": "bad request"})
+        else:
+            self._reply(200, {"path": self.path})
+
+    def do_POST(self):
+        _Handler.ports.append(self.client_address[1])
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        _Handler.bodies.append(body)
+        self._reply(200, json.loads(body))
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpTransport(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), _Handler)
+        cls.host = "http://127.0.0.1:{}".format(cls.server.server_port)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_overload_headers(self):
+        headers = overloadHeaders(GET, None)
+        self.assertEqual(headers["Connection"], "keep-alive")
+        self.assertEqual(headers["Accept-Encoding"], "gzip")
+
+        headers = overloadHeaders(POST, {"POLY_API_KEY": "key"})
+        self.assertEqual(headers["POLY_API_KEY"], "key")
+        self.assertNotIn("Accept-Encoding", headers)
+
+    def test_pool_config(self):
+        transport = HttpTransport(pool_connections=2, pool_maxsize=20, timeout=5)
+        adapter = transport.session.get_adapter("https://clob.polymarket.com")
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 20)
+        self.assertEqual(transport.timeout, 5)
+        transport.close()
+
+    def test_sends_serialised_body_unchanged(self):
+        transport = HttpTransport()
+        _Handler.bodies.clear()
+
+        data = '{"q": "it\'s \u00e9", "n":1}'
+        self.assertEqual(
+            transport.post(self.host + "/b", data=data), {"q": "it's \u00e9", "n": 1}
+        )
+        self.assertEqual(_Handler.bodies, [data.encode("utf-8")])
+
+        transport.post(self.host + "/b", data={"q": 'say "hi"', "n": 1})
+        self.assertEqual(_Handler.bodies[1], b'{"q":"say \\"hi\\"","n":1}')
+        transport.close()
+
+    def test_codec(self):
+        class Codec(JsonCodec):
+            def encode(self, obj):
+                return json.dumps(dict(obj, encoded=True))
+
+            def decode(self, data):
+                return dict(json.loads(data), decoded=True)
+
+        transport = HttpTransport(codec=Codec())
+        _Handler.bodies.clear()
+
+        # used both ways
+        self.assertEqual(
+            transport.post(self.host + "/b", data={"n": 1}),
+            {"n": 1, "encoded": True, "decoded": True},
+        )
+        # serialised bodies are sent as they are
+        transport.post(self.host + "/b", data='{"n":2}')
+        self.assertEqual(_Handler.bodies[1], b'{"n":2}')
+        transport.close()
+
+    def test_connection_reuse(self):
+        transport = HttpTransport()
+        _Handler.ports.clear()
+
+        self.assertEqual(transport.get(self.host + "/a"), {"path": "/a"})
+        self.assertEqual(transport.post(self.host + "/b", data={"x": 1}), {"x": 1})
+        self.assertEqual(transport.get(self.host + "/c"), {"path": "/c"})
+
+        # all the requests were served over the same connection
+        self.assertEqual(len(_Handler.ports), 3)
+        self.assertEqual(len(set(_Handler.ports)), 1)
+        transport.close()
+
+    def test_error_status(self):
+        transport = HttpTransport()
+        with self.assertRaises(PolyApiException) as ctx:
+            transport.get(self.host + "/fail")
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertEqual(ctx.exception.error_msg, {"error": "bad request"})
+        transport.close()
+
+    def test_get_text(self):
+        transport = HttpTransport()
+        self.assertEqual(transport.get_text(self.host + "/a"), '{"path": "/a"}')
+        with self.assertRaises(PolyApiException):
+            transport.get_text(self.host + "/fail")
+        transport.close()
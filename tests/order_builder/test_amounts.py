@@ -0,0 +1,168 @@
+from fractions import Fraction
+from math import ceil, floor
+from unittest import TestCase
+
+from py_clob_client.order_builder.builder import OrderBuilder, ROUNDING_CONFIG
+from py_clob_client.order_builder.constants import BUY, SELL
+from py_clob_client.order_builder.helpers import (
+    decimal_places,
+    round_down,
+    round_normal,
+    round_up,
+    to_token_decimals,
+)
+from py_clob_client.signer import Signer
+from py_clob_client.constants import AMOY
+
+# publicly known private key
+private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+signer = Signer(private_key=private_key, chain_id=AMOY)
+
+
+def float_round_amount(raw_amt: float, round_config) -> float:
+    if decimal_places(raw_amt) > round_config.amount:
+        raw_amt = round_up(raw_amt, round_config.amount + 4)
+        if decimal_places(raw_amt) > round_config.amount:
+            raw_amt = round_down(raw_amt, round_config.amount)
+    return raw_amt
+
+
+def float_order_amounts(side, size, price, round_config):
+    """
+    The float and Decimal implementation the fixed point one replaced
+    """
+    raw_price = round_normal(price, round_config.price)
+    raw_size = round_down(size, round_config.size)
+    raw_amt = float_round_amount(raw_size * raw_price, round_config)
+    if side == BUY:
+        return 0, to_token_decimals(raw_amt), to_token_decimals(raw_size)
+    return 1, to_token_decimals(raw_size), to_token_decimals(raw_amt)
+
+
+def float_market_order_amounts(side, amount, price, round_config):
+    raw_price = round_normal(price, round_config.price)
+    raw_maker_amt = round_down(amount, round_config.size)
+    if side == BUY:
+        raw_taker_amt = float_round_amount(raw_maker_amt / raw_price, round_config)
+    else:
+        raw_taker_amt = float_round_amount(raw_maker_amt * raw_price, round_config)
+    return (
+        0 if side == BUY else 1,
+        to_token_decimals(raw_maker_amt),
+        to_token_decimals(raw_taker_amt),
+    )
+
+
+def exact_amount(value: Fraction, round_config) -> int:
+    """
+    Rounds an exact raw amount the way the builder does, in token decimals
+    """
+    rounded_up = Fraction(ceil(value * 10 ** (round_config.amount + 4)))
+    rounded_down = floor(rounded_up / 10**4)
+    return rounded_down * 10 ** (6 - round_config.amount)
+
+
+def exact_market_buy_taker_amount(amount, price, round_config) -> int:
+    raw_price = Fraction(round(price * 10**round_config.price), 10**round_config.price)
+    raw_maker_amt = Fraction(
+        floor(amount * 10**round_config.size), 10**round_config.size
+    )
+    return exact_amount(raw_maker_amt / raw_price, round_config)
+
+
+def price_grid(tick_size: str) -> list[float]:
+    tick = float(tick_size)
+    prices = []
+    # accumulated steps, so the grid carries the usual float noise
+    price = tick
+    while price <= 1:
+        prices.append(price)
+        price = price + tick
+    prices += [round(i * tick, 4) for i in range(1, round(1 / tick))]
+    step = max(1, len(prices) // 200)
+    return prices[::step]
+
+
+def size_grid() -> list[float]:
+    sizes = []
+    size = 0.01
+    while size <= 1000:
+        sizes.append(size)
+        size = size + 0.01
+    sizes = sizes[::811]
+    sizes += [i / 100 for i in range(1, 100001, 997)]
+    sizes += [0.01, 0.1, 0.29, 0.57, 1, 5.15, 15, 21.04, 949.9971, 999.99, 1000]
+    return sizes
+
+
+class TestFixedPointAmounts(TestCase):
+    def test_get_order_amounts_matches_float(self):
+        builder = OrderBuilder(signer)
+        sizes = size_grid()
+
+        for tick_size, round_config in ROUNDING_CONFIG.items():
+            for price in price_grid(tick_size):
+                for size in sizes:
+                    for side in (BUY, SELL):
+                        self.assertEqual(
+                            builder.get_order_amounts(side, size, price, round_config),
+                            float_order_amounts(side, size, price, round_config),
+                            (side, size, price, tick_size),
+                        )
+
+    def test_get_market_order_amounts_matches_float(self):
+        builder = OrderBuilder(signer)
+        amounts = size_grid()
+
+        for tick_size, round_config in ROUNDING_CONFIG.items():
+            for price in price_grid(tick_size):
+                for amount in amounts:
+                    self.assertEqual(
+                        builder.get_market_order_amounts(
+                            SELL, amount, price, round_config
+                        ),
+                        float_market_order_amounts(SELL, amount, price, round_config),
+                        (SELL, amount, price, tick_size),
+                    )
+
+                    fixed = builder.get_market_order_amounts(
+                        BUY, amount, price, round_config
+                    )
+                    expected = float_market_order_amounts(
+                        BUY, amount, price, round_config
+                    )
+                    if fixed != expected:
+                        # large quotients lose precision as floats, e.g.
+                        # 722.16 / 0.0015 gives 481439.99999999994 instead of 481440
+                        self.assertEqual(fixed[:2], expected[:2])
+                        self.assertEqual(
+                            fixed[2],
+                            exact_market_buy_taker_amount(amount, price, round_config),
+                            (BUY, amount, price, tick_size),
+                        )
+
+    def test_known_amounts(self):
+        builder = OrderBuilder(signer)
+        round_config = ROUNDING_CONFIG["0.01"]
+
+        self.assertEqual(
+            builder.get_order_amounts(BUY, 15, 0.24, round_config),
+            (0, 3600000, 15000000),
+        )
+        self.assertEqual(
+            builder.get_order_amounts(SELL, 21.04, 0.56, round_config),
+            (1, 21040000, 11782400),
+        )
+        self.assertEqual(
+            builder.get_market_order_amounts(BUY, 100, 0.3, round_config),
+            (0, 100000000, 333333300),
+        )
+        self.assertEqual(
+            builder.get_market_order_amounts(
+                BUY, 722.16, 0.0015, ROUNDING_CONFIG["0.0001"]
+            ),
+            (0, 722160000, 481440000000),
+        )
+
+        with self.assertRaises(ValueError):
+            builder.get_order_amounts("HOLD", 15, 0.24, round_config)
@@ -6,6 +6,7 @@ from py_clob_client.clob_types import (
     CreateOrderOptions,
     OrderSummary,
 )
+from py_clob_client.config import get_contract_config
 from py_clob_client.constants import AMOY
 from py_clob_client.order_builder.constants import BUY, SELL
 
@@ -3299,3 +3300,56 @@ class TestOrderBuilder(TestCase):
             / float(signed_order.order["makerAmount"]),
             0.0056,
         )
+
+    def test_order_builders_are_reused(self):
+        builder = OrderBuilder(signer)
+
+        exchange = builder._get_order_builder(False)
+        neg_risk_exchange = builder._get_order_builder(True)
+        self.assertIs(builder._get_order_builder(False), exchange)
+        self.assertIs(builder._get_order_builder(True), neg_risk_exchange)
+        self.assertIs(exchange.signer, neg_risk_exchange.signer)
+        self.assertEqual(
+            exchange.contract_address, get_contract_config(chain_id).exchange
+        )
+        self.assertEqual(
+            neg_risk_exchange.contract_address,
+            get_contract_config(chain_id, True).exchange,
+        )
+
+    def test_create_orders(self):
+        orders_args = [
+            OrderArgs(token_id="123", price=0.01 * i, size=10 + i, side=BUY)
+            for i in range(1, 21)
+        ]
+        options = [
+            CreateOrderOptions(tick_size="0.01", neg_risk=i % 2 == 0)
+            for i in range(1, 21)
+        ]
+
+        for builder in (OrderBuilder(signer), OrderBuilder(signer, signing_workers=2)):
+            signed_orders = builder.create_orders(orders_args, options)
+            builder.close()
+
+            self.assertEqual(len(signed_orders), len(orders_args))
+            for order_args, opts, signed_order in zip(
+                orders_args, options, signed_orders
+            ):
+                # returned in input order
+                self.assertEqual(
+                    signed_order.order["makerAmount"],
+                    round(order_args.price * order_args.size * 10**6),
+                )
+                self.assertEqual(
+                    signed_order.order["takerAmount"], order_args.size * 10**6
+                )
+                # signed for the right exchange
+                self.assertEqual(
+                    signed_order.signature,
+                    builder._get_order_builder(opts.neg_risk).build_order_signature(
+                        signed_order.order
+                    ),
+                )
+
+        with self.assertRaises(ValueError):
+            OrderBuilder(signer).create_orders(orders_args, options[1:])
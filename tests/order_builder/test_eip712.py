@@ -0,0 +1,142 @@
+from unittest import TestCase, mock
+
+from eth_keys import keys
+from eth_keys.exceptions import BadSignature
+from py_order_utils.builders import OrderBuilder as UtilsOrderBuilder
+from py_order_utils.model import (
+    BUY as UtilsBuy,
+    SELL as UtilsSell,
+    EOA,
+    POLY_GNOSIS_SAFE,
+    OrderData,
+)
+from py_order_utils.signer import Signer as UtilsSigner
+
+from py_clob_client.config import get_contract_config
+from py_clob_client.constants import AMOY, POLYGON, ZERO_ADDRESS
+from py_clob_client.order_builder.eip712 import (
+    FastOrderBuilder,
+    get_exchange_domain_separator,
+    hash_order,
+    order_digest,
+    signed_order_hash,
+)
+
+# publicly known private key
+private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+signer = UtilsSigner(key=private_key)
+
+
+def order_data(**kwargs) -> OrderData:
+    data = dict(
+        maker=signer.address(),
+        taker=ZERO_ADDRESS,
+        tokenId="1234",
+        makerAmount="100000000",
+        takerAmount="50000000",
+        side=UtilsBuy,
+        feeRateBps="100",
+        nonce="0",
+        signer=signer.address(),
+        expiration="0",
+        signatureType=EOA,
+    )
+    data.update(kwargs)
+    return OrderData(**data)
+
+
+class TestEIP712(TestCase):
+    def test_golden_vector(self):
+        exchange = get_contract_config(AMOY).exchange
+        builder = FastOrderBuilder(
+            exchange, AMOY, signer, salt_generator=lambda: 479249096354
+        )
+        signed_order = builder.build_signed_order(order_data())
+        self.assertEqual(
+            signed_order.signature,
+            "0x302cd9abd0b5fcaa202a344437ec0b6660da984e24ae9ad915a592a90facf5a51bb8a873cd8d270f070217fea1986531d5eec66f1162a81f66e026db653bf7ce1c",
+        )
+
+    def test_matches_build_signed_order(self):
+        orders = [
+            order_data(),
+            order_data(side=UtilsSell, makerAmount="1", takerAmount="1"),
+            order_data(
+                maker="0x0000000000000000000000000000000000000001",
+                taker="0x70997970C51812dc3A010C7d01b50e0d17dc79C8",
+                tokenId=str(2**256 - 1),
+                makerAmount="999999999999",
+                takerAmount="1000001",
+                feeRateBps="10000",
+                nonce="123456789",
+                expiration="1700000000",
+                signatureType=POLY_GNOSIS_SAFE,
+            ),
+        ]
+        for chain_id in (AMOY, POLYGON):
+            for neg_risk in (False, True):
+                exchange = get_contract_config(chain_id, neg_risk).exchange
+                expected = UtilsOrderBuilder(
+                    exchange, chain_id, signer, salt_generator=lambda: 12345
+                )
+                fast = FastOrderBuilder(
+                    exchange, chain_id, signer, salt_generator=lambda: 12345
+                )
+                for data in orders:
+                    order = expected.build_order(data)
+                    self.assertEqual(
+                        hash_order(order), order.hash_struct(), (chain_id, neg_risk)
+                    )
+                    self.assertEqual(
+                        fast.build_signed_order(data).signature,
+                        expected.build_signed_order(data).signature,
+                        (chain_id, neg_risk),
+                    )
+
+    def test_get_exchange_domain_separator(self):
+        exchange = get_contract_config(POLYGON, True).exchange
+        builder = UtilsOrderBuilder(exchange, POLYGON, signer)
+        self.assertEqual(
+            get_exchange_domain_separator(exchange, POLYGON),
+            builder.domain_separator.hash_struct(),
+        )
+
+    def test_signed_order_hash(self):
+        for neg_risk in (False, True):
+            exchange = get_contract_config(AMOY, neg_risk).exchange
+            builder = FastOrderBuilder(exchange, AMOY, signer)
+            signed_order = builder.build_signed_order(order_data())
+            expected = (
+                "0x"
+                + order_digest(
+                    get_exchange_domain_separator(exchange, AMOY), signed_order.order
+                ).hex()
+            )
+            self.assertEqual(signed_order_hash(signed_order.dict(), AMOY), expected)
+
+            forged = signed_order.dict()
+            forged["signer"] = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8"
+            self.assertIsNone(signed_order_hash(forged, AMOY))
+
+    def test_signed_order_hash_recovery_error(self):
+        exchange = get_contract_config(AMOY, True).exchange
+        signed_order = FastOrderBuilder(exchange, AMOY, signer).build_signed_order(
+            order_data()
+        )
+        expected = order_digest(
+            get_exchange_domain_separator(exchange, AMOY), signed_order.order
+        )
+        recover = keys.Signature.recover_public_key_from_msg_hash
+
+        def recover_neg_risk_only(signature, digest):
+            if digest != expected:
+                raise BadSignature("not on the curve")
+            return recover(signature, digest)
+
+        # failing to recover from the first exchange's digest still tries the other
+        with mock.patch.object(
+            keys.Signature, "recover_public_key_from_msg_hash", recover_neg_risk_only
+        ):
+            self.assertEqual(
+                signed_order_hash(signed_order.dict(), AMOY), "0x" + expected.hex()
+            )
@@ -1,8 +1,19 @@
 from unittest import TestCase
-from py_clob_client.constants import AMOY
+from py_clob_client.constants import AMOY, POLYGON
+
+from eth_utils import keccak
+from poly_eip712_structs import make_domain
 
 from py_clob_client.signer import Signer
-from py_clob_client.signing.eip712 import sign_clob_auth_message
+from py_clob_client.signing.eip712 import (
+    CLOB_DOMAIN_NAME,
+    CLOB_VERSION,
+    MSG_TO_SIGN,
+    get_clob_auth_domain,
+    get_clob_auth_domain_separator,
+    sign_clob_auth_message,
+)
+from py_clob_client.signing.model import ClobAuth
 
 # publicly known private key
 private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
@@ -10,6 +21,16 @@ chain_id = AMOY
 signer = Signer(private_key=private_key, chain_id=chain_id)
 
 
+class CountingSigner(Signer):
+    def __init__(self, private_key: str, chain_id: int):
+        super().__init__(private_key, chain_id)
+        self.signatures = 0
+
+    def sign(self, message_hash):
+        self.signatures += 1
+        return super().sign(message_hash)
+
+
 class TestEIP712(TestCase):
     def test_sign_clob_auth_message(self):
         signature = sign_clob_auth_message(signer, 10000000, 23)
@@ -18,3 +39,38 @@ class TestEIP712(TestCase):
             signature,
             "0xf62319a987514da40e57e2f4d7529f7bac38f0355bd88bb5adbb3768d80de6c1682518e0af677d5260366425f4361e7b70c25ae232aff0ab2331e2b164a1aedc1b",
         )
+
+    def test_clob_auth_domain(self):
+        for chain in (AMOY, POLYGON):
+            domain = make_domain(
+                name=CLOB_DOMAIN_NAME, version=CLOB_VERSION, chainId=chain
+            )
+            self.assertIs(get_clob_auth_domain(chain), get_clob_auth_domain(chain))
+            self.assertEqual(
+                get_clob_auth_domain_separator(chain), domain.hash_struct()
+            )
+
+    def test_matches_signable_bytes(self):
+        polygon_signer = Signer(private_key=private_key, chain_id=POLYGON)
+        message = ClobAuth(
+            address=polygon_signer.address(),
+            timestamp="1700000000",
+            nonce=7,
+            message=MSG_TO_SIGN,
+        )
+        digest = keccak(message.signable_bytes(get_clob_auth_domain(POLYGON)))
+        self.assertEqual(
+            sign_clob_auth_message(polygon_signer, 1700000000, 7),
+            "0x" + polygon_signer.sign("0x" + digest.hex()),
+        )
+
+    def test_signatures_are_cached(self):
+        counting = CountingSigner(private_key, chain_id)
+        first = sign_clob_auth_message(counting, 1800000000, 1)
+        self.assertEqual(sign_clob_auth_message(counting, 1800000000, 1), first)
+        self.assertEqual(counting.signatures, 1)
+
+        # another second or nonce is signed again
+        self.assertNotEqual(sign_clob_auth_message(counting, 1800000001, 1), first)
+        self.assertNotEqual(sign_clob_auth_message(counting, 1800000000, 2), first)
+        self.assertEqual(counting.signatures, 3)
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from py_clob_client.signing.hmac import build_hmac_signature
+from py_clob_client.signing.hmac import HmacSigner, build_hmac_signature
 
 
 class TestHMAC(TestCase):
@@ -17,3 +17,20 @@ class TestHMAC(TestCase):
             signature,
             "ZwAdJKvoYRlEKDkNMwd5BuwNNtg93kNaR_oU2HrfVvc=",
         )
+
+    def test_hmac_signer(self):
+        signer = HmacSigner("AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=")
+        for _ in range(2):
+            self.assertEqual(
+                signer.sign("1000000", "test-sign", "/orders", '{"hash": "0x123"}'),
+                "ZwAdJKvoYRlEKDkNMwd5BuwNNtg93kNaR_oU2HrfVvc=",
+            )
+        self.assertEqual(
+            signer.sign("1000000", "GET", "/orders"),
+            build_hmac_signature(
+                "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=",
+                "1000000",
+                "GET",
+                "/orders",
+            ),
+        )
@@ -0,0 +1,243 @@
+import json
+from unittest import IsolatedAsyncioTestCase
+
+from aiohttp import web
+
+from py_clob_client.async_client import AsyncClobClient
+from py_clob_client.clob_types import ApiCreds, BookParams, OrderArgs, TradeParams
+from py_clob_client.constants import AMOY, END_CURSOR
+from py_clob_client.exceptions import PolyApiException, PolyException
+from py_clob_client.headers.headers import POLY_API_KEY, POLY_SIGNATURE
+from py_clob_client.http_helpers.async_transport import AsyncHttpTransport
+from py_clob_client.order_builder.constants import BUY
+
+from tests.helpers import AsyncFakeTransport as FakeTransport
+
+# publicly known private key
+private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+chain_id = AMOY
+
+creds = ApiCreds(
+    api_key="000000000-0000-0000-0000-000000000000",
+    api_passphrase="aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+    api_secret="AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=",
+)
+
+raw_book = {
+    "market": "0xaabbcc",
+    "asset_id": "100",
+    "timestamp": "123456789",
+    "bids": [{"price": "0.3", "size": "100"}],
+    "asks": [{"price": "0.6", "size": "100"}],
+    "hash": "",
+}
+
+
+class TestAsyncClobClient(IsolatedAsyncioTestCase):
+    async def test_get_order_book(self):
+        transport = FakeTransport([raw_book])
+        async with AsyncClobClient("http://clob/", transport=transport) as client:
+            book = await client.get_order_book("100")
+
+        self.assertEqual(transport.requests[0][1], "http://clob/book?token_id=100")
+        self.assertEqual(book.asset_id, "100")
+        self.assertEqual(book.bids[0].price, "0.3")
+        self.assertEqual(book.asks[0].size, "100")
+
+    async def test_get_order_books(self):
+        transport = FakeTransport([[raw_book, raw_book]])
+        client = AsyncClobClient("http://clob", transport=transport)
+        books = await client.get_order_books(
+            [BookParams(token_id="100"), BookParams(token_id="100")]
+        )
+
+        self.assertEqual(len(books), 2)
+        self.assertEqual(transport.requests[0][0], "POST")
+        self.assertEqual(transport.requests[0][3], [{"token_id": "100"}] * 2)
+
+    async def test_auth_levels(self):
+        client = AsyncClobClient("http://clob", transport=FakeTransport([]))
+        with self.assertRaises(PolyException):
+            await client.create_api_key()
+
+        client = AsyncClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            transport=FakeTransport([]),
+        )
+        with self.assertRaises(PolyException):
+            await client.get_trades()
+
+    async def test_get_trades_paginates(self):
+        transport = FakeTransport(
+            [
+                {"data": [{"id": "1"}, {"id": "2"}], "next_cursor": "MQ=="},
+                {"data": [{"id": "3"}], "next_cursor": END_CURSOR},
+            ]
+        )
+        client = AsyncClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+        )
+        trades = await client.get_trades(TradeParams(market="0xaabbcc"))
+
+        self.assertEqual([t["id"] for t in trades], ["1", "2", "3"])
+        self.assertEqual(len(transport.requests), 2)
+        self.assertTrue(transport.requests[1][1].endswith("next_cursor=MQ=="))
+        self.assertEqual(transport.requests[0][2][POLY_API_KEY], creds.api_key)
+
+    async def test_iter_markets_typed(self):
+        transport = FakeTransport(
+            [
+                {
+                    "data": [{"condition_id": "a", "minimum_tick_size": 0.01}],
+                    "next_cursor": "MQ==",
+                },
+                {"data": [{"condition_id": "b"}], "next_cursor": END_CURSOR},
+            ]
+        )
+        client = AsyncClobClient("http://clob", transport=transport)
+        markets = [m async for m in client.iter_markets(typed=True)]
+
+        self.assertEqual([m.condition_id for m in markets], ["a", "b"])
+        self.assertEqual(markets[0].minimum_tick_size, 0.01)
+
+    async def test_iter_orders_prefetch(self):
+        transport = FakeTransport(
+            [
+                {"data": [{"id": "1"}], "next_cursor": "MQ=="},
+                {"data": [{"id": "2"}], "next_cursor": END_CURSOR},
+            ]
+        )
+        client = AsyncClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+        )
+        orders = [order["id"] async for order in client.iter_orders(prefetch=True)]
+
+        self.assertEqual(orders, ["1", "2"])
+        self.assertEqual(
+            [request[1] for request in transport.requests],
+            [
+                "http://clob/data/orders?next_cursor=MA==",
+                "http://clob/data/orders?next_cursor=MQ==",
+            ],
+        )
+
+    async def test_create_and_post_order(self):
+        transport = FakeTransport(
+            [
+                {"minimum_tick_size": 0.01},
+                {"neg_risk": False},
+                {"success": True},
+            ]
+        )
+        client = AsyncClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+        )
+        resp = await client.create_and_post_order(
+            OrderArgs(token_id="100", price=0.5, size=10, side=BUY)
+        )
+
+        self.assertEqual(resp, {"success": True})
+        method, endpoint, headers, data = transport.requests[2]
+        self.assertEqual(method, "POST")
+        self.assertEqual(endpoint, "http://clob/order")
+        self.assertIsNotNone(headers[POLY_SIGNATURE])
+        body = json.loads(data)
+        self.assertEqual(body["owner"], creds.api_key)
+        self.assertEqual(body["order"]["makerAmount"], "5000000")
+        self.assertEqual(body["order"]["takerAmount"], "10000000")
+
+        # tick size and neg risk are cached
+        await client.create_order(
+            OrderArgs(token_id="100", price=0.5, size=10, side=BUY)
+        )
+        self.assertEqual(len(transport.requests), 3)
+
+    async def test_create_and_post_orders(self):
+        transport = FakeTransport(
+            [
+                {"minimum_tick_size": 0.01},
+                {"neg_risk": False},
+                [{"success": True}] * 2,
+            ]
+        )
+        client = AsyncClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+        )
+        resp = await client.create_and_post_orders(
+            [OrderArgs(token_id="100", price=0.5, size=i, side=BUY) for i in (1, 2)]
+        )
+
+        self.assertEqual(resp, [{"success": True}] * 2)
+        method, endpoint, _, data = transport.requests[2]
+        self.assertEqual(endpoint, "http://clob/orders")
+        body = json.loads(data)
+        self.assertEqual(
+            [order["order"]["takerAmount"] for order in body], ["1000000", "2000000"]
+        )
+
+
+class TestAsyncHttpTransport(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def ok(request):
+            return web.json_response({"method": request.method})
+
+        async def fail(request):
+            return web.json_response({"error": "bad request"}, status=400)
+
+        app = web.Application()
+        app.router.add_get("/ok", ok)
+        app.router.add_post("/ok", ok)
+        app.router.add_get("/fail", fail)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.host = "http://127.0.0.1:{}".format(port)
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    async def test_request(self):
+        transport = AsyncHttpTransport()
+        self.assertEqual(await transport.get(self.host + "/ok"), {"method": "GET"})
+        self.assertEqual(
+            await transport.post(self.host + "/ok", data={"a": 1}), {"method": "POST"}
+        )
+
+        with self.assertRaises(PolyApiException) as ctx:
+            await transport.get(self.host + "/fail")
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertEqual(ctx.exception.error_msg, {"error": "bad request"})
+
+        await transport.close()
+
+    async def test_get_text(self):
+        transport = AsyncHttpTransport()
+        self.assertEqual(
+            await transport.get_text(self.host + "/ok"), '{"method": "GET"}'
+        )
+        with self.assertRaises(PolyApiException) as ctx:
+            await transport.get_text(self.host + "/fail")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+        await transport.close()
@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+from py_clob_client.book_analytics import BookAnalytics
+from py_clob_client.order_book import BookSide, OrderBook
+from py_clob_client.order_builder.constants import BUY, SELL
+
+
+def walk_worst_price(levels, side, amount):
+    """
+    Level by level walk, best first, the way the market price has been computed
+    """
+    total = 0
+    for price, size in levels:
+        total += size * price if side == BUY else size
+        if total >= amount:
+            return price
+    return None
+
+
+class TestBookAnalytics(TestCase):
+    def setUp(self):
+        self.book = OrderBook(
+            market="0xaabbcc",
+            asset_id="100",
+            bids=BookSide.from_levels(
+                [(0.48, 100), (0.5, 50), (0.47, 200), (0.45, 300)], True
+            ),
+            asks=BookSide.from_levels(
+                [(0.52, 100), (0.53, 150), (0.55, 400), (0.6, 1000)], False
+            ),
+        )
+        self.analytics = BookAnalytics(self.book)
+
+    def test_worst_price(self):
+        # asks notionals: 52, 79.5, 220, 600
+        self.assertEqual(self.analytics.worst_price(BUY, 10), 0.52)
+        self.assertEqual(self.analytics.worst_price(BUY, 52), 0.52)
+        self.assertEqual(self.analytics.worst_price(BUY, 53), 0.53)
+        self.assertEqual(self.analytics.worst_price(BUY, 400), 0.6)
+        # bids sizes: 50, 150, 350, 650
+        self.assertEqual(self.analytics.worst_price(SELL, 50), 0.5)
+        self.assertEqual(self.analytics.worst_price(SELL, 51), 0.48)
+        self.assertEqual(self.analytics.worst_price(SELL, 650), 0.45)
+
+        with self.assertRaises(Exception):
+            self.analytics.worst_price(SELL, 651)
+        with self.assertRaises(ValueError):
+            self.analytics.worst_price("HOLD", 1)
+
+    def test_worst_prices_match_walk(self):
+        amounts = [i * 0.5 for i in range(0, 2000)]
+        for side, levels in ((BUY, self.book.asks), (SELL, self.book.bids)):
+            self.assertEqual(
+                self.analytics.worst_prices(side, amounts),
+                [walk_worst_price(levels, side, amount) for amount in amounts],
+                side,
+            )
+
+    def test_vwap(self):
+        # 52 at 0.52 buys 100, 26.5 at 0.53 buys 50
+        self.assertAlmostEqual(self.analytics.vwap(BUY, 78.5), 78.5 / 150)
+        self.assertAlmostEqual(self.analytics.vwap(BUY, 26), 0.52)
+        # 50 at 0.5, 100 at 0.48, 50 at 0.47
+        self.assertAlmostEqual(self.analytics.vwap(SELL, 200), 96.5 / 200)
+        self.assertEqual(
+            self.analytics.vwaps(SELL, [0, 10000]),
+            [None, None],
+        )
+
+    def test_sizes_within(self):
+        self.assertEqual(
+            self.analytics.sizes_within(BUY, [0, 1, 2, 3, 8, 100], "0.01"),
+            [100, 250, 250, 650, 1650, 1650],
+        )
+        self.assertEqual(
+            self.analytics.sizes_within(SELL, [0, 1, 2, 3, 5], "0.01"),
+            [50, 50, 150, 350, 650],
+        )
+        self.assertEqual(self.analytics.size_within(SELL, 4, "0.001"), 50)
+
+        empty = BookAnalytics(OrderBook(market="0xaabbcc", asset_id="100"))
+        self.assertEqual(empty.sizes_within(BUY, [0, 5], "0.01"), [0.0, 0.0])
+        self.assertEqual(empty.worst_prices(SELL, [1]), [None])
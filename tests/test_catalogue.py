@@ -0,0 +1,63 @@
+import json
+from unittest import TestCase
+
+from py_clob_client.catalogue import MarketCatalogue
+from py_clob_client.constants import END_CURSOR
+from py_clob_client.endpoints import GET_SIMPLIFIED_MARKETS
+
+from tests.helpers import FakeTransport, market
+
+
+class FakeClient:
+    host = "http://clob"
+
+    def __init__(self, transport):
+        self.transport = transport
+
+
+class TestMarketCatalogue(TestCase):
+    def test_sync(self):
+        pages = {
+            "MA==": json.dumps(
+                {
+                    "limit": 2,
+                    "count": 2,
+                    "next_cursor": "Mg==",
+                    "data": [market("0x01", "1", "2"), market("0x02", "3", "4")],
+                }
+            ),
+            # next_cursor after the data
+            "Mg==": json.dumps(
+                {"data": [market("0x03", "5", "6")], "next_cursor": END_CURSOR}
+            ),
+        }
+        transport = FakeTransport(pages=pages)
+        catalogue = MarketCatalogue(
+            FakeClient(transport), endpoint=GET_SIMPLIFIED_MARKETS
+        )
+
+        self.assertEqual(catalogue.sync(), 3)
+        self.assertEqual(
+            transport.endpoints(),
+            [
+                "http://clob/simplified-markets?next_cursor=MA==",
+                "http://clob/simplified-markets?next_cursor=Mg==",
+            ],
+        )
+        self.assertEqual(len(catalogue), 3)
+        self.assertEqual(
+            [m["condition_id"] for m in catalogue], ["0x01", "0x02", "0x03"]
+        )
+        self.assertEqual(catalogue.get_market("0x02")["tokens"][0]["token_id"], "3")
+        self.assertEqual(catalogue.get_market_by_token("6")["condition_id"], "0x03")
+        self.assertIsNone(catalogue.get_market("0x04"))
+
+        # a new sync replaces the tables
+        transport.pages = {
+            "MA==": json.dumps(
+                {"data": [market("0x04", "7", "8")], "next_cursor": END_CURSOR}
+            )
+        }
+        self.assertEqual(catalogue.sync(), 1)
+        self.assertIsNone(catalogue.get_market_by_token("1"))
+        self.assertEqual(catalogue.get_market_by_token("8")["condition_id"], "0x04")
@@ -0,0 +1,129 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from py_clob_client.catalogue_store import CatalogueStore
+from py_clob_client.client import ClobClient
+from py_clob_client.constants import END_CURSOR
+
+from tests.helpers import FakeTransport, market
+
+
+def store_market(condition_id: str, tick_size: float, neg_risk: bool, *token_ids):
+    return market(
+        condition_id,
+        *token_ids,
+        minimum_tick_size=tick_size,
+        neg_risk=neg_risk,
+        active=True,
+        closed=False,
+    )
+
+
+class TestCatalogueStore(TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_refresh_and_warm(self):
+        transport = FakeTransport(
+            pages={
+                "MA==": {
+                    "data": [store_market("0x01", 0.01, False, "1", "2")],
+                    "next_cursor": "MQ==",
+                },
+                "MQ==": {
+                    "data": [store_market("0x02", 0.001, True, "3", "4")],
+                    "next_cursor": END_CURSOR,
+                },
+            }
+        )
+        client = ClobClient("http://clob", transport=transport)
+
+        store = CatalogueStore(self.path, client)
+        self.assertEqual(store.refresh(), 2)
+        self.assertEqual(transport.cursors(), ["MA==", "MQ=="])
+        store.close()
+
+        # a new process reopens the store without any request
+        store = CatalogueStore(self.path, client)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(sorted(m["condition_id"] for m in store), ["0x01", "0x02"])
+        self.assertEqual(store.get_market("0x02")["question"], "Question 0x02")
+        self.assertEqual(store.get_market_by_token("2")["condition_id"], "0x01")
+        self.assertIsNone(store.get_market_by_token("5"))
+        self.assertEqual(
+            store.tick_sizes(), {"1": "0.01", "2": "0.01", "3": "0.001", "4": "0.001"}
+        )
+        self.assertEqual(
+            store.neg_risk(), {"1": False, "2": False, "3": True, "4": True}
+        )
+
+        store.warm(client)
+        self.assertEqual(client.get_tick_size("3"), "0.001")
+        self.assertEqual(client.get_neg_risk("3"), True)
+
+        # incremental refresh resumes at the last page
+        transport.requests.clear()
+        transport.pages["MQ=="]["next_cursor"] = "Mg=="
+        transport.pages["Mg=="] = {
+            "data": [store_market("0x03", 0.01, False, "5", "6")],
+            "next_cursor": END_CURSOR,
+        }
+        self.assertEqual(store.refresh(), 2)
+        self.assertEqual(transport.cursors(), ["MQ==", "Mg=="])
+        self.assertEqual(len(store), 3)
+
+        transport.requests.clear()
+        store.refresh(full=True)
+        self.assertEqual(transport.cursors(), ["MA==", "MQ==", "Mg=="])
+        store.close()
+
+    def test_stale_markets(self):
+        transport = FakeTransport(
+            pages={
+                "MA==": {
+                    "data": [store_market("0x01", 0.01, False, "1")],
+                    "next_cursor": "MQ==",
+                },
+                "MQ==": {"data": [], "next_cursor": END_CURSOR},
+            }
+        )
+        client = ClobClient("http://clob", transport=transport)
+        now = [1000.0]
+        store = CatalogueStore(self.path, client, max_age=60, clock=lambda: now[0])
+        store.refresh()
+        self.assertEqual(store.tick_sizes(), {"1": "0.01"})
+
+        # the tick size changed, an incremental refresh doesn't see it
+        transport.pages["MA=="]["data"] = [store_market("0x01", 0.001, False, "1")]
+        now[0] = 1030.0
+        transport.requests.clear()
+        store.refresh()
+        self.assertEqual(transport.cursors(), ["MQ=="])
+
+        # past max_age the stored rows aren't used to warm caches
+        now[0] = 1061.0
+        self.assertEqual(store.tick_sizes(), {})
+        self.assertEqual(store.neg_risk(), {})
+
+        # and the next refresh crawls everything again
+        transport.requests.clear()
+        store.refresh()
+        self.assertEqual(transport.cursors(), ["MA==", "MQ=="])
+        self.assertEqual(store.tick_sizes(), {"1": "0.001"})
+
+        now[0] = 1100.0
+        transport.requests.clear()
+        store.refresh()
+        self.assertEqual(transport.cursors(), ["MQ=="])
+        store.close()
+
+    def test_refresh_needs_a_client(self):
+        store = CatalogueStore(self.path)
+        with self.assertRaises(Exception):
+            store.refresh()
+        store.close()
@@ -0,0 +1,338 @@
+import json
+from unittest import TestCase, mock
+
+from py_clob_client.client import ClobClient
+from py_clob_client.clock import ServerClock
+from py_clob_client.clob_types import (
+    ApiCreds,
+    OrderArgs,
+    OrderType,
+    PartialCreateOrderOptions,
+)
+from py_clob_client.constants import AMOY, END_CURSOR
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.headers.headers import (
+    L2Authenticator,
+    POLY_API_KEY,
+    POLY_SIGNATURE,
+    POLY_TIMESTAMP,
+)
+from py_clob_client.http_helpers.retry import RetryPolicy
+from py_clob_client.order_builder.constants import BUY, SELL
+from py_clob_client.signing.hmac import build_hmac_signature
+from py_clob_client.structs import OpenOrder
+
+from tests.helpers import FakeTransport
+
+# publicly known private key
+private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+chain_id = AMOY
+
+creds = ApiCreds(
+    api_key="000000000-0000-0000-0000-000000000000",
+    api_passphrase="aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+    api_secret="AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=",
+)
+
+
+class TestClobClient(TestCase):
+    def test_create_and_post_orders(self):
+        transport = FakeTransport(
+            [{"minimum_tick_size": 0.01}, [{"success": True}] * 3]
+        )
+        client = ClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+        )
+        prices = [0.5, 0.4, 0.3]
+        resp = client.create_and_post_orders(
+            [
+                OrderArgs(token_id="100", price=price, size=10, side=SELL)
+                for price in prices
+            ],
+            PartialCreateOrderOptions(tick_size="0.01", neg_risk=True),
+            OrderType.GTD,
+        )
+
+        self.assertEqual(resp, [{"success": True}] * 3)
+
+        # a single request carrying the whole batch
+        self.assertEqual(len(transport.requests), 2)
+        method, endpoint, headers, data = transport.requests[1]
+        self.assertEqual(method, "POST")
+        self.assertEqual(endpoint, "http://clob/orders")
+        self.assertEqual(headers[POLY_API_KEY], creds.api_key)
+
+        # the body is serialised once, the signed string is the one sent
+        self.assertIsInstance(data, str)
+        self.assertEqual(
+            headers[POLY_SIGNATURE],
+            build_hmac_signature(
+                creds.api_secret, headers[POLY_TIMESTAMP], "POST", "/orders", data
+            ),
+        )
+        body = json.loads(data)
+        self.assertEqual(len(body), 3)
+
+        # orders keep their input order
+        for price, order in zip(prices, body):
+            self.assertEqual(order["owner"], creds.api_key)
+            self.assertEqual(order["orderType"], OrderType.GTD)
+            self.assertEqual(order["order"]["side"], SELL)
+            self.assertEqual(
+                int(order["order"]["takerAmount"]), int(price * 10 * 10**6)
+            )
+
+    def test_post_order_retry_looks_up_order(self):
+        options = PartialCreateOrderOptions(tick_size="0.01")
+        reset = PolyApiException(error_msg="Request exception!")
+        reset.__cause__ = ConnectionResetError()
+
+        for record, expected_requests in (
+            (None, 5),
+            ({"id": "0x1", "status": "LIVE"}, 4),
+        ):
+            transport = FakeTransport(
+                [
+                    {"minimum_tick_size": 0.01},
+                    {"neg_risk": False},
+                    reset,
+                    record,
+                    {"success": True},
+                ]
+            )
+            client = ClobClient(
+                "http://clob",
+                chain_id=chain_id,
+                key=private_key,
+                creds=creds,
+                transport=transport,
+                retry_policy=RetryPolicy(jitter=lambda: 0.0),
+            )
+            order = client.create_order(
+                OrderArgs(token_id="100", price=0.5, size=10, side=BUY), options
+            )
+            resp = client.post_order(order)
+
+            self.assertEqual(len(transport.requests), expected_requests)
+            method, endpoint, _, _ = transport.requests[3]
+            self.assertEqual(method, "GET")
+            self.assertTrue(endpoint.startswith("http://clob/data/order/0x"))
+            if record is None:
+                # not on the book, posted again
+                self.assertEqual(resp, {"success": True})
+                self.assertEqual(transport.requests[4][1], "http://clob/order")
+            else:
+                self.assertEqual(resp["orderID"], "0x1")
+
+    def test_retries_are_signed_again(self):
+        transport = FakeTransport(
+            [PolyApiException(error_msg="error", status_code=503), {"apiKeys": []}]
+        )
+        times = iter(range(1000, 2000, 10))
+        client = ClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+            retry_policy=RetryPolicy(jitter=lambda: 0.0),
+            server_clock=ServerClock(clock=lambda: float(next(times))),
+        )
+        client.get_api_keys()
+
+        first, retry = (request[2] for request in transport.requests)
+        self.assertGreater(int(retry[POLY_TIMESTAMP]), int(first[POLY_TIMESTAMP]))
+        self.assertEqual(
+            retry[POLY_SIGNATURE],
+            build_hmac_signature(
+                creds.api_secret, retry[POLY_TIMESTAMP], "GET", "/auth/api-keys"
+            ),
+        )
+
+    def test_create_orders_resolves_options(self):
+        transport = FakeTransport([{"minimum_tick_size": 0.01}, {"neg_risk": False}])
+        client = ClobClient(
+            "http://clob", chain_id=chain_id, key=private_key, transport=transport
+        )
+        orders = client.create_orders(
+            [OrderArgs(token_id="100", price=0.5, size=i, side=BUY) for i in (1, 2)]
+        )
+
+        self.assertEqual(len(orders), 2)
+        self.assertEqual(orders[0].order["takerAmount"], 1000000)
+        self.assertEqual(orders[1].order["takerAmount"], 2000000)
+        # tick size and neg risk are fetched once and cached
+        self.assertEqual(len(transport.requests), 2)
+
+        with self.assertRaisesRegex(Exception, r"^price \(0.999\), min: 0.01") as cm:
+            client.create_orders(
+                [OrderArgs(token_id="100", price=0.999, size=1, side=BUY)]
+            )
+        # raised while resolving the options, before anything is signed
+        self.assertIs(type(cm.exception), Exception)
+
+    def test_iter_trades(self):
+        transport = FakeTransport(
+            [
+                {"data": [{"id": "1"}, {"id": "2"}], "next_cursor": "MQ=="},
+                {"data": [{"id": "3"}], "next_cursor": END_CURSOR},
+            ]
+        )
+        client = ClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+        )
+        trades = client.iter_trades()
+
+        # nothing is fetched until the first record is consumed
+        self.assertEqual(transport.requests, [])
+        self.assertEqual(next(trades)["id"], "1")
+        self.assertEqual(len(transport.requests), 1)
+        self.assertEqual([t["id"] for t in trades], ["2", "3"])
+        self.assertEqual(
+            [request[1] for request in transport.requests],
+            [
+                "http://clob/data/trades?next_cursor=MA==",
+                "http://clob/data/trades?next_cursor=MQ==",
+            ],
+        )
+        self.assertEqual(transport.requests[1][2][POLY_API_KEY], creds.api_key)
+
+    def test_one_l2_authenticator_per_creds(self):
+        transport = FakeTransport([{"apiKeys": []}] * 3)
+        with mock.patch(
+            "py_clob_client.client.L2Authenticator", wraps=L2Authenticator
+        ) as authenticator:
+            client = ClobClient(
+                "http://clob",
+                chain_id=chain_id,
+                key=private_key,
+                creds=creds,
+                transport=transport,
+            )
+            client.get_api_keys()
+            client.get_api_keys()
+            self.assertEqual(authenticator.call_count, 1)
+
+            other = ApiCreds(
+                api_key="other", api_secret=creds.api_secret, api_passphrase="p"
+            )
+            client.set_api_creds(other)
+            client.get_api_keys()
+            self.assertEqual(authenticator.call_count, 2)
+        self.assertEqual(transport.requests[2][2][POLY_API_KEY], "other")
+
+    def test_iter_orders_signs_every_page(self):
+        transport = FakeTransport(
+            [
+                {"data": [{"id": "1"}], "next_cursor": "MQ=="},
+                {"data": [{"id": "2"}], "next_cursor": END_CURSOR},
+            ]
+        )
+        now = [1000.0]
+        client = ClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+            server_clock=ServerClock(clock=lambda: now[0]),
+        )
+        orders = client.iter_orders()
+        now[0] = 1060.0
+        self.assertEqual(next(orders)["id"], "1")
+        now[0] = 1120.0
+        self.assertEqual(next(orders)["id"], "2")
+
+        self.assertEqual(
+            [request[2][POLY_TIMESTAMP] for request in transport.requests],
+            ["1060", "1120"],
+        )
+
+    def test_get_orders_typed(self):
+        transport = FakeTransport(
+            [
+                {
+                    "data": [{"id": "0x1", "price": "0.55", "original_size": "10"}],
+                    "next_cursor": END_CURSOR,
+                }
+            ]
+        )
+        client = ClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+        )
+        orders = client.get_orders(typed=True)
+
+        self.assertEqual(len(orders), 1)
+        self.assertIsInstance(orders[0], OpenOrder)
+        self.assertEqual(orders[0].price, 0.55)
+        self.assertEqual(orders[0].original_size, 10.0)
+
+    def test_iter_markets_prefetch(self):
+        transport = FakeTransport(
+            [
+                {"data": [{"condition_id": "a"}], "next_cursor": "MQ=="},
+                {"data": [{"condition_id": "b"}], "next_cursor": "Mg=="},
+                {"data": [], "next_cursor": END_CURSOR},
+            ]
+        )
+        client = ClobClient("http://clob", transport=transport)
+
+        markets = [m["condition_id"] for m in client.iter_markets(prefetch=True)]
+        self.assertEqual(markets, ["a", "b"])
+        self.assertEqual(len(transport.requests), 3)
+
+        with self.assertRaises(Exception):
+            client.iter_orders()
+
+    def test_warm(self):
+        transport = FakeTransport(
+            [
+                {
+                    "data": [
+                        {
+                            "condition_id": "0x01",
+                            "minimum_tick_size": 0.01,
+                            "neg_risk": False,
+                            "tokens": [{"token_id": "1"}, {"token_id": "2"}],
+                        }
+                    ],
+                    "next_cursor": "MQ==",
+                },
+                {
+                    "data": [
+                        {
+                            "condition_id": "0x02",
+                            "minimum_tick_size": 0.001,
+                            "neg_risk": True,
+                            "tokens": [{"token_id": "3"}, {"token_id": "4"}],
+                        }
+                    ],
+                    "next_cursor": "Mg==",
+                },
+                {"data": [], "next_cursor": END_CURSOR},
+            ]
+        )
+        client = ClobClient("http://clob", transport=transport)
+
+        # 5 is in no market, so the whole listing is crawled
+        self.assertEqual(client.warm(["1", "3", "5"]), 2)
+        self.assertEqual(len(transport.requests), 3)
+        self.assertEqual(client.get_tick_size("1"), "0.01")
+        self.assertEqual(client.get_tick_size("3"), "0.001")
+        self.assertEqual(client.get_neg_risk("3"), True)
+
+        transport.responses.append({"minimum_tick_size": 0.1})
+        self.assertEqual(client.get_tick_size("5"), "0.1")
+        self.assertEqual(client.get_tick_size("5"), "0.1")
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+from unittest import TestCase
+
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import ApiCreds, RequestArgs
+from py_clob_client.clock import ServerClock
+from py_clob_client.constants import AMOY
+from py_clob_client.headers.headers import (
+    POLY_TIMESTAMP,
+    create_level_1_headers,
+    create_level_2_headers,
+)
+from py_clob_client.signer import Signer
+
+from tests.helpers import FakeClock
+
+# publicly known private key
+private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+chain_id = AMOY
+
+creds = ApiCreds(
+    api_key="000000000-0000-0000-0000-000000000000",
+    api_passphrase="aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+    api_secret="AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=",
+)
+
+
+class TestServerClock(TestCase):
+    def test_offset(self):
+        local = FakeClock(1000.0)
+        clock = ServerClock(smoothing=0.5, clock=local)
+        self.assertEqual(clock.offset, 0.0)
+        self.assertEqual(clock.timestamp(), 1000)
+
+        # server 30s ahead, seen through a 0.2s round trip
+        self.assertTrue(clock.add_sample(1030, 1000.0, 1000.2))
+        self.assertAlmostEqual(clock.offset, 30.4)
+        self.assertEqual(clock.timestamp(), 1030)
+
+        # smoothed towards the next sample
+        self.assertTrue(clock.add_sample(1040, 1009.9, 1010.1))
+        self.assertAlmostEqual(clock.offset, 30.45)
+
+    def test_ignores_slow_samples(self):
+        clock = ServerClock(max_rtt=1.0)
+        self.assertFalse(clock.add_sample(1030, 1000.0, 1005.0))
+        self.assertFalse(clock.add_sample(1030, 1000.0, 999.0))
+        self.assertEqual(clock.samples, 0)
+        self.assertEqual(clock.offset, 0.0)
+
+    def test_sample(self):
+        local = FakeClock(1000.0)
+        clock = ServerClock(clock=local)
+
+        def get_server_time():
+            local.now += 0.5
+            return 900
+
+        self.assertTrue(clock.sample(get_server_time))
+        self.assertAlmostEqual(clock.offset, -99.75)
+
+        async def get_server_time_async():
+            return get_server_time()
+
+        self.assertTrue(asyncio.run(clock.sample_async(get_server_time_async)))
+        self.assertEqual(clock.samples, 2)
+
+    def test_start(self):
+        sampled = threading.Event()
+        calls = []
+
+        def get_server_time():
+            calls.append(1)
+            if len(calls) > 1:
+                sampled.set()
+            return 2000000000
+
+        clock = ServerClock()
+        clock.start(get_server_time, interval=0.01)
+        try:
+            # the first sample is taken synchronously
+            self.assertGreaterEqual(len(calls), 1)
+            self.assertEqual(clock.timestamp() // 10, 200000000)
+            self.assertTrue(sampled.wait(2))
+        finally:
+            clock.stop()
+
+    def test_start_survives_errors(self):
+        def get_server_time():
+            raise ConnectionError()
+
+        clock = ServerClock()
+        with self.assertLogs("ServerClock", level="WARNING"):
+            clock.start(get_server_time, interval=10)
+        clock.stop()
+        self.assertEqual(clock.samples, 0)
+
+    def test_headers(self):
+        signer = Signer(private_key, chain_id)
+        headers = create_level_1_headers(signer, timestamp=1234)
+        self.assertEqual(headers[POLY_TIMESTAMP], "1234")
+        headers = create_level_2_headers(
+            signer, creds, RequestArgs(method="GET", request_path="/x"), timestamp=1234
+        )
+        self.assertEqual(headers[POLY_TIMESTAMP], "1234")
+
+    def test_client_uses_server_clock(self):
+        class Transport:
+            def get(self, endpoint, headers=None, data=None):
+                self.headers = headers
+                return {}
+
+        local = FakeClock(1000.0)
+        clock = ServerClock(clock=local)
+        clock.add_sample(1500, 1000.0, 1000.0)
+
+        transport = Transport()
+        client = ClobClient(
+            "http://clob",
+            chain_id=chain_id,
+            key=private_key,
+            creds=creds,
+            transport=transport,
+            server_clock=clock,
+        )
+        client.get_api_keys()
+        self.assertEqual(transport.headers[POLY_TIMESTAMP], "1500")
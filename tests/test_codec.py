@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from py_clob_client.codec import (
+    JsonCodec,
+    OrjsonCodec,
+    get_codec,
+    serialize_body,
+    set_codec,
+)
+from py_clob_client.signing.hmac import build_hmac_signature
+
+secret = "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA="
+
+body = {
+    "order": {
+        "salt": 479249096354,
+        "maker": "0x70997970C51812dc3A010C7d01b50e0d17dc79C8",
+        "tokenId": "1234",
+        "makerAmount": "100000000",
+        "side": "BUY",
+        "signatureType": 0,
+    },
+    "owner": 'it\'s "quoted" é',
+    "orderType": "GTC",
+    "postOnly": False,
+    "price": 0.55,
+}
+
+
+class TestCodec(TestCase):
+    def test_codecs_agree(self):
+        encoded = JsonCodec().encode(body)
+        self.assertEqual(OrjsonCodec().encode(body), encoded)
+        self.assertEqual(OrjsonCodec().decode(encoded), body)
+        self.assertEqual(JsonCodec().decode(encoded.encode("utf-8")), body)
+        self.assertNotIn(": ", encoded)
+
+    def test_serialize_body(self):
+        self.assertEqual(serialize_body('{"a": 1}'), '{"a": 1}')
+        self.assertEqual(serialize_body(b'{"a": 1}'), '{"a": 1}')
+        self.assertEqual(serialize_body({"a": 1}), '{"a":1}')
+        self.assertEqual(serialize_body({"a": 1}, JsonCodec()), '{"a":1}')
+
+    def test_set_codec(self):
+        class Codec(JsonCodec):
+            def encode(self, obj):
+                return "encoded"
+
+        previous = get_codec()
+        set_codec(Codec())
+        try:
+            self.assertEqual(serialize_body({"a": 1}), "encoded")
+        finally:
+            set_codec(previous)
+
+    def test_hmac_signs_the_serialised_body(self):
+        serialized = serialize_body(body)
+        self.assertEqual(
+            build_hmac_signature(secret, "1000000", "POST", "/order", body),
+            build_hmac_signature(secret, "1000000", "POST", "/order", serialized),
+        )
@@ -0,0 +1,132 @@
+from unittest import TestCase
+
+from py_clob_client.market_search import MarketSearchIndex, tokenize
+
+from tests.helpers import market
+
+markets = [
+    market(
+        "0x01",
+        question="Will the U.S. hold a presidential election in 2024?",
+        description="Resolves YES if the election is held.",
+        tags=["Politics", "Elections"],
+        outcomes=["Yes", "No"],
+    ),
+    market(
+        "0x02",
+        question="Who wins the senate race?",
+        description="Senate majority after the elections.",
+        tags=["Politics"],
+        outcomes=["Democrats", "Republicans"],
+    ),
+    market(
+        "0x03",
+        question="Will MrBeast's video reach 100M YouTube views?",
+        description="Counts the views on YouTube.",
+        tags=["Culture"],
+        outcomes=["Yes", "No"],
+    ),
+    market(
+        "0x04",
+        question="COVID-19 cases above 1M by June?",
+        description="Per the U.S. CDC count.",
+        tags=["Health"],
+        outcomes=["Yes", "No"],
+    ),
+]
+
+
+def scan(markets, keywords):
+    """
+    The substring scan the index narrows down
+    """
+    keywords = [k.lower() for k in keywords]
+    return [
+        m["condition_id"]
+        for m in markets
+        if all(
+            k in m["question"].lower() + " " + m["description"].lower()
+            for k in keywords
+        )
+    ]
+
+
+class TestMarketSearchIndex(TestCase):
+    def setUp(self):
+        self.index = MarketSearchIndex(markets)
+
+    def ids(self, query):
+        return [m["condition_id"] for m in self.index.match(query)]
+
+    def test_tokenize(self):
+        self.assertEqual(
+            tokenize("Will the U.S. win?"), ["will", "the", "u", "s", "win"]
+        )
+        self.assertEqual(tokenize(None), [])
+
+    def test_and(self):
+        self.assertEqual(self.ids("election"), ["0x01"])
+        self.assertEqual(self.ids("Election 2024"), ["0x01"])
+        self.assertEqual(self.ids("politics senate"), ["0x02"])
+        self.assertEqual(self.ids("politics youtube"), [])
+        self.assertEqual(self.ids("u.s. election"), ["0x01"])
+
+    def test_or(self):
+        self.assertEqual(self.ids("senate OR youtube"), ["0x02", "0x03"])
+        self.assertEqual(
+            self.ids("senate OR youtube views OR 2024"), ["0x01", "0x02", "0x03"]
+        )
+        # lower case or is a term
+        self.assertEqual(self.ids("senate or youtube"), [])
+
+    def test_prefix(self):
+        self.assertEqual(self.ids("elect*"), ["0x01", "0x02"])
+        self.assertEqual(self.ids("elect* 2024"), ["0x01"])
+        self.assertEqual(self.ids("republic*"), ["0x02"])
+        self.assertEqual(self.ids("zzz*"), [])
+
+    def test_search(self):
+        results = self.index.search("yes", limit=1)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].condition_id, "0x01")
+        self.assertEqual(results[0].token_ids, ["0x01-0", "0x01-1"])
+        self.assertEqual(results[0].question, markets[0]["question"])
+
+        self.index.add(market("0x05", question="Another election?"))
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self.ids("elect*"), ["0x01", "0x02", "0x05"])
+
+    def test_match_substring_parity(self):
+        for keywords in (
+            ["election"],
+            ["lect"],
+            ["u.s."],
+            ["covid-19"],
+            ["vid"],
+            ["s senate"],
+            ["views", "youtube"],
+            ["100m youtube"],
+            ["zzz"],
+        ):
+            candidates = self.index.match_substring(" ".join(keywords))
+            self.assertEqual(
+                scan(candidates, keywords), scan(markets, keywords), keywords
+            )
+
+        # nothing to narrow by, the caller scans every market
+        self.assertIsNone(self.index.match_substring(""))
+        self.assertIsNone(self.index.match_substring("? !"))
+        self.assertEqual(
+            [m["condition_id"] for m in self.index.match_substring("lect")],
+            ["0x01", "0x02"],
+        )
+
+        # every n-gram of "tion" is in "ionxtio", but not the word
+        self.index.add(market("0x05", question="ionxtio"))
+        self.assertEqual(
+            [m["condition_id"] for m in self.index.match_substring("tion")],
+            ["0x01", "0x02"],
+        )
+        self.assertEqual(
+            [m["condition_id"] for m in self.index.match_substring("xt")], ["0x05"]
+        )
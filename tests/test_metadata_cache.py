@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+
+from py_clob_client.metadata_cache import MetadataCache
+
+from tests.helpers import FakeClock
+
+
+class TestMetadataCache(TestCase):
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = MetadataCache(ttl=10, clock=clock)
+        cache.set("1", "0.01")
+
+        clock.now = 9.9
+        self.assertEqual(cache.get("1"), "0.01")
+        self.assertIn("1", cache)
+        clock.now = 10
+        self.assertIsNone(cache.get("1"))
+        self.assertNotIn("1", cache)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = MetadataCache(maxsize=2)
+        cache.set("1", "a")
+        cache.set("2", "b")
+        # touching 1 makes 2 the least recently used
+        cache.get("1")
+        cache.set("3", "c")
+
+        self.assertEqual(cache.get("1"), "a")
+        self.assertIsNone(cache.get("2"))
+        self.assertEqual(cache.get("3"), "c")
+
+        cache.invalidate("1")
+        self.assertNotIn("1", cache)
+        cache.update({"4": "d", "5": "e"})
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_get_or_load_coalesces(self):
+        cache = MetadataCache()
+        calls = []
+
+        def loader(key):
+            calls.append(key)
+            time.sleep(0.05)
+            return "0.01"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_load("1", loader))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls, ["1"])
+        self.assertEqual(results, ["0.01"] * 8)
+
+        # a failed load isn't cached
+        def failing(key):
+            raise ValueError(key)
+
+        with self.assertRaises(ValueError):
+            cache.get_or_load("2", failing)
+        self.assertEqual(cache.get_or_load("2", lambda key: "0.001"), "0.001")
+
+    def test_get_or_load_async_coalesces(self):
+        cache = MetadataCache()
+        calls = []
+
+        async def loader(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return True
+
+        async def main():
+            return await asyncio.gather(
+                *[cache.get_or_load_async("1", loader) for _ in range(8)]
+            )
+
+        self.assertEqual(asyncio.run(main()), [True] * 8)
+        self.assertEqual(calls, ["1"])
+        self.assertEqual(cache.get("1"), True)
+
+    def test_get_or_load_async_shares_errors(self):
+        cache = MetadataCache()
+        calls = []
+
+        async def loader(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise ValueError("down")
+            return True
+
+        async def main():
+            results = await asyncio.gather(
+                *[cache.get_or_load_async("1", loader) for _ in range(4)],
+                return_exceptions=True,
+            )
+            # a failed load isn't cached, the next miss loads again
+            return results, await cache.get_or_load_async("1", loader)
+
+        results, value = asyncio.run(main())
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertIs(value, True)
+        self.assertEqual(calls, ["1", "1"])
+
+    def test_get_or_load_async_cancelled_caller(self):
+        cache = MetadataCache()
+        calls = []
+
+        async def loader(key):
+            calls.append(key)
+            await asyncio.sleep(0.02)
+            return True
+
+        async def main():
+            first = asyncio.ensure_future(cache.get_or_load_async("1", loader))
+            await asyncio.sleep(0)
+            first.cancel()
+            # still shared with the callers that came after
+            return await cache.get_or_load_async("1", loader)
+
+        self.assertIs(asyncio.run(main()), True)
+        self.assertEqual(calls, ["1"])
+        self.assertEqual(cache.get("1"), True)
+
+    def test_get_or_load_async_across_loops(self):
+        cache = MetadataCache()
+        started = threading.Event()
+        results = []
+
+        async def loader(key):
+            started.set()
+            await asyncio.sleep(0.05)
+            return True
+
+        def run():
+            results.append(asyncio.run(cache.get_or_load_async("1", loader)))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        started.wait(5)
+        # a miss in another loop while the first load is pending
+        results.append(asyncio.run(cache.get_or_load_async("1", loader)))
+        thread.join(5)
+        self.assertEqual(results, [True, True])
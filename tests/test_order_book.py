@@ -0,0 +1,99 @@
+from unittest import TestCase
+
+from py_clob_client.order_book import BookSide, OrderBook
+from py_clob_client.utilities import (
+    generate_orderbook_summary_hash,
+    parse_raw_orderbook,
+    parse_raw_orderbook_summary,
+)
+
+raw_obs = {
+    "market": "0xbd31dc8a20211944f6b70f31557f1001557b59905b7738480ca09bd4532f84af",
+    "asset_id": "52114319501245915516055106046884209969926127482827954674443846427813813222426",
+    "bids": [
+        {"price": "0.15", "size": "100"},
+        {"price": "0.31", "size": "148.56"},
+        {"price": "0.33", "size": "58"},
+        {"price": "0.5", "size": "100"},
+    ],
+    "asks": [
+        {"price": "0.9", "size": "10"},
+        {"price": "0.7", "size": "20"},
+        {"price": "0.6", "size": "30"},
+    ],
+    "hash": "9d6d9e8831a150ac4cd878f99f7b2c6d419b875f",
+    "timestamp": "123456789",
+}
+
+
+class TestOrderBook(TestCase):
+    def test_parse_raw_orderbook(self):
+        book = parse_raw_orderbook(raw_obs)
+
+        self.assertEqual(book.market, raw_obs["market"])
+        self.assertEqual(book.asset_id, raw_obs["asset_id"])
+        self.assertEqual(book.timestamp, "123456789")
+        self.assertEqual(book.hash, raw_obs["hash"])
+
+        # best first
+        self.assertEqual(list(book.bids.prices), [0.5, 0.33, 0.31, 0.15])
+        self.assertEqual(list(book.bids.sizes), [100, 58, 148.56, 100])
+        self.assertEqual(list(book.asks.prices), [0.6, 0.7, 0.9])
+        self.assertEqual(list(book.asks.sizes), [30, 20, 10])
+
+        self.assertEqual(book.best_bid, 0.5)
+        self.assertEqual(book.best_ask, 0.6)
+        self.assertAlmostEqual(book.midpoint, 0.55)
+        self.assertAlmostEqual(book.spread, 0.1)
+
+    def test_empty_book(self):
+        book = OrderBook(market="0xaabbcc", asset_id="100")
+
+        self.assertEqual(len(book.bids), 0)
+        self.assertIsNone(book.best_bid)
+        self.assertIsNone(book.best_ask)
+        self.assertIsNone(book.midpoint)
+        self.assertIsNone(book.spread)
+        self.assertEqual(list(book.asks.cumulative_sizes), [])
+
+    def test_depth_and_cumulative_sums(self):
+        book = parse_raw_orderbook(raw_obs)
+
+        self.assertEqual(list(book.asks.cumulative_sizes), [30, 50, 60])
+        notionals = list(book.asks.cumulative_notionals)
+        self.assertAlmostEqual(notionals[0], 18)
+        self.assertAlmostEqual(notionals[1], 32)
+        self.assertAlmostEqual(notionals[2], 41)
+
+        top = book.depth(2)
+        self.assertEqual(list(top.bids), [(0.5, 100), (0.33, 58)])
+        self.assertEqual(list(top.asks), [(0.6, 30), (0.7, 20)])
+        self.assertEqual(top.asset_id, book.asset_id)
+
+    def test_to_summary(self):
+        # same summary, and so same hash, as parse_raw_orderbook_summary
+        summary = OrderBook.from_raw(raw_obs, keep_raw=True).to_summary()
+        expected = parse_raw_orderbook_summary(raw_obs)
+        self.assertEqual(summary, expected)
+        self.assertEqual(
+            generate_orderbook_summary_hash(summary),
+            generate_orderbook_summary_hash(expected),
+        )
+
+        # without keep_raw the raw book isn't referenced, the summary is rebuilt
+        summary = parse_raw_orderbook(raw_obs).to_summary()
+        self.assertEqual(summary.asset_id, expected.asset_id)
+        self.assertEqual(float(summary.bids[0].price), 0.5)
+
+        # round trip through a summary
+        book = OrderBook.from_summary(expected)
+        self.assertEqual(list(book.bids.prices), [0.5, 0.33, 0.31, 0.15])
+        summary = book.to_summary()
+        self.assertEqual(summary.bids[0].price, "0.5")
+        self.assertEqual(summary.bids[0].size, "100.0")
+
+    def test_book_side_from_levels(self):
+        side = BookSide.from_levels([(0.2, 1), ("0.4", "2"), (0.3, 3)], True)
+        self.assertEqual(list(side), [(0.4, 2), (0.3, 3), (0.2, 1)])
+        self.assertEqual(side.best_price, 0.4)
+        self.assertEqual(side.best_size, 2)
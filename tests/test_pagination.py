@@ -0,0 +1,56 @@
+import asyncio
+import threading
+from unittest import TestCase
+
+from py_clob_client.constants import END_CURSOR
+from py_clob_client.pagination import aiter_records, iter_pages, iter_records
+
+pages = {
+    "MA==": {"data": [1, 2], "next_cursor": "MQ=="},
+    "MQ==": {"data": [3], "next_cursor": "Mg=="},
+    "Mg==": {"data": [4, 5], "next_cursor": END_CURSOR},
+}
+
+
+class TestPagination(TestCase):
+    def test_iter_records(self):
+        for prefetch in (False, True):
+            fetched = []
+
+            def fetch_page(cursor):
+                fetched.append(cursor)
+                return pages[cursor]
+
+            self.assertEqual(
+                list(iter_records(fetch_page, prefetch=prefetch)), [1, 2, 3, 4, 5]
+            )
+            self.assertEqual(fetched, ["MA==", "MQ==", "Mg=="])
+
+    def test_start_and_end_cursors(self):
+        self.assertEqual(list(iter_pages(pages.get, "MQ==")), [[3], [4, 5]])
+        self.assertEqual(list(iter_pages(pages.get, None)), [[1, 2], [3], [4, 5]])
+        self.assertEqual(list(iter_pages(pages.get, END_CURSOR)), [])
+
+    def test_prefetch_overlaps_consumption(self):
+        next_page_fetched = threading.Event()
+
+        def fetch_page(cursor):
+            if cursor == "MQ==":
+                next_page_fetched.set()
+            return pages[cursor]
+
+        records = iter_records(fetch_page, prefetch=True)
+        self.assertEqual(next(records), 1)
+        # the second page is fetched while the first one is being consumed
+        self.assertTrue(next_page_fetched.wait(5))
+        records.close()
+
+    def test_aiter_records(self):
+        async def fetch_page(cursor):
+            return pages[cursor]
+
+        async def collect(prefetch):
+            return [r async for r in aiter_records(fetch_page, prefetch=prefetch)]
+
+        self.assertEqual(asyncio.run(collect(False)), [1, 2, 3, 4, 5])
+        self.assertEqual(asyncio.run(collect(True)), [1, 2, 3, 4, 5])
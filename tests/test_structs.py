@@ -0,0 +1,157 @@
+import json
+from unittest import TestCase, mock
+
+import msgspec
+
+from py_clob_client import structs
+from py_clob_client.structs import (
+    Market,
+    MarketToken,
+    OpenOrder,
+    SimplifiedMarket,
+    Trade,
+    decode_list,
+    decode_order_book,
+    decode_page,
+)
+
+raw_trade = {
+    "id": "28c4d2eb-bbea-40e7-a9f0-b2fdb56b2c2e",
+    "taker_order_id": "0x06bc63e346ed4ceddce9efd6b3af37c8f8f440c92fe7da6b2d0f9e4ccbc50c42",
+    "market": "0xbd31dc8a20211944f6b70f31557f1001557b59905b7738480ca09bd4532f84af",
+    "asset_id": "52114319501245915516055106046884209969926127482827954674443846427813813222426",
+    "side": "BUY",
+    "size": "10",
+    "fee_rate_bps": "0",
+    "price": "0.57",
+    "status": "MATCHED",
+    "match_time": "1672290701",
+    "last_update": "1672290701",
+    "outcome": "YES",
+    "bucket_index": 0,
+    "owner": "9180014b-33c8-9240-a14b-bdca11c0a465",
+    "maker_address": "0x70997970C51812dc3A010C7d01b50e0d17dc79C8",
+    "maker_orders": [
+        {
+            "order_id": "0xff354cd7ca7539dfa9c28d90943ab5779a4eac34b9b37a757d7b32bdfb11790b",
+            "owner": "9180014b-33c8-9240-a14b-bdca11c0a465",
+            "maker_address": "0x70997970C51812dc3A010C7d01b50e0d17dc79C8",
+            "matched_amount": "10",
+            "price": "0.57",
+            "fee_rate_bps": "0",
+            "asset_id": "52114319501245915516055106046884209969926127482827954674443846427813813222426",
+            "outcome": "YES",
+            "side": "SELL",
+        }
+    ],
+    "transaction_hash": "0xabc",
+    "trader_side": "TAKER",
+}
+
+raw_market = {
+    "condition_id": "0xbd31",
+    "question": "Will it rain?",
+    "tokens": [
+        {"token_id": "1", "outcome": "Yes", "price": 0.6, "winner": False},
+        {"token_id": "2", "outcome": "No", "price": 0.4, "winner": False},
+    ],
+    "active": True,
+    "closed": False,
+    "minimum_order_size": 5,
+    "minimum_tick_size": 0.01,
+    "neg_risk": True,
+    "rewards": {"rates": None},
+    "unknown_field": "ignored",
+}
+
+
+class TestStructs(TestCase):
+    def test_trade(self):
+        trade = Trade.from_dict(raw_trade)
+        self.assertEqual(trade.price, 0.57)
+        self.assertEqual(trade.size, 10.0)
+        self.assertEqual(trade.match_time, 1672290701)
+        self.assertEqual(trade.maker_orders[0].matched_amount, 10.0)
+        self.assertEqual(trade.maker_orders[0].side, "SELL")
+        self.assertFalse(hasattr(trade, "__dict__"))
+
+    def test_market(self):
+        market = Market.from_dict(raw_market)
+        self.assertEqual(market.minimum_tick_size, 0.01)
+        self.assertTrue(market.neg_risk)
+        self.assertEqual(
+            market.tokens[0],
+            MarketToken(token_id="1", outcome="Yes", price=0.6, winner=False),
+        )
+        # missing keys are None
+        self.assertIsNone(market.description)
+
+        simplified = SimplifiedMarket.from_dict(raw_market)
+        self.assertEqual(simplified.rewards, {"rates": None})
+        self.assertEqual(
+            simplified.to_dict()["tokens"][1],
+            {"token_id": "2", "outcome": "No", "price": 0.4, "winner": False},
+        )
+
+    def test_empty_numbers(self):
+        order = OpenOrder.from_dict({"id": "0x1", "price": "", "expiration": "0"})
+        self.assertIsNone(order.price)
+        self.assertEqual(order.expiration, 0)
+
+    def test_string_flags(self):
+        market = Market.from_dict(
+            {"active": "false", "closed": "True", "neg_risk": "", "archived": False}
+        )
+        self.assertIs(market.active, False)
+        self.assertIs(market.closed, True)
+        self.assertIsNone(market.neg_risk)
+        self.assertIs(market.archived, False)
+        with self.assertRaises(ValueError):
+            Market.from_dict({"active": "maybe"})
+
+    def test_decode_page_from_bytes(self):
+        body = json.dumps({"data": [raw_trade], "next_cursor": "LTE="}).encode()
+        page = decode_page(body, Trade)
+        self.assertEqual(page["next_cursor"], "LTE=")
+        self.assertEqual(page["data"], [Trade.from_dict(raw_trade)])
+        self.assertEqual(
+            decode_page({"data": [], "next_cursor": "LTE="}, Trade)["data"], []
+        )
+
+    def test_decode_straight_from_bytes(self):
+        body = json.dumps({"data": [raw_trade, raw_trade], "next_cursor": "LTE="})
+        with mock.patch.object(structs, "_decoded") as decoded:
+            page = decode_page(body.encode(), Trade)
+            markets = decode_list(json.dumps([raw_market]), Market)
+        decoded.assert_not_called()
+        self.assertIsInstance(page["data"][0], msgspec.Struct)
+        self.assertEqual(page["data"], [Trade.from_dict(raw_trade)] * 2)
+        self.assertEqual(markets, [Market.from_dict(raw_market)])
+
+        # empty numbers are left to from_dict
+        body = json.dumps({"data": [{"id": "0x1", "price": ""}], "next_cursor": ""})
+        self.assertIsNone(decode_page(body, OpenOrder)["data"][0].price)
+
+    def test_without_msgspec(self):
+        with mock.patch.object(structs, "msgspec", None):
+            Order = structs._define("Order", (("id", str), ("price", structs._number)))
+            page = decode_page('{"data":[{"id":"0x1","price":"0.5"}]}', Order)
+        self.assertIsInstance(page["data"][0], structs.Struct)
+        self.assertNotIsInstance(page["data"][0], msgspec.Struct)
+        self.assertEqual(page["data"], [Order(id="0x1", price=0.5)])
+        self.assertFalse(hasattr(page["data"][0], "__dict__"))
+
+    def test_decode_list(self):
+        self.assertEqual(
+            [m.condition_id for m in decode_list(json.dumps([raw_market]), Market)],
+            ["0xbd31"],
+        )
+
+    def test_decode_order_book(self):
+        book = decode_order_book(
+            '{"market":"0x1","asset_id":"1","timestamp":"1","hash":"",'
+            '"bids":[{"price":"0.4","size":"10"},{"price":"0.45","size":"5"}],'
+            '"asks":[{"price":"0.6","size":"3"}]}'
+        )
+        self.assertEqual(book.best_bid, 0.45)
+        self.assertEqual(book.best_ask, 0.6)
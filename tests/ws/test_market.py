@@ -0,0 +1,356 @@
+import asyncio
+import json
+from unittest import TestCase
+
+from websockets.asyncio.server import serve
+
+from py_clob_client.order_book import OrderBook
+from py_clob_client.ws.connection import ChannelSubscriber
+from py_clob_client.utilities import (
+    generate_orderbook_summary_hash,
+    parse_raw_orderbook_summary,
+)
+from py_clob_client.ws.market import BookStreamer
+
+market = "0xbd31dc8a20211944f6b70f31557f1001557b59905b7738480ca09bd4532f84af"
+token_id = (
+    "52114319501245915516055106046884209969926127482827954674443846427813813222426"
+)
+
+
+def book_event(bids, asks, timestamp="100") -> dict:
+    event = {
+        "event_type": "book",
+        "market": market,
+        "asset_id": token_id,
+        "timestamp": timestamp,
+        "hash": "",
+        "bids": [{"price": p, "size": s} for p, s in bids],
+        "asks": [{"price": p, "size": s} for p, s in asks],
+    }
+    event["hash"] = server_hash(event)
+    return event
+
+
+def server_hash(raw: dict) -> str:
+    return generate_orderbook_summary_hash(parse_raw_orderbook_summary(raw))
+
+
+def bad_change(price="0.4", timestamp="101") -> dict:
+    return {
+        "event_type": "price_change",
+        "asset_id": token_id,
+        "market": market,
+        "timestamp": timestamp,
+        "hash": "not the hash",
+        "changes": [{"price": price, "size": "1", "side": "BUY"}],
+    }
+
+
+class FakeClient:
+    def __init__(self, *books):
+        self.books = list(books)
+        self.requests = []
+
+    def get_order_book(self, token_id):
+        self.requests.append(token_id)
+        book = self.books.pop(0)
+        if isinstance(book, Exception):
+            raise book
+        return parse_raw_orderbook_summary(book)
+
+
+class TestBookStreamer(TestCase):
+    def test_snapshot_and_price_changes(self):
+        updates = []
+        streamer = BookStreamer([token_id], on_update=updates.append)
+        self.assertIsNone(streamer.get_book(token_id))
+
+        streamer.handle_message(
+            json.dumps(
+                [
+                    book_event(
+                        [("0.48", "100"), ("0.5", "50")],
+                        [("0.55", "30"), ("0.52", "10")],
+                    )
+                ]
+            )
+        )
+        book = streamer.get_book(token_id)
+        self.assertEqual(list(book.bids), [(0.5, 50), (0.48, 100)])
+        self.assertEqual(list(book.asks), [(0.52, 10), (0.55, 30)])
+        self.assertEqual(streamer.hash_mismatches, 0)
+
+        # the expected book after the change, to get the server hash
+        expected = book_event(
+            [("0.48", "100"), ("0.5", "50"), ("0.51", "5")],
+            [("0.55", "30")],
+            timestamp="101",
+        )
+        streamer.handle_message(
+            json.dumps(
+                {
+                    "event_type": "price_change",
+                    "market": market,
+                    "timestamp": "101",
+                    "price_changes": [
+                        {
+                            "asset_id": token_id,
+                            "price": "0.51",
+                            "size": "5",
+                            "side": "BUY",
+                        },
+                        {
+                            "asset_id": token_id,
+                            "price": "0.52",
+                            "size": "0",
+                            "side": "SELL",
+                            "hash": expected["hash"],
+                        },
+                    ],
+                }
+            )
+        )
+        new_book = streamer.get_book(token_id)
+        self.assertIsNot(new_book, book)
+        self.assertEqual(list(new_book.bids.prices), [0.51, 0.5, 0.48])
+        self.assertEqual(list(new_book.asks.prices), [0.55])
+        self.assertEqual(
+            new_book.to_summary(), OrderBook.from_raw(expected).to_summary()
+        )
+        self.assertEqual(streamer.hash_mismatches, 0)
+        self.assertEqual(len(updates), 2)
+
+        # the previous snapshot is untouched
+        self.assertEqual(list(book.bids.prices), [0.5, 0.48])
+
+    def test_hash_mismatch_drops_the_book(self):
+        streamer = BookStreamer([token_id])
+        streamer.handle_message(json.dumps(book_event([("0.5", "50")], [])))
+
+        streamer.handle_message(
+            json.dumps(
+                {
+                    "event_type": "price_change",
+                    "asset_id": token_id,
+                    "market": market,
+                    "timestamp": "101",
+                    "hash": "not the hash",
+                    "changes": [{"price": "0.4", "size": "1", "side": "BUY"}],
+                }
+            )
+        )
+        self.assertEqual(streamer.hash_mismatches, 1)
+        self.assertIsNone(streamer.get_book(token_id))
+
+        # unverified streamers keep the book
+        streamer = BookStreamer([token_id], verify_hash=False)
+        streamer.handle_message(json.dumps(book_event([("0.5", "50")], [])))
+        streamer.handle_message(
+            json.dumps(
+                {
+                    "event_type": "price_change",
+                    "asset_id": token_id,
+                    "market": market,
+                    "timestamp": "101",
+                    "hash": "not the hash",
+                    "changes": [{"price": "0.4", "size": "1", "side": "BUY"}],
+                }
+            )
+        )
+        self.assertEqual(list(streamer.get_book(token_id).bids.prices), [0.5, 0.4])
+
+    def test_hash_mismatch_resyncs_the_token(self):
+        rest_book = book_event([("0.5", "50"), ("0.3", "2")], [], timestamp="102")
+        client = FakeClient(rest_book)
+        updates = []
+        streamer = BookStreamer([token_id], client=client, on_update=updates.append)
+        streamer.handle_message(json.dumps(book_event([("0.5", "50")], [])))
+
+        streamer.handle_message(json.dumps(bad_change()))
+        self.assertEqual(streamer.hash_mismatches, 1)
+        self.assertEqual(client.requests, [token_id])
+        self.assertEqual(list(streamer.get_book(token_id).bids), [(0.5, 50), (0.3, 2)])
+        self.assertEqual(len(updates), 2)
+
+        # changes without a hash aren't checked
+        streamer.handle_message(
+            json.dumps(
+                {
+                    "event_type": "price_change",
+                    "market": market,
+                    "timestamp": "103",
+                    "price_changes": [
+                        {
+                            "asset_id": token_id,
+                            "price": "0.4",
+                            "size": "3",
+                            "side": "BUY",
+                        }
+                    ],
+                }
+            )
+        )
+        self.assertEqual(streamer.hash_mismatches, 1)
+        self.assertEqual(list(streamer.get_book(token_id).bids.prices), [0.5, 0.4, 0.3])
+
+    def test_resync_replays_changes(self):
+        rest_book = book_event([("0.5", "50")], [], timestamp="102")
+        expected = book_event([("0.45", "5"), ("0.5", "50")], [], timestamp="103")
+        fetched = asyncio.Event()
+        release = asyncio.Event()
+
+        class AsyncClient:
+            async def get_order_book(self, token_id):
+                fetched.set()
+                await release.wait()
+                return parse_raw_orderbook_summary(rest_book)
+
+        async def main():
+            streamer = BookStreamer([token_id], client=AsyncClient())
+            streamer.handle_message(json.dumps(book_event([("0.5", "50")], [])))
+            streamer.handle_message(json.dumps(bad_change()))
+            await fetched.wait()
+            self.assertIsNone(streamer.get_book(token_id))
+
+            # received while fetching: older than the fetched book, then newer
+            streamer.handle_message(json.dumps(bad_change("0.2", timestamp="101")))
+            change = {"price": "0.45", "size": "5", "side": "BUY"}
+            streamer.handle_message(
+                json.dumps(
+                    {
+                        "event_type": "price_change",
+                        "asset_id": token_id,
+                        "market": market,
+                        "timestamp": "103",
+                        "hash": expected["hash"],
+                        "changes": [change],
+                    }
+                )
+            )
+            release.set()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            return streamer
+
+        streamer = asyncio.run(main())
+        self.assertEqual(streamer.hash_mismatches, 1)
+        self.assertEqual(list(streamer.get_book(token_id).bids.prices), [0.5, 0.45])
+        self.assertEqual(streamer.get_book(token_id).timestamp, "103")
+
+    def test_hash_mismatch_reconnects_at_most_once_per_interval(self):
+        now = [0.0]
+        reconnects = []
+        streamer = BookStreamer([token_id], min_resync_interval=5, clock=lambda: now[0])
+        streamer.reconnect = lambda: reconnects.append(now[0])
+
+        for t in (0.0, 1.0, 2.0, 6.0):
+            now[0] = t
+            streamer.handle_message(json.dumps(book_event([("0.5", "50")], [])))
+            streamer.handle_message(json.dumps(bad_change()))
+        self.assertEqual(streamer.hash_mismatches, 4)
+        self.assertEqual(reconnects, [0.0, 6.0])
+
+        # a failed fetch falls back to reconnecting
+        now[0] = 12.0
+        client = FakeClient(ValueError("down"))
+        streamer = BookStreamer([token_id], client=client, clock=lambda: now[0])
+        streamer.reconnect = lambda: reconnects.append(now[0])
+        streamer.handle_message(json.dumps(book_event([("0.5", "50")], [])))
+        streamer.handle_message(json.dumps(bad_change()))
+        self.assertEqual(client.requests, [token_id])
+        self.assertEqual(reconnects, [0.0, 6.0, 12.0])
+        self.assertIsNone(streamer.get_book(token_id))
+
+    def test_channel_subscriber_is_abstract(self):
+        with self.assertRaises(TypeError):
+            ChannelSubscriber()
+
+    def test_ignores_other_events(self):
+        streamer = BookStreamer([token_id])
+        other = book_event([("0.5", "50")], [])
+        other["asset_id"] = "1"
+        streamer.handle_message(json.dumps(other))
+        streamer.handle_message(json.dumps({"event_type": "last_trade_price"}))
+        streamer.handle_message("PONG")
+        streamer.handle_message("not json")
+        self.assertEqual(streamer.get_books(), {})
+
+    def test_run(self):
+        subscriptions = []
+
+        async def handler(ws):
+            subscriptions.append(json.loads(await ws.recv()))
+            await ws.send(json.dumps([book_event([("0.5", "50")], [("0.6", "10")])]))
+            await ws.wait_closed()
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                received = asyncio.Event()
+                streamer = BookStreamer(
+                    [token_id],
+                    host="ws://127.0.0.1:{}".format(port),
+                    on_update=lambda book: received.set(),
+                )
+                task = asyncio.ensure_future(streamer.run())
+                await asyncio.wait_for(received.wait(), 5)
+                streamer.stop()
+                await asyncio.wait_for(task, 5)
+                return streamer
+
+        streamer = asyncio.run(main())
+        self.assertEqual(subscriptions, [{"assets_ids": [token_id], "type": "market"}])
+        self.assertEqual(streamer.get_book(token_id).best_bid, 0.5)
+        self.assertEqual(streamer.get_book(token_id).best_ask, 0.6)
+
+    def test_run_survives_bad_events(self):
+        def price_change(**change) -> str:
+            change.update(asset_id=token_id, hash="")
+            return json.dumps(
+                {
+                    "event_type": "price_change",
+                    "market": market,
+                    "timestamp": "101",
+                    "price_changes": [change],
+                }
+            )
+
+        async def handler(ws):
+            await ws.recv()
+            await ws.send(json.dumps(book_event([("0.5", "50")], [("0.6", "10")])))
+            # no side
+            await ws.send(price_change(price="0.55", size="5"))
+            await ws.send(price_change(price="0.52", size="5", side="BUY"))
+            await ws.wait_closed()
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                updated = asyncio.Event()
+                updates = []
+
+                def on_update(book):
+                    updates.append(book)
+                    if len(updates) == 1:
+                        raise RuntimeError("callback failed")
+                    updated.set()
+
+                streamer = BookStreamer(
+                    [token_id],
+                    host="ws://127.0.0.1:{}".format(port),
+                    on_update=on_update,
+                )
+                task = asyncio.ensure_future(streamer.run())
+                with self.assertLogs("BookStreamer", "ERROR") as logs:
+                    await asyncio.wait_for(updated.wait(), 5)
+                self.assertFalse(task.done())
+                streamer.stop()
+                await asyncio.wait_for(task, 5)
+                return streamer, logs.output
+
+        streamer, logs = asyncio.run(main())
+        self.assertEqual(len(logs), 2)
+        self.assertIn("callback failed", logs[0])
+        self.assertIn("KeyError: 'side'", logs[1])
+        self.assertEqual(streamer.get_book(token_id).best_bid, 0.52)
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import time
+from unittest import TestCase
+
+from websockets.asyncio.server import serve
+
+from py_clob_client.clob_types import ApiCreds, OrderEvent, TradeEvent
+from py_clob_client.ws.user import UserStreamer
+
+creds = ApiCreds(api_key="key", api_secret="secret", api_passphrase="passphrase")
+market = "0xbd31dc8a20211944f6b70f31557f1001557b59905b7738480ca09bd4532f84af"
+
+
+def trade(id: str, matchtime: str, status: str = "MATCHED", **kwargs) -> dict:
+    event = {
+        "event_type": "trade",
+        "type": "TRADE",
+        "id": id,
+        "status": status,
+        "market": market,
+        "asset_id": "1234",
+        "side": "BUY",
+        "price": "0.5",
+        "size": "10",
+        "matchtime": matchtime,
+    }
+    event.update(kwargs)
+    return event
+
+
+class FakeClient:
+    creds = creds
+
+    def __init__(self, trades, errors=()):
+        self.trades = trades
+        self.errors = list(errors)
+        self.params = []
+
+    def get_trades(self, params=None, next_cursor="MA=="):
+        self.params.append(params)
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.trades
+
+
+class TestUserStreamer(TestCase):
+    def test_typed_events(self):
+        orders, trades = [], []
+        streamer = UserStreamer(creds, on_order=orders.append, on_trade=trades.append)
+        streamer.handle_message(
+            json.dumps(
+                [
+                    {
+                        "event_type": "order",
+                        "type": "PLACEMENT",
+                        "id": "0xff",
+                        "market": market,
+                        "asset_id": "1234",
+                        "side": "SELL",
+                        "price": "0.57",
+                        "original_size": "10",
+                        "size_matched": "0",
+                    },
+                    trade("t1", "1700000000"),
+                    trade("t1", "1700000000"),
+                    trade("t1", "1700000000", status="MINED"),
+                ]
+            )
+        )
+
+        self.assertEqual(len(orders), 1)
+        self.assertIsInstance(orders[0], OrderEvent)
+        self.assertEqual(orders[0].type, "PLACEMENT")
+        self.assertEqual(orders[0].price, "0.57")
+
+        # duplicates are dropped, status changes are not
+        self.assertEqual(
+            [(t.id, t.status) for t in trades], [("t1", "MATCHED"), ("t1", "MINED")]
+        )
+        self.assertIsInstance(trades[0], TradeEvent)
+        self.assertEqual(trades[0].matchtime, "1700000000")
+        self.assertEqual(streamer.last_trade_time, 1700000000)
+
+        self.assertEqual(
+            streamer.subscription(),
+            {
+                "auth": {
+                    "apiKey": "key",
+                    "secret": "secret",
+                    "passphrase": "passphrase",
+                },
+                "markets": [],
+                "type": "user",
+            },
+        )
+
+    def test_needs_creds(self):
+        with self.assertRaises(Exception):
+            UserStreamer()
+
+    def test_backfill_after_reconnect(self):
+        connections = []
+        now = int(time.time())
+        # t1 was streamed live, t2 was matched while disconnected
+        client = FakeClient(
+            [
+                trade("t2", str(now + 5), match_time=str(now + 5)),
+                {**trade("t1", str(now)), "event_type": None},
+            ]
+        )
+        received = []
+
+        async def handler(ws):
+            connections.append(json.loads(await ws.recv()))
+            if len(connections) == 1:
+                await ws.send(json.dumps([trade("t1", str(now))]))
+                # drop the connection
+                return
+            await ws.wait_closed()
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                done = asyncio.Event()
+
+                def on_trade(event):
+                    received.append(event)
+                    if len(received) == 2:
+                        done.set()
+
+                streamer = UserStreamer(
+                    markets=[market],
+                    client=client,
+                    on_trade=on_trade,
+                    host="ws://127.0.0.1:{}".format(port),
+                    reconnect_delay=0.01,
+                )
+                task = asyncio.ensure_future(streamer.run())
+                await asyncio.wait_for(done.wait(), 5)
+                streamer.stop()
+                await asyncio.wait_for(task, 5)
+                return streamer
+
+        streamer = asyncio.run(main())
+
+        self.assertEqual(len(connections), 2)
+        self.assertEqual(connections[0]["markets"], [market])
+        self.assertEqual(
+            [(t.id, t.backfilled) for t in received], [("t1", False), ("t2", True)]
+        )
+        self.assertEqual(client.params[0].market, market)
+        self.assertEqual(client.params[0].after, now - 1)
+        self.assertEqual(streamer.last_trade_time, now + 5)
+
+    def test_failed_backfill_keeps_its_start(self):
+        received = []
+        client = FakeClient(
+            [trade("t2", "1700000010")], errors=[ValueError("down")] * 3
+        )
+        streamer = UserStreamer(
+            client=client,
+            on_trade=received.append,
+            backfill_attempts=2,
+            backfill_delay=0,
+        )
+        streamer.handle_message(json.dumps([trade("t1", "1700000000")]))
+
+        # both attempts fail, nothing is emitted
+        self.assertFalse(asyncio.run(streamer.backfill()))
+        self.assertEqual([p.after for p in client.params], [1699999999] * 2)
+
+        # live trades don't move the start of the failed backfill
+        streamer.handle_message(json.dumps([trade("t3", "1700000020")]))
+        self.assertEqual(streamer.last_trade_time, 1700000020)
+
+        # retried on the next reconnection, from the same point, after one more failure
+        self.assertTrue(asyncio.run(streamer.backfill()))
+        self.assertEqual([p.after for p in client.params[2:]], [1699999999] * 2)
+        self.assertEqual(
+            [(t.id, t.backfilled) for t in received],
+            [("t1", False), ("t3", False), ("t2", True)],
+        )
+
+        # the next backfill starts from the last trade again
+        asyncio.run(streamer.backfill())
+        self.assertEqual(client.params[-1].after, 1700000019)